@@ -1,9 +1,10 @@
 import os
 
-from django.core.asgi import get_asgi_application
 from channels.security.websocket import AllowedHostsOriginValidator
 from channels.routing import ProtocolTypeRouter, URLRouter
 
+from base.http import get_asgi_application
+
 from authentication.middleware import TokenAuthMiddleware
 from authentication import routing as auth_routing
 
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "base.db.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -113,15 +114,19 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "authentication.throttling.OrganizationRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "60/minute", "user": "360/minute"},
+    "DEFAULT_THROTTLE_RATES": {
+        "organization": env.str("ORGANIZATION_THROTTLE_RATE", default="600/minute"),
+        "organization_api_key": env.str(
+            "ORGANIZATION_API_KEY_THROTTLE_RATE", default="360/minute"
+        ),
+    },
     "DEFAULT_PERMISSION_CLASSES": [
         "authentication.policies.OrganizationAPIKeyAccessPolicy",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.backends.CachedJWTAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -133,10 +138,13 @@ REST_FRAMEWORK = {
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
+    # X-Forwarded-For is only trusted for the hops added by our own proxies.
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
     "PAGE_SIZE": 10,
 }
 
 SIMPLE_JWT = {
+    "AUTH_TOKEN_CLASSES": ("authentication.tokens.AccessToken",),
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
@@ -146,4 +154,26 @@ API_KEY_CUSTOM_HEADER = "HTTP_API_KEY"
 AUTHENTICATION_APP = {
     "EMAIL_LOGO": "",
     "EMAIL_SIGNATURE": "Pillar Team",
+    "TOKEN_BLACKLIST_BACKEND": "authentication.blacklist.RedisTokenBlacklist",
+    "USER_ID_TIME_ORDERED": env.bool("USER_ID_TIME_ORDERED", default=False),
+    "ACCOUNT_VERIFICATION_URL": env.str("ACCOUNT_VERIFICATION_URL", default=None),
+    "PASSWORD_HASHING_PROCESSES": env.int("PASSWORD_HASHING_PROCESSES", default=0),
+    "PASSWORD_HASHING_QUEUE_SIZE": env.int("PASSWORD_HASHING_QUEUE_SIZE", default=64),
+    "LOGIN_LOCKOUT_EMAIL_THRESHOLD": env.int(
+        "LOGIN_LOCKOUT_EMAIL_THRESHOLD", default=5
+    ),
+    "LOGIN_LOCKOUT_IP_THRESHOLD": env.int("LOGIN_LOCKOUT_IP_THRESHOLD", default=50),
+    "LOGIN_LOCKOUT_BASE_DELAY": timedelta(
+        seconds=env.int("LOGIN_LOCKOUT_BASE_DELAY", default=1)
+    ),
+    "LOGIN_LOCKOUT_MAX_DELAY": timedelta(
+        seconds=env.int("LOGIN_LOCKOUT_MAX_DELAY", default=900)
+    ),
+    "SIGNING_KEYS": [
+        {
+            "algorithm": env.str("JWT_SIGNING_ALGORITHM", default="RS256"),
+            "private_key": Path(path).read_text(encoding="utf-8"),
+        }
+        for path in env.list("JWT_SIGNING_KEY_FILES", default=[])
+    ],
 }
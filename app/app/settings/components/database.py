@@ -1,13 +1,38 @@
 from environ import Env
 
 env = Env()
+DATABASE_POOL_MAX_SIZE = env.int('DATABASE_POOL_MAX_SIZE', default=0)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'ENGINE': 'base.db.backends.postgresql',
         'NAME': env.str('DATABASE_NAME'),
         'USER': env.str('DATABASE_USER'),
         'PASSWORD': env.str('DATABASE_PASSWORD'),
         'HOST': env.str('DATABASE_HOST'),
         'PORT': env.int('DATABASE_PORT'),
+        'CONN_MAX_AGE': 0 if DATABASE_POOL_MAX_SIZE else env.int('DATABASE_CONN_MAX_AGE', default=0),
+        'CONN_HEALTH_CHECKS': env.bool('DATABASE_CONN_HEALTH_CHECKS', default=True),
+        'POOL': {
+            'min_size': env.int('DATABASE_POOL_MIN_SIZE', default=0),
+            'max_size': DATABASE_POOL_MAX_SIZE,
+            'timeout': env.float('DATABASE_POOL_TIMEOUT', default=30),
+        } if DATABASE_POOL_MAX_SIZE else None,
     }
 }
+
+DATABASE_REPLICAS = []
+for index, replica in enumerate(env.list('DATABASE_REPLICA_HOSTS', default=[])):
+    host, _, port = replica.partition(':')
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': int(port) if port else DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['base.db.routers.PrimaryReplicaRouter']
+DATABASE_REPLICA_PIN_WINDOW = env.int('DATABASE_REPLICA_PIN_WINDOW', default=5)
+DATABASE_REPLICA_PIN_CACHE = 'default'
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include, re_path
 
+from authentication.views import JWKSView
+
 api_urls = [
     path('', include('authentication.urls')),
     path('', include('documentation.urls')),
@@ -9,5 +11,6 @@ api_urls = [
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('health/', include('health_check.urls')),
+    path('.well-known/jwks.json', JWKSView.as_view(), name='jwks'),
     re_path('api/(?P<version>(v1|v2))/', include(api_urls)),
 ]
@@ -1,10 +1,11 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.models import Group
 from django.contrib.auth.admin import GroupAdmin as AuthGroupAdmin
 
 from rest_framework_api_key.admin import APIKeyModelAdmin
 from rest_framework_api_key.models import APIKey
 
+from authentication.campaigns import VerificationCampaign
 from authentication.models import OrganizationAPIKey, Organization, User
 
 
@@ -14,7 +15,7 @@ admin.site.unregister(Group)
 
 @admin.register(Organization)
 class OrganizationAdmin(admin.ModelAdmin):
-    list_display = ("name", "active")
+    list_display = ("name", "active", "throttle_rate")
 
 
 @admin.register(OrganizationAPIKey)
@@ -30,6 +31,22 @@ class OrganizationApiKeyAdmin(APIKeyModelAdmin):
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = ["username", "email", "created_at"]
+    actions = ["resend_verification"]
+
+    @admin.action(description="Resend verification email to selected users")
+    def resend_verification(self, request, queryset):
+        try:
+            campaign = VerificationCampaign()
+        except ValueError:
+            self.message_user(
+                request,
+                "VERIFICATION_CAMPAIGN_URL is not configured.",
+                messages.ERROR,
+            )
+            return
+
+        queued = campaign.enqueue(queryset.filter(is_verified=False).order_by("pk"))
+        self.message_user(request, f"Queued {queued} verification emails.")
 
     def get_fieldsets(self, request, obj=None):
         fieldsets = super().get_fieldsets(request, obj)
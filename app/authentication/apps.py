@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AuthenticationConfig(AppConfig):
     name = "authentication"
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel,unused-import
+        from authentication import signals
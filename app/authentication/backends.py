@@ -0,0 +1,54 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from base.db import bind_user
+
+from authentication.blacklist import revoked_sessions
+from authentication.cache import access_token_cache, user_snapshot_cache
+from authentication.models import UserSnapshot
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        validated_token = access_token_cache.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            access_token_cache.add(raw_token, validated_token)
+
+        if revoked_sessions.is_revoked(validated_token):
+            raise InvalidToken(_("Token has been revoked"))
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from exc
+
+        bind_user(user_id)
+
+        values = user_snapshot_cache.get(user_id)
+        if values is None:
+            try:
+                user = self.user_model.objects.get(
+                    **{jwt_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as exc:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                ) from exc
+
+            values = UserSnapshot.from_user(user).as_dict()
+            user_snapshot_cache.add(user_id, values)
+
+        user = UserSnapshot(**values)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -0,0 +1,236 @@
+import math
+import time
+import logging
+import threading
+
+from django.core.cache import caches
+from django_redis import get_redis_connection
+
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from base.cache import BloomFilter
+
+from .settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBlacklist:
+    def outstand(self, token, user):
+        pass
+
+    def blacklist(self, token):
+        raise NotImplementedError
+
+    def is_blacklisted(self, jti):
+        raise NotImplementedError
+
+    def filter_blacklisted(self, jtis):
+        return {jti for jti in jtis if self.is_blacklisted(jti)}
+
+
+class DatabaseTokenBlacklist(TokenBlacklist):
+    def outstand(self, token, user):
+        OutstandingToken.objects.create(
+            user=user,
+            jti=token[jwt_settings.JTI_CLAIM],
+            token=str(token),
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token["exp"]),
+        )
+
+    def blacklist(self, token):
+        outstanding_token, _ = OutstandingToken.objects.get_or_create(
+            jti=token[jwt_settings.JTI_CLAIM],
+            defaults={
+                "token": str(token),
+                "expires_at": datetime_from_epoch(token["exp"]),
+            },
+        )
+        BlacklistedToken.objects.get_or_create(token=outstanding_token)
+
+    def is_blacklisted(self, jti):
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def filter_blacklisted(self, jtis):
+        return set(
+            BlacklistedToken.objects.filter(token__jti__in=jtis).values_list(
+                "token__jti", flat=True
+            )
+        )
+
+
+class RedisTokenBlacklist(TokenBlacklist):
+    namespace = "token_blacklist"
+    alias = api_settings.TOKEN_BLACKLIST_ALIAS
+    capacity = api_settings.TOKEN_BLACKLIST_BLOOM_CAPACITY
+    error_rate = api_settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE
+    rebuild_interval = api_settings.TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL
+
+    def __init__(self):
+        self.filter = None
+        self._lock = threading.Lock()
+        self._listener = None
+        self._rebuilding = None
+        self._rebuild_at = None
+        self._worker = None
+
+    @property
+    def connection(self):
+        return get_redis_connection(self.alias)
+
+    @property
+    def channel(self):
+        return caches[self.alias].make_key(f"{self.namespace}:channel")
+
+    @property
+    def healthy(self):
+        return (
+            self.filter is not None
+            and self._listener is not None
+            and self._listener.is_alive()
+        )
+
+    def make_key(self, jti):
+        return caches[self.alias].make_key(f"{self.namespace}:{jti}")
+
+    def blacklist(self, token):
+        self.blacklist_many([(token[jwt_settings.JTI_CLAIM], token["exp"])])
+
+    def blacklist_many(self, entries):
+        now, count = time.time(), 0
+        pipeline = self.connection.pipeline(transaction=False)
+        for jti, exp in entries:
+            ttl = int(exp - now)
+            if ttl <= 0:
+                continue
+            pipeline.set(self.make_key(jti), 1, ex=ttl)
+            pipeline.publish(self.channel, jti)
+            self.add(jti)
+            count += 1
+        pipeline.execute()
+        return count
+
+    def is_blacklisted(self, jti):
+        if self.synchronize() and jti not in self.filter:
+            return False
+        return bool(self.connection.exists(self.make_key(jti)))
+
+    def filter_blacklisted(self, jtis):
+        if self.synchronize():
+            candidates = [jti for jti in jtis if jti in self.filter]
+        else:
+            candidates = list(jtis)
+        if not candidates:
+            return set()
+
+        pipeline = self.connection.pipeline(transaction=False)
+        for jti in candidates:
+            pipeline.exists(self.make_key(jti))
+        return {jti for jti, exists in zip(candidates, pipeline.execute()) if exists}
+
+    def synchronize(self):
+        # The bloom filter may only rule tokens out while the subscriber is
+        # alive, otherwise every lookup goes to Redis until it is rebuilt.
+        healthy = self.healthy
+        if not healthy or time.monotonic() >= self._rebuild_at:
+            self.schedule_rebuild()
+        return healthy
+
+    def schedule_rebuild(self):
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self.rebuild, daemon=True)
+            self._worker.start()
+
+    def subscribe(self):
+        pubsub = self.connection.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: self._on_message})
+        return pubsub.run_in_thread(
+            sleep_time=1, daemon=True, exception_handler=self._on_error
+        )
+
+    def rebuild(self):
+        try:
+            if self._listener is None or not self._listener.is_alive():
+                # Messages published while nobody listened are lost.
+                self.filter = None
+                self._listener = self.subscribe()
+
+            self._rebuilding = BloomFilter(self.capacity, self.error_rate)
+            prefix = self.make_key("")
+            for key in self.connection.scan_iter(match=f"{prefix}*", count=1000):
+                self._rebuilding.add(key.decode("utf-8")[len(prefix) :])
+
+            self.filter = self._rebuilding
+            self._rebuild_at = time.monotonic() + self.rebuild_interval.total_seconds()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Token blacklist rebuild failed", exc_info=True)
+        finally:
+            self._rebuilding = None
+
+    def add(self, jti):
+        for bloom in (self.filter, self._rebuilding):
+            if bloom is not None:
+                bloom.add(jti)
+
+    def _on_message(self, message):
+        self.add(message["data"].decode("utf-8"))
+
+    def _on_error(self, exc, pubsub, thread):
+        # pylint: disable=unused-argument
+        logger.warning("Token blacklist subscriber stopped", exc_info=exc)
+        thread.stop()
+
+
+class RevokedSessionSet(RedisTokenBlacklist):
+    # Access tokens carry the session id of the refresh token that minted
+    # them, so revoking a session mirrors the blacklist into every process.
+    namespace = "revoked_session"
+    alias = api_settings.REVOKED_SESSION_ALIAS
+    claim = api_settings.SESSION_ID_CLAIM
+
+    def revoke(self, refresh_token):
+        sid = refresh_token.get(self.claim)
+        if sid is None:
+            return 0
+
+        # Access tokens minted right before the refresh token expires outlive it.
+        exp = refresh_token["exp"] + jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+        return self.blacklist_many([(sid, exp)])
+
+    def is_revoked(self, token):
+        sid = token.get(self.claim)
+        return sid is not None and self.is_blacklisted(sid)
+
+
+class ConsumedTokenSet:
+    namespace = "consumed_token"
+    alias = api_settings.CONSUMED_TOKEN_ALIAS
+
+    @property
+    def connection(self):
+        return get_redis_connection(self.alias)
+
+    def make_key(self, jti):
+        return caches[self.alias].make_key(f"{self.namespace}:{jti}")
+
+    def is_consumed(self, jti):
+        return bool(self.connection.exists(self.make_key(jti)))
+
+    def consume(self, jti, exp):
+        ttl = math.ceil(exp - time.time())
+        if ttl <= 0:
+            return False
+        return bool(self.connection.set(self.make_key(jti), 1, ex=ttl, nx=True))
+
+
+token_blacklist = api_settings.TOKEN_BLACKLIST_BACKEND()
+consumed_tokens = ConsumedTokenSet()
+revoked_sessions = RevokedSessionSet()
@@ -0,0 +1,140 @@
+import hmac
+import time
+import hashlib
+
+from django.utils import timezone
+
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin
+
+from base.cache import LRUCache, TieredCache
+
+from .settings import api_settings
+
+
+class APIKeyCache:
+    namespace = "api_key:v2"
+    alias = api_settings.API_KEY_CACHE_ALIAS
+    maxsize = api_settings.API_KEY_CACHE_SIZE
+    local_ttl = api_settings.API_KEY_CACHE_LOCAL_TTL
+    ttl = api_settings.API_KEY_CACHE_TTL
+
+    def __init__(self):
+        self.cache = TieredCache(
+            self.namespace,
+            maxsize=self.maxsize,
+            local_ttl=self.local_ttl.total_seconds(),
+            remote_ttl=self.ttl.total_seconds(),
+            alias=self.alias,
+        )
+
+    @property
+    def stats(self):
+        return self.cache.stats
+
+    @staticmethod
+    def digest(key):
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def prefix(key):
+        prefix, _, _ = key.partition(".")
+        return prefix
+
+    def get(self, key):
+        entry = self.cache.get(self.prefix(key))
+        if entry is None:
+            return None
+
+        if not hmac.compare_digest(entry["digest"], self.digest(key)):
+            return None
+
+        expiry = entry["expiry"]
+        if expiry is not None and expiry <= timezone.now().timestamp():
+            return None
+
+        return entry
+
+    def is_valid(self, key):
+        return self.get(key) is not None
+
+    def add(self, key, api_key):
+        ttl = self.ttl.total_seconds()
+        expiry = None
+
+        if api_key.expiry_date is not None:
+            expiry = api_key.expiry_date.timestamp()
+            ttl = min(ttl, expiry - timezone.now().timestamp())
+            if ttl <= 0:
+                return
+
+        self.cache.set(
+            self.prefix(key),
+            {
+                "digest": self.digest(key),
+                "expiry": expiry,
+                "organization": api_key.organization_id,
+                "throttle_rate": api_key.organization.throttle_rate,
+            },
+            ttl=ttl,
+        )
+
+    def invalidate(self, *prefixes):
+        self.cache.delete_many(prefixes)
+
+
+class AccessTokenCache:
+    maxsize = api_settings.ACCESS_TOKEN_CACHE_SIZE
+
+    def __init__(self):
+        self.cache = LRUCache(maxsize=self.maxsize)
+
+    @property
+    def stats(self):
+        return self.cache.stats
+
+    def get(self, raw_token):
+        return self.cache.get(raw_token)
+
+    def add(self, raw_token, token):
+        if isinstance(token, BlacklistMixin):
+            return
+
+        ttl = token["exp"] - time.time()
+        if ttl > 0:
+            self.cache.set(raw_token, token, ttl=ttl)
+
+
+class UserSnapshotCache:
+    namespace = "user_snapshot:v1"
+    alias = api_settings.USER_SNAPSHOT_CACHE_ALIAS
+    maxsize = api_settings.USER_SNAPSHOT_CACHE_SIZE
+    local_ttl = api_settings.USER_SNAPSHOT_CACHE_LOCAL_TTL
+    ttl = api_settings.USER_SNAPSHOT_CACHE_TTL
+
+    def __init__(self):
+        self.cache = TieredCache(
+            self.namespace,
+            maxsize=self.maxsize,
+            local_ttl=self.local_ttl.total_seconds(),
+            remote_ttl=self.ttl.total_seconds(),
+            alias=self.alias,
+        )
+
+    @property
+    def stats(self):
+        return self.cache.stats
+
+    def get(self, user_id):
+        return self.cache.get(str(user_id))
+
+    def add(self, user_id, snapshot):
+        self.cache.set(str(user_id), snapshot)
+
+    def invalidate(self, *user_ids):
+        self.cache.delete_many(str(user_id) for user_id in user_ids)
+
+
+api_key_cache = APIKeyCache()
+access_token_cache = AccessTokenCache()
+user_snapshot_cache = UserSnapshotCache()
@@ -0,0 +1,123 @@
+import time
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.mail import get_connection
+
+from authentication.settings import api_settings
+from authentication.utils import (
+    AccountVerificationSender,
+    AccountVerificationTokenGenerator,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignProgress:
+    def __init__(self, total, sent, failed, elapsed):
+        self.total = total
+        self.sent = sent
+        self.failed = failed
+        self.elapsed = elapsed
+
+    @property
+    def processed(self):
+        return self.sent + self.failed
+
+    @property
+    def throughput(self):
+        return self.processed / self.elapsed if self.elapsed else float("inf")
+
+    def __str__(self):
+        return (
+            f"{self.processed}/{self.total} processed, {self.sent} sent, "
+            f"{self.failed} failed, {self.throughput:.1f} emails/s"
+        )
+
+
+class VerificationCampaign:
+    batch_size = api_settings.VERIFICATION_CAMPAIGN_BATCH_SIZE
+    rate = api_settings.VERIFICATION_CAMPAIGN_RATE
+    url = api_settings.VERIFICATION_CAMPAIGN_URL
+
+    sender_class = AccountVerificationSender
+    token_generator_class = AccountVerificationTokenGenerator
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            if value is not None:
+                setattr(self, name, value)
+
+        if not self.url:
+            raise ValueError("Verification campaign requires an url")
+
+        self.sender = self.sender_class()
+        self.token_generator = self.token_generator_class()
+
+    def get_queryset(self):
+        return (
+            get_user_model()
+            .objects.filter(is_verified=False)
+            .only("id", "email", "username")
+            .order_by("pk")
+        )
+
+    def batches(self, queryset):
+        batch = []
+        for user in queryset.iterator(chunk_size=self.batch_size):
+            batch.append(user)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def create_messages(self, users):
+        tokens = self.token_generator.make_tokens(users)
+        return self.sender.create_messages(
+            (user, self.url, token) for user, (token, _) in zip(users, tokens)
+        )
+
+    def enqueue(self, queryset=None):
+        queryset = self.get_queryset() if queryset is None else queryset
+        queued = 0
+        for users in self.batches(queryset):
+            tokens = self.token_generator.make_tokens(users)
+            queued += len(
+                self.sender.send_many(
+                    (user, self.url, token) for user, (token, _) in zip(users, tokens)
+                )
+            )
+        return queued
+
+    def throttle(self, start, processed):
+        if not self.rate:
+            return
+        delay = start + processed / self.rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def run(self, queryset=None):
+        queryset = self.get_queryset() if queryset is None else queryset
+        total = queryset.count()
+        sent = failed = 0
+        start = time.monotonic()
+
+        with get_connection() as connection:
+            for users in self.batches(queryset):
+                for message in self.create_messages(users):
+                    self.throttle(start, sent + failed)
+                    message.connection = connection
+                    try:
+                        message.send()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        logger.warning(
+                            "Sending verification email to %s failed: %s",
+                            message.to[0],
+                            exc,
+                        )
+                        failed += 1
+                    else:
+                        sent += 1
+
+                yield CampaignProgress(total, sent, failed, time.monotonic() - start)
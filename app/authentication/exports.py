@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+
+from rest_framework import serializers
+
+from authentication.settings import api_settings
+
+
+class UserExporter:
+    chunk_size = api_settings.USER_EXPORT_CHUNK_SIZE
+    ordering = ("created_at", "pk")
+    fields = {
+        "id": "id",
+        "username": "username",
+        "email": "email",
+        "verified": "is_verified",
+        "activated": "is_active",
+        "staff": "is_staff",
+        "created": "created_at",
+        "updated": "updated_at",
+    }
+    datetime_fields = ("created", "updated")
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            if value is not None:
+                setattr(self, name, value)
+
+        self.datetime_field = serializers.DateTimeField()
+
+    def get_queryset(self):
+        return get_user_model().objects.all()
+
+    def rows(self, queryset=None):
+        queryset = self.get_queryset() if queryset is None else queryset
+        if not queryset.query.order_by:
+            queryset = queryset.order_by(*self.ordering)
+
+        names = list(self.fields)
+        to_representation = self.datetime_field.to_representation
+        # values_list skips model instances and a server-side cursor keeps
+        # only one chunk of rows in memory at a time.
+        for values in queryset.values_list(*self.fields.values()).iterator(
+            chunk_size=self.chunk_size
+        ):
+            row = dict(zip(names, values))
+            row["id"] = str(row["id"])
+            for name in self.datetime_fields:
+                row[name] = to_representation(row[name])
+            yield row
@@ -1,8 +1,20 @@
 from django.contrib.auth import get_user_model
-from django_filters.rest_framework import FilterSet, OrderingFilter
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from django_filters.rest_framework import CharFilter, FilterSet, OrderingFilter
+
+from base.models import ILikeContains
 
 
 class UserFilter(FilterSet):
+    username__icontains = CharFilter(
+        field_name="username", lookup_expr=ILikeContains.lookup_name
+    )
+    email__icontains = CharFilter(
+        field_name="email", lookup_expr=ILikeContains.lookup_name
+    )
+    search = CharFilter(method="filter_search")
     ordering = OrderingFilter(fields=("username", "email"))
 
     class Meta:
@@ -11,3 +23,19 @@ class UserFilter(FilterSet):
             "username": ["exact", "startswith", "contains"],
             "email": ["exact", "startswith", "contains"],
         }
+
+    def filter_search(self, queryset, name, value):
+        # pylint: disable=unused-argument
+        return (
+            queryset.filter(
+                Q(**{f"username__{ILikeContains.lookup_name}": value})
+                | Q(**{f"email__{ILikeContains.lookup_name}": value})
+            )
+            .annotate(
+                rank=Greatest(
+                    TrigramSimilarity("username", value),
+                    TrigramSimilarity("email", value),
+                )
+            )
+            .order_by("-rank")
+        )
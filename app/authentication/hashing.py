@@ -0,0 +1,118 @@
+import os
+import contextlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .settings import api_settings
+
+
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many password operations in progress, try again later.")
+    default_code = "password_hashing_unavailable"
+
+
+def check_password(password, encoded):
+    must_update = []
+    valid = hashers.check_password(password, encoded, setter=must_update.append)
+    return valid, bool(must_update)
+
+
+class PasswordHasherPool:
+    processes = api_settings.PASSWORD_HASHING_PROCESSES
+    queue_size = api_settings.PASSWORD_HASHING_QUEUE_SIZE
+    queue_timeout = api_settings.PASSWORD_HASHING_QUEUE_TIMEOUT
+
+    def __init__(self, processes=None, queue_size=None, queue_timeout=None):
+        if processes is not None:
+            self.processes = processes
+        if queue_size is not None:
+            self.queue_size = queue_size
+        if queue_timeout is not None:
+            self.queue_timeout = queue_timeout
+
+        self.slots = threading.BoundedSemaphore(self.processes + self.queue_size)
+        self.executor = None
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def get_executor(self):
+        with self.lock:
+            # Executors do not survive a fork, e.g. gunicorn --preload workers.
+            if self.executor is None or self.pid != os.getpid():
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=django.setup,
+                )
+                self.pid = os.getpid()
+            return self.executor
+
+    @contextlib.contextmanager
+    def reserve(self):
+        if not self.slots.acquire(timeout=self.queue_timeout.total_seconds()):
+            raise PasswordHashingUnavailable()
+
+        try:
+            executor = self.get_executor()
+            try:
+                yield executor
+            except BrokenProcessPool:
+                with self.lock:
+                    if self.executor is executor:
+                        self.executor = None
+                raise
+        finally:
+            self.slots.release()
+
+    def submit(self, func, *args):
+        if not self.processes:
+            return func(*args)
+
+        with self.reserve() as executor:
+            return executor.submit(func, *args).result()
+
+    def map(self, func, iterable):
+        items = list(iterable)
+        if not self.processes:
+            return [func(item) for item in items]
+
+        # A batch holds one slot and is spread over every worker process.
+        chunksize = max(1, len(items) // (self.processes * 4))
+        with self.reserve() as executor:
+            return list(executor.map(func, items, chunksize=chunksize))
+
+    def make_password(self, password):
+        if password is None:
+            return hashers.make_password(None)
+        return self.submit(hashers.make_password, password)
+
+    def make_passwords(self, passwords):
+        return self.map(hashers.make_password, passwords)
+
+    def check_password(self, password, encoded, setter=None):
+        if password is None or not hashers.is_password_usable(encoded):
+            return False
+
+        valid, must_update = self.submit(check_password, password, encoded)
+        if valid and must_update and setter:
+            setter(password)
+        return valid
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+
+password_hasher = PasswordHasherPool()
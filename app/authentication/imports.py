@@ -0,0 +1,204 @@
+import csv
+import json
+import time
+import collections
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.translation import gettext as _
+
+from authentication.hashing import password_hasher
+from authentication.serializers import UserImportSerializer
+from authentication.settings import api_settings
+from authentication.utils import (
+    AccountVerificationSender,
+    AccountVerificationTokenGenerator,
+)
+
+RowError = collections.namedtuple("RowError", ["line", "errors"])
+
+
+class ImportProgress:
+    def __init__(self, processed, created, failed, elapsed, errors=()):
+        self.processed = processed
+        self.created = created
+        self.failed = failed
+        self.elapsed = elapsed
+        self.errors = list(errors)
+
+    @property
+    def throughput(self):
+        return self.processed / self.elapsed if self.elapsed else float("inf")
+
+    def __str__(self):
+        return (
+            f"{self.processed} processed, {self.created} created, "
+            f"{self.failed} failed, {self.throughput:.1f} rows/s"
+        )
+
+
+class UserImporter:
+    formats = ("csv", "ndjson")
+    batch_size = api_settings.USER_IMPORT_BATCH_SIZE
+    url = api_settings.ACCOUNT_VERIFICATION_URL
+    hasher = password_hasher
+
+    serializer_class = UserImportSerializer
+    sender_class = AccountVerificationSender
+    token_generator_class = AccountVerificationTokenGenerator
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            if value is not None:
+                setattr(self, name, value)
+
+        self.sender = self.sender_class()
+        self.token_generator = self.token_generator_class()
+
+    def read(self, lines, format):  # pylint: disable=redefined-builtin
+        if format not in self.formats:
+            raise ValueError(f"Unsupported import format {format!r}")
+        return getattr(self, f"read_{format}")(lines)
+
+    def read_csv(self, lines):
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, {
+                name: value
+                for name, value in row.items()
+                if name is not None and value not in (None, "")
+            }
+
+    def read_ndjson(self, lines):
+        for line, text in enumerate(lines, 1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError:
+                row = None
+            yield line, row if isinstance(row, dict) else None
+
+    def batches(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def validate(self, batch):
+        rows, errors = [], []
+        emails, usernames = set(), set()
+        for line, row in batch:
+            if row is None:
+                errors.append(RowError(line, {"non_field_errors": [_("Invalid row.")]}))
+                continue
+
+            serializer = self.serializer_class(data=row)
+            if not serializer.is_valid():
+                errors.append(RowError(line, serializer.errors))
+                continue
+
+            data = serializer.validated_data
+            duplicates = self.get_duplicates(data, emails, usernames)
+            if duplicates:
+                errors.append(RowError(line, duplicates))
+                continue
+
+            emails.add(data["email"].lower())
+            usernames.add(data["username"])
+            rows.append((line, data))
+
+        if not rows:
+            return rows, errors
+
+        # One query per batch replaces a uniqueness query per field and row.
+        existing = (
+            get_user_model()
+            .objects.annotate(email_lower=Lower("email"))
+            .filter(Q(email_lower__in=emails) | Q(username__in=usernames))
+            .values_list("email_lower", "username")
+        )
+        emails, usernames = set(), set()
+        for email, username in existing:
+            emails.add(email)
+            usernames.add(username)
+
+        valid = []
+        for line, data in rows:
+            duplicates = self.get_duplicates(data, emails, usernames)
+            if duplicates:
+                errors.append(RowError(line, duplicates))
+            else:
+                valid.append((line, data))
+        return valid, errors
+
+    @staticmethod
+    def get_duplicates(data, emails, usernames):
+        duplicates = {}
+        if data["email"].lower() in emails:
+            duplicates["email"] = [_("user with this email already exists.")]
+        if data["username"] in usernames:
+            duplicates["username"] = [_("user with this username already exists.")]
+        return duplicates
+
+    def create(self, rows):
+        passwords = self.hasher.make_passwords(
+            [data.get("password") for _line, data in rows]
+        )
+        model = get_user_model()
+        users = [
+            model(username=data["username"], email=data["email"], password=password)
+            for (_line, data), password in zip(rows, passwords)
+        ]
+
+        with transaction.atomic():
+            # Rows inserted concurrently since validation are skipped, not fatal.
+            model.objects.bulk_create(users, ignore_conflicts=True)
+            inserted = set(
+                model.objects.filter(pk__in=[user.pk for user in users]).values_list(
+                    "pk", flat=True
+                )
+            )
+            created = [user for user in users if user.pk in inserted]
+
+            if self.url and created:
+                tokens = self.token_generator.make_tokens(created)
+                self.sender.send_many(
+                    (user, self.url, token)
+                    for user, (token, _expires_at) in zip(created, tokens)
+                )
+
+        errors = [
+            RowError(line, {"non_field_errors": [_("User already exists.")]})
+            for (line, _data), user in zip(rows, users)
+            if user.pk not in inserted
+        ]
+        return created, errors
+
+    def run(self, lines, format):  # pylint: disable=redefined-builtin
+        processed = created = failed = 0
+        start = time.monotonic()
+
+        for batch in self.batches(self.read(lines, format)):
+            rows, errors = self.validate(batch)
+            users = []
+            if rows:
+                users, conflicts = self.create(rows)
+                errors.extend(conflicts)
+
+            processed += len(batch)
+            created += len(users)
+            failed += len(errors)
+            yield ImportProgress(
+                processed,
+                created,
+                failed,
+                time.monotonic() - start,
+                sorted(errors, key=lambda error: error.line),
+            )
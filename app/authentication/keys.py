@@ -0,0 +1,138 @@
+import json
+import base64
+import hashlib
+
+import jwt
+from jwt.algorithms import get_default_algorithms
+
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .settings import api_settings
+
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+class SigningKey:
+    def __init__(self, algorithm, private_key=None, public_key=None, kid=None):
+        if private_key is None and public_key is None:
+            raise ValueError("Signing key requires a private or a public key")
+
+        self.algorithm = algorithm
+        self._algorithm = get_default_algorithms()[algorithm]
+        self.private_key = (
+            self._algorithm.prepare_key(private_key) if private_key else None
+        )
+        self.public_key = (
+            self._algorithm.prepare_key(public_key)
+            if public_key
+            else self.private_key.public_key()
+        )
+        self.kid = kid or self.thumbprint()
+
+    def to_jwk(self):
+        jwk = self._algorithm.to_jwk(self.public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+    def thumbprint(self):
+        jwk = self._algorithm.to_jwk(self.public_key, as_dict=True)
+        members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+        digest = hashlib.sha256(
+            json.dumps(members, separators=(",", ":"), sort_keys=True).encode()
+        ).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+class KeyRing:
+    def __init__(self, keys):
+        self.keys = {key.kid: key for key in keys}
+        self.active = keys[0] if keys else None
+        self._jwks = None
+
+    @classmethod
+    def from_settings(cls, signing_keys):
+        return cls([SigningKey(**signing_key) for signing_key in signing_keys])
+
+    def __bool__(self):
+        return self.active is not None
+
+    def get(self, token):
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid not in self.keys:
+            raise jwt.InvalidSignatureError("Unknown signing key")
+        return self.keys[kid]
+
+    def jwks(self):
+        if self._jwks is None:
+            self._jwks = {"keys": [key.to_jwk() for key in self.keys.values()]}
+        return self._jwks
+
+    def encode(self, payload, json_encoder=None):
+        return jwt.encode(
+            payload,
+            self.active.private_key,
+            algorithm=self.active.algorithm,
+            headers={"kid": self.active.kid},
+            json_encoder=json_encoder,
+        )
+
+    def decode(self, token, **kwargs):
+        key = self.get(token)
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm], **kwargs)
+
+
+class KeyRingTokenBackend(TokenBackend):
+    def __init__(self, ring, **kwargs):
+        self.ring = ring
+        super().__init__(ring.active.algorithm, **kwargs)
+
+    def _validate_algorithm(self, algorithm):
+        if algorithm not in get_default_algorithms() or algorithm.startswith("HS"):
+            raise TokenBackendError(_("Signing keys require an asymmetric algorithm"))
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        return self.ring.encode(jwt_payload, json_encoder=self.json_encoder)
+
+    def decode(self, token, verify=True):
+        try:
+            return self.ring.decode(
+                token,
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    "verify_aud": self.audience is not None,
+                    "verify_signature": verify,
+                },
+            )
+        except jwt.InvalidTokenError as ex:
+            raise TokenBackendError(_("Token is invalid or expired")) from ex
+
+
+key_ring = KeyRing.from_settings(api_settings.SIGNING_KEYS)
+
+if key_ring:
+    token_backend = KeyRingTokenBackend(
+        key_ring,
+        audience=jwt_settings.AUDIENCE,
+        issuer=jwt_settings.ISSUER,
+        leeway=jwt_settings.LEEWAY,
+        json_encoder=jwt_settings.JSON_ENCODER,
+    )
+else:
+    token_backend = state.token_backend
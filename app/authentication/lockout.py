@@ -0,0 +1,81 @@
+import hashlib
+import logging
+
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+
+from redis.exceptions import RedisError
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from base.throttling import RedisLockout
+
+from .settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LoginLockedOut(Throttled):
+    default_detail = _("Too many failed login attempts.")
+    default_code = "login_locked_out"
+
+
+class LoginLockout:
+    namespace = "login_lockout"
+    alias = api_settings.LOGIN_LOCKOUT_CACHE_ALIAS
+    email_threshold = api_settings.LOGIN_LOCKOUT_EMAIL_THRESHOLD
+    ip_threshold = api_settings.LOGIN_LOCKOUT_IP_THRESHOLD
+    window = api_settings.LOGIN_LOCKOUT_WINDOW
+    base_delay = api_settings.LOGIN_LOCKOUT_BASE_DELAY
+    max_delay = api_settings.LOGIN_LOCKOUT_MAX_DELAY
+
+    def __init__(self):
+        self.lockout = RedisLockout(self.namespace, alias=self.alias)
+
+    @staticmethod
+    def email_ident(email):
+        email = get_user_model().objects.normalize_email(email).lower()
+        return "email:" + hashlib.sha256(email.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def ip_ident(request):
+        if request is None:
+            return None
+        return f"ip:{BaseThrottle().get_ident(request)}"
+
+    def get_thresholds(self, email, request):
+        thresholds = {self.email_ident(email): self.email_threshold}
+        ip_ident = self.ip_ident(request)
+        if ip_ident is not None:
+            thresholds[ip_ident] = self.ip_threshold
+        return thresholds
+
+    def check(self, email, request=None):
+        try:
+            wait = self.lockout.locked_for(list(self.get_thresholds(email, request)))
+        except RedisError:
+            logger.warning("Login lockout check skipped", exc_info=True)
+            return
+        if wait > 0:
+            raise LoginLockedOut(wait=wait)
+
+    def register_failure(self, email, request=None):
+        try:
+            return self.lockout.register_failure(
+                self.get_thresholds(email, request),
+                self.window.total_seconds(),
+                self.base_delay.total_seconds(),
+                self.max_delay.total_seconds(),
+            )
+        except RedisError:
+            logger.warning("Login failure not recorded", exc_info=True)
+            return 0
+
+    def reset(self, email):
+        try:
+            self.lockout.reset(self.email_ident(email))
+        except RedisError:
+            logger.warning("Login lockout reset skipped", exc_info=True)
+
+
+login_lockout = LoginLockout()
@@ -0,0 +1,73 @@
+from rest_access_policy import AccessPolicy
+from rest_framework_api_key.permissions import BaseHasAPIKey
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from base.benchmark import BenchmarkCommand, benchmark
+
+from authentication.factories import UserFactory, OrganizationAPIKeyFactory
+from authentication.policies import OrganizationAPIKeyAccessPolicy, UserAccessPolicy
+from authentication.views import UserDetail
+
+
+def legacy_has_permission(policy_type, request, view):
+    permissions = []
+    for cls in policy_type.mro():
+        if hasattr(cls, "permissions"):
+            permissions.extend(permission() for permission in cls.permissions)
+    return all(
+        permission.has_permission(request, view) for permission in permissions
+    ) and AccessPolicy.has_permission(policy_type(), request, view)
+
+
+def legacy_has_object_permission(policy_type, request, view, obj):
+    permissions = []
+    for cls in policy_type.mro():
+        if hasattr(cls, "permissions"):
+            permissions.extend(permission() for permission in cls.permissions)
+    return all(
+        BaseHasAPIKey.has_object_permission(permission, request, view, obj)
+        if isinstance(permission, BaseHasAPIKey)
+        else permission.has_object_permission(request, view, obj)
+        for permission in permissions
+    ) and AccessPolicy.has_object_permission(policy_type(), request, view, obj)
+
+
+class Command(BenchmarkCommand):
+    help = "Measure access policy cost per request."
+
+    policy_types = (UserAccessPolicy, OrganizationAPIKeyAccessPolicy)
+    rows = 10
+
+    def setup(self, **options):
+        _, key = OrganizationAPIKeyFactory.create()
+        self.user = UserFactory.create()
+        self.objects = UserFactory.create_batch(self.rows)
+        self.factory = APIRequestFactory(HTTP_API_KEY=key)
+        self.view = UserDetail()
+
+    def make_request(self):
+        request = Request(self.factory.get("/"))
+        request.user = self.user
+        return request
+
+    def legacy_request(self):
+        request = self.make_request()
+        for policy_type in self.policy_types:
+            assert legacy_has_permission(policy_type, request, self.view)
+        for obj in self.objects:
+            assert legacy_has_object_permission(
+                UserAccessPolicy, request, self.view, obj
+            )
+
+    def compiled_request(self):
+        request = self.make_request()
+        for policy_type in self.policy_types:
+            assert policy_type().has_permission(request, self.view)
+        for obj in self.objects:
+            assert UserAccessPolicy().has_object_permission(request, self.view, obj)
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        yield benchmark("legacy policy", self.legacy_request, iterations, repeat)
+        yield benchmark("compiled policy", self.compiled_request, iterations, repeat)
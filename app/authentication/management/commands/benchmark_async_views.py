@@ -0,0 +1,127 @@
+import time
+import asyncio
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncRequestFactory
+
+from rest_framework import generics, status
+from rest_framework.response import Response
+
+from base.benchmark import BenchmarkCommand, benchmark
+from base.views import AccessPolicyViewSetMixin
+
+from authentication.factories import OrganizationAPIKeyFactory, UserFactory
+from authentication.policies import OrganizationAPIKeyAccessPolicy
+from authentication.models import OutboxEmail
+from authentication.serializers import SendActivationEmailTokenSerializer
+from authentication.views import SendActivationEmailTokenView
+
+
+class SyncSendActivationEmailTokenView(
+    AccessPolicyViewSetMixin, generics.GenericAPIView
+):
+    serializer_class = SendActivationEmailTokenSerializer
+    access_policy = OrganizationAPIKeyAccessPolicy
+
+    def post(self, request, *_args, **_kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class Command(BenchmarkCommand):
+    help = "Compare sync and async auth views serving concurrent requests under ASGI."
+
+    iterations = 20
+    repeat = 3
+    concurrency = 50
+    latency = 1.0
+    atomic = False
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--concurrency", type=int, default=self.concurrency)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=self.latency,
+            help="Simulated database round trip in milliseconds.",
+        )
+
+    def simulate_latency(self, execute, sql, params, many, context):
+        time.sleep(self.latency / 1000)
+        return execute(sql, params, many, context)
+
+    def add_latency(self, connection, **_kwargs):
+        if self.simulate_latency not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self.simulate_latency)
+
+    def setup(self, **options):
+        self.latency = options["latency"]
+        if self.latency:
+            connection_created.connect(self.add_latency)
+            for connection in connections.all():
+                self.add_latency(connection)
+
+        self.api_key, key = OrganizationAPIKeyFactory.create()
+        self.user = UserFactory.create(is_verified=False)
+        self.factory = AsyncRequestFactory()
+        self.request_kwargs = {
+            "data": {"email": self.user.email, "url": "https://example.com/verify/"},
+            "content_type": "application/json",
+            "api-key": key,
+        }
+
+    def teardown(self, **options):
+        connection_created.disconnect(self.add_latency)
+        for connection in connections.all():
+            if self.simulate_latency in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self.simulate_latency)
+
+        OutboxEmail.objects.filter(recipients=[self.user.email]).delete()
+        self.api_key.organization.delete()
+        self.user.delete()
+
+    def sync_handler(self, view):
+        # Django runs sync views under ASGI through a thread sensitive
+        # sync_to_async, the same way it is emulated here.
+        view = sync_to_async(view, thread_sensitive=True)
+
+        async def handle(request):
+            response = await view(request)
+            return await sync_to_async(response.render, thread_sensitive=True)()
+
+        return handle
+
+    def requester(self, handle, concurrency):
+        async def send():
+            response = await handle(self.factory.post("/", **self.request_kwargs))
+            assert response.status_code == 204, response.content
+
+        async def requests():
+            await asyncio.gather(*(send() for _ in range(concurrency)))
+
+        return async_to_sync(requests)
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        concurrency = options["concurrency"]
+        handlers = {
+            "sync view": self.sync_handler(
+                SyncSendActivationEmailTokenView.as_view(throttle_classes=())
+            ),
+            "async view": SendActivationEmailTokenView.as_view(throttle_classes=()),
+        }
+        for name, handle in handlers.items():
+            yield benchmark(
+                f"{name} ({concurrency} concurrent)",
+                self.requester(handle, concurrency),
+                iterations,
+                repeat,
+                warmup=1,
+            )
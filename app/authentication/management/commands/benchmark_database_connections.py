@@ -0,0 +1,47 @@
+from django.db import connection
+
+from base.benchmark import BenchmarkCommand, benchmark
+from base.db.backends.postgresql.base import DatabaseWrapper, close_pools
+
+
+class Command(BenchmarkCommand):
+    help = "Measure database connection overhead per request."
+
+    iterations = 200
+    modes = {
+        "new connection per request": {"CONN_MAX_AGE": 0},
+        "persistent connection": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": False},
+        "persistent connection with health checks": {
+            "CONN_MAX_AGE": 60,
+            "CONN_HEALTH_CHECKS": True,
+        },
+        "pooled connection": {
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": False,
+            "POOL": {"min_size": 1, "max_size": 1},
+        },
+    }
+
+    def requester(self, alias, overrides):
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, "POOL": None, **overrides}, alias=alias
+        )
+
+        def request():
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            wrapper.close_if_unusable_or_obsolete()
+
+        return wrapper, request
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        for index, (name, overrides) in enumerate(self.modes.items()):
+            wrapper, request = self.requester(f"benchmark_{index}", overrides)
+            try:
+                yield benchmark(name, request, iterations, repeat)
+            finally:
+                wrapper.close()
+        close_pools()
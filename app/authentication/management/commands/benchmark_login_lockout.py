@@ -0,0 +1,68 @@
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from base.benchmark import BenchmarkCommand, benchmark
+
+from authentication.factories import UserFactory
+from authentication.lockout import LoginLockedOut, login_lockout
+from authentication.serializers import ObtainTokenPairSerializer
+
+
+class Command(BenchmarkCommand):
+    help = "Compare a rejected login that hashes with one rejected by the lockout."
+
+    iterations = 20
+    repeat = 3
+
+    def setup(self, **options):
+        self.user = UserFactory.create(password="c0rrect-h0rse-battery")
+        self.request = APIRequestFactory().post("/")
+        self.request.META["REMOTE_ADDR"] = "198.51.100.1"
+
+    def teardown_lockout(self):
+        login_lockout.lockout.reset(
+            login_lockout.email_ident(self.user.email),
+            login_lockout.ip_ident(self.request),
+        )
+
+    def attempt(self, expected):
+        def login():
+            serializer = ObtainTokenPairSerializer(
+                data={"email": self.user.email, "password": "wrong"},
+                context={"request": self.request},
+            )
+            try:
+                serializer.is_valid(raise_exception=True)
+            except expected:
+                return
+            raise AssertionError(f"expected {expected.__name__}")
+
+        return login
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        thresholds = login_lockout.email_threshold, login_lockout.ip_threshold
+        try:
+            login_lockout.email_threshold = login_lockout.ip_threshold = 10**9
+            yield benchmark(
+                "wrong password (hash checked)",
+                self.attempt(AuthenticationFailed),
+                iterations,
+                repeat,
+                warmup=1,
+            )
+
+            login_lockout.email_threshold, login_lockout.ip_threshold = thresholds
+            self.teardown_lockout()
+            # Enough failures past the threshold to reach the maximum delay.
+            for _ in range(login_lockout.email_threshold + 16):
+                login_lockout.register_failure(self.user.email, self.request)
+            yield benchmark(
+                "locked out (redis only)",
+                self.attempt(LoginLockedOut),
+                iterations * 50,
+                repeat,
+            )
+        finally:
+            login_lockout.email_threshold, login_lockout.ip_threshold = thresholds
+            self.teardown_lockout()
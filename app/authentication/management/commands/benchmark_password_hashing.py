@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+
+from base.benchmark import BenchmarkCommand, benchmark
+
+from authentication.hashing import PasswordHasherPool
+
+
+class Command(BenchmarkCommand):
+    help = "Compare concurrent password checks hashed inline and in a process pool."
+
+    iterations = 5
+    repeat = 3
+    concurrency = 32
+    password = "c0rrect-h0rse-battery"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--concurrency", type=int, default=self.concurrency)
+        parser.add_argument("--processes", type=int, default=os.cpu_count())
+
+    def setup(self, **options):
+        self.encoded = make_password(self.password)
+        self.threads = ThreadPoolExecutor(max_workers=options["concurrency"])
+
+    def checker(self, pool, concurrency):
+        def check():
+            futures = [
+                self.threads.submit(pool.check_password, self.password, self.encoded)
+                for _ in range(concurrency)
+            ]
+            assert all(future.result() for future in futures)
+
+        return check
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        concurrency = options["concurrency"]
+        pools = {
+            "inline": PasswordHasherPool(processes=0),
+            f"process pool of {options['processes']}": PasswordHasherPool(
+                processes=options["processes"], queue_size=concurrency
+            ),
+        }
+        try:
+            for name, pool in pools.items():
+                yield benchmark(
+                    f"{concurrency} logins ({name})",
+                    self.checker(pool, concurrency),
+                    iterations,
+                    repeat,
+                    warmup=1,
+                )
+        finally:
+            self.threads.shutdown()
+            for pool in pools.values():
+                pool.shutdown()
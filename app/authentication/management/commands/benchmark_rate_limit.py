@@ -0,0 +1,59 @@
+import uuid
+
+from django.core.cache import cache
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from base.benchmark import BenchmarkCommand, benchmark
+from base.throttling import RedisRateLimiter
+
+
+class HistoryRateThrottle(SimpleRateThrottle):
+    def __init__(self, rate, key):
+        self.rate = rate
+        self.key = key
+        super().__init__()
+
+    def get_cache_key(self, request, view):
+        return self.key
+
+
+class Command(BenchmarkCommand):
+    help = "Compare the cached timestamp list throttle with the Redis GCRA limiter."
+
+    iterations = 2000
+    repeat = 3
+    rate = "100000/hour"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--rate", default=self.rate)
+
+    def setup(self, **options):
+        self.rate = options["rate"]
+        self.key = f"benchmark_rate_limit:{uuid.uuid4()}"
+        self.limiter = RedisRateLimiter(namespace="benchmark_rate_limit")
+        self.num_requests, self.duration = SimpleRateThrottle.parse_rate(
+            None, self.rate
+        )
+
+    def teardown_keys(self):
+        cache.delete(self.key)
+        self.limiter.reset(self.key)
+
+    def history_throttle(self):
+        assert HistoryRateThrottle(self.rate, self.key).allow_request(None, None)
+
+    def redis_throttle(self):
+        assert self.limiter.hit(self.key, self.num_requests, self.duration).allowed
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        try:
+            for name, func in (
+                ("cached timestamp list", self.history_throttle),
+                ("redis gcra script", self.redis_throttle),
+            ):
+                yield benchmark(name, func, iterations, repeat)
+        finally:
+            self.teardown_keys()
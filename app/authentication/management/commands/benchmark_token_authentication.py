@@ -0,0 +1,46 @@
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from base.benchmark import BenchmarkCommand, benchmark
+
+from authentication.backends import CachedJWTAuthentication
+from authentication.factories import UserFactory
+
+
+class UncachedTokenJWTAuthentication(CachedJWTAuthentication):
+    get_validated_token = JWTAuthentication.get_validated_token
+
+
+class Command(BenchmarkCommand):
+    help = "Measure requests per second of JWT authentication for a single token."
+
+    authentication_classes = (
+        JWTAuthentication,
+        UncachedTokenJWTAuthentication,
+        CachedJWTAuthentication,
+    )
+
+    def setup(self, **options):
+        user = UserFactory.create()
+        self.factory = APIRequestFactory(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+    def authenticate(self, authentication):
+        def request():
+            user, _ = authentication.authenticate(Request(self.factory.get("/")))
+            assert user.is_authenticated
+
+        return request
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        for authentication_class in self.authentication_classes:
+            yield benchmark(
+                authentication_class.__name__,
+                self.authenticate(authentication_class()),
+                iterations,
+                repeat,
+            )
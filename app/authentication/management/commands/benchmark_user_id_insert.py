@@ -0,0 +1,64 @@
+import uuid
+
+from django.db import connection
+
+from psycopg2.extras import execute_values
+
+from base.benchmark import BenchmarkCommand, benchmark
+from base.models import uuid7
+
+
+class Command(BenchmarkCommand):
+    help = "Compare insert throughput of random (v4) and time-ordered (v7) UUID keys."
+
+    iterations = 50
+    repeat = 3
+    rows = 2_000_000
+    batch_size = 1000
+    generators = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--rows", type=int, default=self.rows)
+        parser.add_argument("--batch-size", type=int, default=self.batch_size)
+
+    def setup(self, **options):
+        self.batch_size = options["batch_size"]
+        with connection.cursor() as cursor:
+            for name, generator in self.generators.items():
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE benchmark_{name} "
+                    "(id uuid PRIMARY KEY, created_at timestamptz DEFAULT now())"
+                )
+                for start in range(0, options["rows"], 10_000):
+                    count = min(10_000, options["rows"] - start)
+                    self.insert(cursor, name, generator, count)
+                cursor.execute(f"ANALYZE benchmark_{name}")
+
+    @staticmethod
+    def insert(cursor, name, generator, count):
+        execute_values(
+            cursor,
+            f"INSERT INTO benchmark_{name} (id) VALUES %s",
+            [(generator(),) for _ in range(count)],
+            page_size=count,
+        )
+
+    def inserter(self, name):
+        generator = self.generators[name]
+
+        def insert():
+            with connection.cursor() as cursor:
+                self.insert(cursor, name, generator, self.batch_size)
+
+        return insert
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+        for name in self.generators:
+            yield benchmark(
+                f"insert {self.batch_size} rows ({name})",
+                self.inserter(name),
+                iterations,
+                repeat,
+            )
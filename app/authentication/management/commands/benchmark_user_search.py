@@ -0,0 +1,67 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from base.benchmark import BenchmarkCommand, benchmark
+
+from authentication.filters import UserFilter
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "Measure UserFilter substring search latency with and without trigram indexes."
+    )
+
+    iterations = 10
+    repeat = 3
+    users = 1_000_000
+    indexes = ("auth_user_username_trgm", "auth_user_email_trgm")
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--users", type=int, default=self.users)
+
+    def setup(self, **options):
+        table = get_user_model()._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (
+                    id, password, is_superuser, username, email, is_verified,
+                    is_active, is_staff, created_at, updated_at
+                )
+                SELECT
+                    gen_random_uuid(), '', false,
+                    'user_' || i || '_' || substr(md5(i::text), 1, 8),
+                    'user_' || i || '_' || substr(md5(i::text), 9, 8) || '@example.com',
+                    true, true, false, now(), now()
+                FROM generate_series(1, %s) AS i
+                """,
+                [options["users"]],
+            )
+            cursor.execute(f"ANALYZE {table}")
+
+        digest = hashlib.md5(str(options["users"] // 2).encode()).hexdigest()
+        self.lookups = (
+            {"username__contains": digest[:8]},
+            {"email__icontains": digest[8:16].upper()},
+            {"search": digest[:6]},
+        )
+
+    def search(self):
+        for lookup in self.lookups:
+            queryset = UserFilter(lookup, queryset=get_user_model().objects.all()).qs
+            assert list(queryset[:10])
+
+    def run(self, **options):
+        iterations, repeat = options["iterations"], options["repeat"]
+
+        sid = transaction.savepoint()
+        with connection.cursor() as cursor:
+            for index in self.indexes:
+                cursor.execute(f"DROP INDEX {index}")
+        yield benchmark("sequential scan", self.search, iterations, repeat, warmup=1)
+        transaction.savepoint_rollback(sid)
+
+        yield benchmark("trigram index", self.search, iterations, repeat, warmup=1)
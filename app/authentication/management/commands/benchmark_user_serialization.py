@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.versioning import URLPathVersioning
+
+from base.benchmark import BenchmarkCommand, BenchmarkResult, benchmark
+
+from authentication.factories import UserFactory
+from authentication.serializers import UserReadSerializer, UserSerializer
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "Compare UserSerializer and UserReadSerializer throughput in rows per second."
+    )
+
+    iterations = 20
+    rows = 1000
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--rows", type=int, default=self.rows)
+
+    def setup(self, **options):
+        UserFactory.create_batch(options["rows"], password=None)
+        self.request = Request(APIRequestFactory().get("/", HTTP_HOST="localhost"))
+        self.request.version = "v1"
+        self.request.versioning_scheme = URLPathVersioning()
+
+    def serializer(self, serializer_class, queryset, rows):
+        context = {"request": self.request}
+
+        def serialize():
+            page = queryset.order_by("created_at", "pk")[:rows]
+            assert len(serializer_class(page, many=True, context=context).data) == rows
+
+        return serialize
+
+    def run(self, **options):
+        iterations, repeat, rows = (
+            options["iterations"],
+            options["repeat"],
+            options["rows"],
+        )
+        modes = {
+            "UserSerializer": (UserSerializer, get_user_model().objects.all()),
+            "UserReadSerializer": (
+                UserReadSerializer,
+                get_user_model().objects.only(*UserReadSerializer.columns),
+            ),
+        }
+        for name, (serializer_class, queryset) in modes.items():
+            result = benchmark(
+                f"{name} ({rows} rows)",
+                self.serializer(serializer_class, queryset, rows),
+                iterations,
+                repeat,
+                warmup=1,
+            )
+            # One operation is one row, op/s reads as rows per second.
+            yield BenchmarkResult(result.name, iterations * rows, result.timings)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from base.renderers import CSVRenderer, NDJSONRenderer
+
+from authentication.exports import UserExporter
+
+
+class Command(BaseCommand):
+    help = "Export every user as NDJSON or CSV."
+
+    renderers = {
+        renderer.format: renderer for renderer in (NDJSONRenderer, CSVRenderer)
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=list(self.renderers), default=NDJSONRenderer.format
+        )
+        parser.add_argument(
+            "--output", default="-", help="File to write, - writes standard output."
+        )
+        parser.add_argument("--chunk-size", type=int)
+
+    def handle(self, *args, **options):
+        exporter = UserExporter(chunk_size=options["chunk_size"])
+        renderer = self.renderers[options["format"]]()
+
+        count = 0
+
+        def rows():
+            nonlocal count
+            for count, row in enumerate(exporter.rows(), 1):
+                yield row
+
+        chunks = renderer.stream(rows(), list(exporter.fields))
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+        else:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+
+        self.stderr.write(f"Exported {count} users")
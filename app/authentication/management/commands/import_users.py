@@ -0,0 +1,66 @@
+import os
+import sys
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.hashing import PasswordHasherPool
+from authentication.imports import UserImporter
+
+
+class Command(BaseCommand):
+    help = "Import users from a CSV or NDJSON file."
+
+    extensions = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, - reads standard input.")
+        parser.add_argument("--format", choices=UserImporter.formats)
+        parser.add_argument("--url", help="Base url of the verification link.")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="Password hashing processes, 0 hashes in this process.",
+        )
+
+    def get_format(self, path, import_format):
+        if import_format:
+            return import_format
+        _, extension = os.path.splitext(path)
+        if extension.lower() not in self.extensions:
+            raise CommandError("Cannot infer the import format, use --format.")
+        return self.extensions[extension.lower()]
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_format = self.get_format(path, options["format"])
+        hasher = PasswordHasherPool(processes=options["processes"], queue_size=0)
+        importer = UserImporter(
+            url=options["url"], batch_size=options["batch_size"], hasher=hasher
+        )
+
+        stream = (
+            sys.stdin
+            if path == "-"
+            else open(
+                path, encoding="utf-8-sig", newline=""
+            )  # pylint: disable=consider-using-with
+        )
+        progress = None
+        try:
+            for progress in importer.run(stream, import_format):
+                for error in progress.errors:
+                    self.stderr.write(f"Line {error.line}: {json.dumps(error.errors)}")
+                self.stdout.write(str(progress))
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            hasher.shutdown()
+            if stream is not sys.stdin:
+                stream.close()
+
+        if progress is None:
+            self.stdout.write("No users to import")
@@ -0,0 +1,54 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from authentication.blacklist import RedisTokenBlacklist, token_blacklist
+
+
+class Command(BaseCommand):
+    help = "Copy the database token blacklist into the Redis token blacklist."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete the migrated tokens from the database tables.",
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(token_blacklist, RedisTokenBlacklist):
+            raise CommandError(
+                "TOKEN_BLACKLIST_BACKEND must be set to the Redis token blacklist."
+            )
+
+        entries = (
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list("token_id", "token__jti", "token__expires_at")
+            .iterator(chunk_size=options["batch_size"])
+        )
+
+        migrated = deleted = 0
+        while batch := list(islice(entries, options["batch_size"])):
+            migrated += token_blacklist.blacklist_many(
+                (jti, expires_at.timestamp()) for _, jti, expires_at in batch
+            )
+            self.stdout.write(f"Migrated {migrated} blacklisted tokens")
+
+            if options["delete"]:
+                # Only the rows copied to Redis, outstanding tokens that were
+                # never blacklisted are still needed by the database backend.
+                deleted += OutstandingToken.objects.filter(
+                    pk__in=[pk for pk, _, _ in batch]
+                ).delete()[0]
+
+        if options["delete"]:
+            self.stdout.write(f"Deleted {deleted} rows")
+
+        self.stdout.write(self.style.SUCCESS(f"Migrated {migrated} tokens in total"))
@@ -0,0 +1,31 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from authentication.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Send the emails queued in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int)
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--poll-interval", type=float, help="Seconds")
+        parser.add_argument(
+            "--once", action="store_true", help="Drain the outbox once and exit."
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options["poll_interval"]
+        worker = OutboxWorker(
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            poll_interval=datetime.timedelta(seconds=poll_interval)
+            if poll_interval is not None
+            else None,
+        )
+
+        for sent, failed in worker.run(once=options["once"]):
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed")
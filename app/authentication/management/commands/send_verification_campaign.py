@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from authentication.campaigns import VerificationCampaign
+
+
+class Command(BaseCommand):
+    help = "Resend account verification emails to every unverified user."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="Base url of the verification link.")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--rate", type=float, help="Emails per second")
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Queue the emails in the outbox instead of sending them.",
+        )
+
+    def handle(self, *args, **options):
+        campaign = VerificationCampaign(
+            url=options["url"], batch_size=options["batch_size"], rate=options["rate"]
+        )
+
+        if options["queue"]:
+            queued = campaign.enqueue()
+            self.stdout.write(f"Queued {queued} verification emails")
+            return
+
+        progress = None
+        for progress in campaign.run():
+            self.stdout.write(str(progress))
+
+        if progress is None:
+            self.stdout.write("No unverified users")
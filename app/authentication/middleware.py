@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
-from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 
+from base.db import database_sync_to_async
+
 
 @database_sync_to_async
 def get_user(user_id):
@@ -17,18 +18,19 @@ def get_user(user_id):
 class TokenAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
         # pylint: disable=import-outside-toplevel
-        from rest_framework_simplejwt.tokens import AccessToken, TokenError
+        from rest_framework_simplejwt.exceptions import TokenError
+        from authentication.tokens import AccessToken
         from django.contrib.auth.models import AnonymousUser
 
         try:
             token = dict(scope["headers"])["sec-websocket-protocol"].decode("utf-8")
-        except ValueError:
+        except (KeyError, ValueError):
             token = None
 
         try:
             access_token = AccessToken(token)
             scope["user"] = await get_user(access_token["user_id"])
-        except TokenError:
+        except (KeyError, TokenError):
             scope["user"] = AnonymousUser()
 
         return await super().__call__(scope, receive, send)
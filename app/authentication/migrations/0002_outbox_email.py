@@ -0,0 +1,131 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "subject",
+                    models.CharField(
+                        help_text="The subject of the email.",
+                        max_length=998,
+                        verbose_name="subject",
+                    ),
+                ),
+                (
+                    "body",
+                    models.TextField(
+                        help_text="The plain text body of the email.",
+                        verbose_name="body",
+                    ),
+                ),
+                (
+                    "html",
+                    models.TextField(
+                        blank=True,
+                        help_text="The HTML alternative of the email body, if any.",
+                        verbose_name="html",
+                    ),
+                ),
+                (
+                    "sender",
+                    models.CharField(
+                        help_text="The address the email is sent from.",
+                        max_length=255,
+                        verbose_name="sender",
+                    ),
+                ),
+                (
+                    "recipients",
+                    models.JSONField(
+                        help_text="The list of addresses the email is sent to.",
+                        verbose_name="recipients",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        help_text="Whether the email is waiting to be sent, sent or failed.",
+                        max_length=16,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of times sending the email was attempted.",
+                        verbose_name="attempts",
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(
+                        blank=True,
+                        help_text="The error raised by the last failed attempt.",
+                        verbose_name="last error",
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="The earliest date and time of the next sending attempt.",
+                        verbose_name="next attempt",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="The date and time when the email was queued.",
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="The date and time when the email was sent.",
+                        null=True,
+                        verbose_name="sent",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Outbox email",
+                "verbose_name_plural": "Outbox emails",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="outboxemail",
+            index=models.Index(
+                fields=["status", "next_attempt_at"],
+                name="authenticat_status_a5bd44_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentication", "0002_outbox_email"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["created_at", "id"], name="authentication_user_keyset"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("authentication", "0003_user_keyset_index"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="user",
+            index=GinIndex(
+                fields=["username"],
+                name="auth_user_username_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=GinIndex(
+                fields=["email"],
+                name="auth_user_email_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("authentication", "0004_user_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS auth_user_email_lower_uniq ON authentication_user (lower(email))",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS auth_user_email_lower_uniq",
+        ),
+    ]
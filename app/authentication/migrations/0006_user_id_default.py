@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:30
+
+import authentication.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentication", "0005_user_email_lower_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=authentication.models.generate_user_id,
+                editable=False,
+                help_text="A unique identifier for the user. This field is automatically generated and cannot be edited.",
+                primary_key=True,
+                serialize=False,
+                verbose_name="id",
+            ),
+        ),
+    ]
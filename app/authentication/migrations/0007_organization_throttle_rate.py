@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:10
+
+import base.throttling.throttles
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentication", "0006_user_id_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="organization",
+            name="throttle_rate",
+            field=models.CharField(
+                blank=True,
+                help_text="The request rate allowed for the organization, e.g. 1000/minute. Leave empty to use the default organization rate.",
+                max_length=32,
+                null=True,
+                validators=[base.throttling.throttles.validate_rate],
+                verbose_name="throttle rate",
+            ),
+        ),
+    ]
@@ -1,6 +1,9 @@
 import uuid
 
 from django.db import models
+from django.db.models.functions import Lower
+from django.contrib.postgres.indexes import GinIndex
+from django.utils import timezone
 from django.utils.translation import ugettext as _
 from django.contrib.auth.models import (
     AbstractBaseUser,
@@ -8,7 +11,14 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 
-from rest_framework_api_key.models import AbstractAPIKey
+from rest_framework_api_key.models import AbstractAPIKey, BaseAPIKeyManager
+
+from base.models import uuid7
+from base.throttling import validate_rate
+
+from authentication.cache import api_key_cache
+from authentication.hashing import password_hasher
+from authentication.settings import api_settings
 
 
 class Organization(models.Model):
@@ -30,12 +40,51 @@ class Organization(models.Model):
         ),
     )
 
+    throttle_rate = models.CharField(
+        verbose_name=_("throttle rate"),
+        max_length=32,
+        null=True,
+        blank=True,
+        validators=[validate_rate],
+        help_text=_(
+            "The request rate allowed for the organization, e.g. 1000/minute. "
+            "Leave empty to use the default organization rate."
+        ),
+    )
+
     class Meta:
         verbose_name = _("Organization")
         verbose_name_plural = _("Organizations")
 
 
+class OrganizationAPIKeyManager(BaseAPIKeyManager):
+    def get_usable_keys(self):
+        return (
+            super()
+            .get_usable_keys()
+            .filter(organization__active=True)
+            .select_related("organization")
+        )
+
+    def is_valid(self, key):
+        if api_key_cache.is_valid(key):
+            return True
+
+        try:
+            api_key = self.get_from_key(key)
+        except self.model.DoesNotExist:
+            return False
+
+        if api_key.has_expired:
+            return False
+
+        api_key_cache.add(key, api_key)
+        return True
+
+
 class OrganizationAPIKey(AbstractAPIKey):
+    objects = OrganizationAPIKeyManager()
+
     organization = models.ForeignKey(
         to=Organization,
         verbose_name=_("organization"),
@@ -53,6 +102,21 @@ class OrganizationAPIKey(AbstractAPIKey):
 
 
 class UserManager(BaseUserManager):
+    @classmethod
+    def normalize_email(cls, email):
+        return super().normalize_email(email.strip() if email else email)
+
+    def filter_by_email(self, email):
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower=Lower(models.Value(self.normalize_email(email)))
+        )
+
+    def get_by_email(self, email):
+        return self.filter_by_email(email).get()
+
+    def get_by_natural_key(self, username):
+        return self.get_by_email(username)
+
     def create_user(self, username, email, password=None):
         if username is None:
             raise TypeError("Users should have a username")
@@ -75,11 +139,17 @@ class UserManager(BaseUserManager):
         return user
 
 
+def generate_user_id():
+    if api_settings.USER_ID_TIME_ORDERED:
+        return uuid7()
+    return uuid.uuid4()
+
+
 class User(AbstractBaseUser, PermissionsMixin):
     id = models.UUIDField(
         verbose_name=_("id"),
         primary_key=True,
-        default=uuid.uuid4,
+        default=generate_user_id,
         editable=False,
         help_text=_(
             "A unique identifier for the user. This field is automatically "
@@ -156,6 +226,199 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="authentication_user_keyset"
+            ),
+            GinIndex(
+                fields=["username"],
+                name="auth_user_username_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["email"],
+                name="auth_user_email_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.email)
+
+    def clean(self):
+        super().clean()
+        self.email = self.__class__.objects.normalize_email(self.email)
+
+    def save(self, *args, **kwargs):
+        self.email = self.__class__.objects.normalize_email(self.email)
+        super().save(*args, **kwargs)
+
+    def set_password(self, raw_password):
+        self.password = password_hasher.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return password_hasher.check_password(raw_password, self.password, setter)
+
+
+class OutboxEmailManager(models.Manager):
+    def build(self, message):
+        alternatives = dict(
+            (mimetype, content) for content, mimetype in message.alternatives
+        )
+        return self.model(
+            subject=message.subject,
+            body=message.body,
+            html=alternatives.get("text/html", ""),
+            sender=message.from_email,
+            recipients=message.to,
+        )
+
+    def enqueue(self, message):
+        email = self.build(message)
+        email.save(force_insert=True, using=self.db)
+        return email
+
+    def enqueue_many(self, messages, batch_size=None):
+        return self.bulk_create(
+            [self.build(message) for message in messages], batch_size=batch_size
+        )
+
+    def due(self):
+        return self.filter(
+            status=OutboxEmail.Status.PENDING, next_attempt_at__lte=timezone.now()
+        ).order_by("next_attempt_at")
+
+
+class OutboxEmail(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    subject = models.CharField(
+        verbose_name=_("subject"),
+        max_length=998,
+        help_text=_("The subject of the email."),
+    )
+
+    body = models.TextField(
+        verbose_name=_("body"),
+        help_text=_("The plain text body of the email."),
+    )
+
+    html = models.TextField(
+        verbose_name=_("html"),
+        blank=True,
+        help_text=_("The HTML alternative of the email body, if any."),
+    )
+
+    sender = models.CharField(
+        verbose_name=_("sender"),
+        max_length=255,
+        help_text=_("The address the email is sent from."),
+    )
+
+    recipients = models.JSONField(
+        verbose_name=_("recipients"),
+        help_text=_("The list of addresses the email is sent to."),
+    )
+
+    status = models.CharField(
+        verbose_name=_("status"),
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text=_("Whether the email is waiting to be sent, sent or failed."),
+    )
+
+    attempts = models.PositiveIntegerField(
+        verbose_name=_("attempts"),
+        default=0,
+        help_text=_("The number of times sending the email was attempted."),
+    )
+
+    last_error = models.TextField(
+        verbose_name=_("last error"),
+        blank=True,
+        help_text=_("The error raised by the last failed attempt."),
+    )
+
+    next_attempt_at = models.DateTimeField(
+        verbose_name=_("next attempt"),
+        default=timezone.now,
+        help_text=_("The earliest date and time of the next sending attempt."),
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name=_("created"),
+        auto_now_add=True,
+        help_text=_("The date and time when the email was queued."),
+    )
+
+    sent_at = models.DateTimeField(
+        verbose_name=_("sent"),
+        null=True,
+        blank=True,
+        help_text=_("The date and time when the email was sent."),
+    )
+
+    objects = OutboxEmailManager()
+
+    class Meta:
+        verbose_name = _("Outbox email")
+        verbose_name_plural = _("Outbox emails")
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
 
     def __str__(self) -> str:
+        return str(self.subject)
+
+
+class UserSnapshot:
+    fields = (
+        "id",
+        "email",
+        "username",
+        "is_active",
+        "is_verified",
+        "is_staff",
+        "is_superuser",
+    )
+
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(self, **values):
+        for field in self.fields:
+            setattr(self, field, values[field])
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(**{field: getattr(user, field) for field in cls.fields})
+
+    @property
+    def pk(self):
+        return self.id
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.fields}
+
+    def get_username(self):
+        return self.email
+
+    def get_user(self):
+        return User.objects.get(pk=self.id)
+
+    def __str__(self):
         return str(self.email)
+
+    def __eq__(self, other):
+        return isinstance(other, (UserSnapshot, User)) and self.pk == other.pk
+
+    def __hash__(self):
+        return hash(self.pk)
@@ -0,0 +1,124 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from authentication.models import OutboxEmail
+from authentication.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    workers = api_settings.EMAIL_OUTBOX_WORKERS
+    batch_size = api_settings.EMAIL_OUTBOX_BATCH_SIZE
+    max_attempts = api_settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    retry_backoff = api_settings.EMAIL_OUTBOX_RETRY_BACKOFF
+    lease = api_settings.EMAIL_OUTBOX_LEASE
+    poll_interval = api_settings.EMAIL_OUTBOX_POLL_INTERVAL
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            if value is not None:
+                setattr(self, name, value)
+
+    def claim(self):
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.due().select_for_update(skip_locked=True)[
+                    : self.batch_size
+                ]
+            )
+            if emails:
+                OutboxEmail.objects.filter(
+                    pk__in=[email.pk for email in emails]
+                ).update(next_attempt_at=timezone.now() + self.lease)
+        return emails
+
+    def send_batch(self, emails):
+        sent, failed = [], []
+        try:
+            connection = get_connection()
+            connection.open()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Opening email connection failed: %s", exc)
+            failed = [(email, exc) for email in emails]
+        else:
+            with connection:
+                for email in emails:
+                    try:
+                        self.create_message(email, connection).send()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        logger.warning(
+                            "Sending outbox email %s failed: %s", email.pk, exc
+                        )
+                        failed.append((email, exc))
+                    else:
+                        sent.append(email)
+
+        self.mark_sent(sent)
+        self.mark_failed(failed)
+        return len(sent), len(failed)
+
+    @staticmethod
+    def create_message(email, connection):
+        message = EmailMultiAlternatives(
+            email.subject,
+            email.body,
+            email.sender,
+            email.recipients,
+            connection=connection,
+        )
+        if email.html:
+            message.attach_alternative(email.html, "text/html")
+        return message
+
+    def mark_sent(self, emails):
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            status=OutboxEmail.Status.SENT, sent_at=timezone.now()
+        )
+
+    def mark_failed(self, failures):
+        now = timezone.now()
+        for email, exc in failures:
+            email.attempts += 1
+            email.last_error = str(exc)
+            if email.attempts >= self.max_attempts:
+                email.status = OutboxEmail.Status.FAILED
+            else:
+                email.next_attempt_at = now + self.retry_backoff * 2 ** (
+                    email.attempts - 1
+                )
+        OutboxEmail.objects.bulk_update(
+            [email for email, _ in failures],
+            ["attempts", "last_error", "status", "next_attempt_at"],
+        )
+
+    def drain(self):
+        sent = failed = 0
+        while emails := self.claim():
+            batch_sent, batch_failed = self.send_batch(emails)
+            sent, failed = sent + batch_sent, failed + batch_failed
+        return sent, failed
+
+    def _drain_in_thread(self, *_args):
+        try:
+            return self.drain()
+        finally:
+            db_connection.close()
+
+    def run(self, once=False):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                results = list(executor.map(self._drain_in_thread, range(self.workers)))
+                sent = sum(batch_sent for batch_sent, _ in results)
+                failed = sum(batch_failed for _, batch_failed in results)
+                yield sent, failed
+
+                if once:
+                    return
+                if not sent and not failed:
+                    time.sleep(self.poll_interval.total_seconds())
@@ -0,0 +1,12 @@
+from base.pagination import KeysetPagination, SelectablePagination
+
+
+class UserKeysetPagination(KeysetPagination):
+    tiebreaker = ("created_at", "id")
+
+
+class UserPagination(SelectablePagination):
+    pagination_classes = {
+        **SelectablePagination.pagination_classes,
+        "cursor": UserKeysetPagination,
+    }
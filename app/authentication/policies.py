@@ -1,3 +1,5 @@
+from rest_framework.permissions import IsAdminUser
+
 from base.permissions import GenericAccessPolicy
 
 from authentication.permissions import (
@@ -19,6 +21,10 @@ class AuthenticatedAndVerifiedAccessPolicy(OrganizationAPIKeyAccessPolicy):
     permissions = [IsAuthenticatedAndVerified]
 
 
+class StaffAccessPolicy(AuthenticatedAndVerifiedAccessPolicy):
+    permissions = [IsAdminUser]
+
+
 class UserAccessPolicy(AuthenticatedAndVerifiedAccessPolicy):
     statements = [
         {
@@ -1,8 +1,27 @@
+import uuid
+from operator import attrgetter
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password, ValidationError
 from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from authentication.blacklist import revoked_sessions, token_blacklist
+from authentication.hashing import password_hasher
+from authentication.lockout import login_lockout
+from authentication.settings import api_settings
+from authentication.tokens import RefreshToken, UntypedToken
 
 from authentication.utils import (
     AccountVerificationTokenGenerator,
@@ -21,6 +40,7 @@ _password_recovery_sender = PasswordRecoverySender()
 
 class UserSerializer(serializers.HyperlinkedModelSerializer):
     password = serializers.CharField(write_only=True)
+    verification_url = serializers.URLField(write_only=True, required=False)
 
     class Meta:
         model = get_user_model()
@@ -28,6 +48,7 @@ class UserSerializer(serializers.HyperlinkedModelSerializer):
             "url",
             "username",
             "password",
+            "verification_url",
             "email",
             "verified",
             "activated",
@@ -52,6 +73,14 @@ class UserSerializer(serializers.HyperlinkedModelSerializer):
             "updated": {"source": "updated_at"},
         }
 
+    def validate_email(self, value):
+        email = get_user_model().objects.normalize_email(value)
+        if get_user_model().objects.filter_by_email(email).exists():
+            raise serializers.ValidationError(
+                _("user with this email already exists."), code="unique"
+            )
+        return email
+
     def validate_password(self, value):
         try:
             validate_password(value)
@@ -60,21 +89,100 @@ class UserSerializer(serializers.HyperlinkedModelSerializer):
         return value
 
     def create(self, validated_data):
-        password = validated_data.pop("password", None)
-        assert password is not None
+        url = validated_data.pop(
+            "verification_url", api_settings.ACCOUNT_VERIFICATION_URL
+        )
+        validated_data["password"] = password_hasher.make_password(
+            validated_data["password"]
+        )
 
         user = super().create(validated_data)
         assert user is not None
 
-        user.set_password(password)
-        user.save()
-
-        token, _ = _account_verification_token_generator.make_token(user)
-        _account_verification_sender.send(user, token)
+        if url:
+            token, _ = _account_verification_token_generator.make_token(user)
+            _account_verification_sender.send(user, url, token)
 
         return user
 
 
+class UserReadSerializer(serializers.BaseSerializer):
+    # pylint: disable=abstract-method
+    # Renders the UserSerializer output without building a field graph per
+    # instance, the detail url is reversed once and formatted for each row.
+    columns = (
+        "id",
+        "username",
+        "email",
+        "is_verified",
+        "is_active",
+        "is_staff",
+        "created_at",
+        "updated_at",
+    )
+    url_sentinel = uuid.UUID(int=0)
+    datetime_field = serializers.DateTimeField()
+
+    mapping = tuple(
+        (
+            name,
+            attrgetter(
+                UserSerializer.Meta.extra_kwargs.get(name, {}).get("source", name)
+            ),
+            name in ("created", "updated"),
+        )
+        for name in UserSerializer.Meta.fields
+        if name not in ("url", "password", "verification_url")
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._url_template = None
+
+    def get_url_template(self):
+        if self._url_template is None:
+            url = reverse(
+                UserSerializer.Meta.extra_kwargs["url"]["view_name"],
+                kwargs={"id": self.url_sentinel},
+                request=self.context["request"],
+            )
+            prefix, _, suffix = url.partition(str(self.url_sentinel))
+            self._url_template = prefix, suffix
+        return self._url_template
+
+    def to_representation(self, instance):
+        prefix, suffix = self.get_url_template()
+        data = {"url": f"{prefix}{instance.pk}{suffix}"}
+        to_datetime = self.datetime_field.to_representation
+        for name, getter, is_datetime in self.mapping:
+            value = getter(instance)
+            data[name] = to_datetime(value) if is_datetime and value else value
+        return data
+
+
+class UserImportSerializer(serializers.Serializer):
+    # pylint: disable=abstract-method
+    username = serializers.CharField(max_length=255)
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(required=False)
+
+    def validate_email(self, value):
+        # Uniqueness is checked once per batch by the importer.
+        return get_user_model().objects.normalize_email(value)
+
+    def validate_password(self, value):
+        try:
+            validate_password(value)
+        except ValidationError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
+
+class UserImportOptionsSerializer(serializers.Serializer):
+    # pylint: disable=abstract-method
+    verification_url = serializers.URLField(required=False)
+
+
 class SendActivationEmailTokenSerializer(serializers.Serializer):
     email = serializers.EmailField(max_length=255, min_length=3, write_only=True)
     url = serializers.URLField(write_only=True)
@@ -86,22 +194,27 @@ class SendActivationEmailTokenSerializer(serializers.Serializer):
         ),
     }
 
-    def validate_email(self, email):
+    def validate(self, attrs):
         try:
-            user = get_user_model().objects.get(email=email)
+            user = get_user_model().objects.get_by_email(attrs["email"])
         except get_user_model().DoesNotExist:
-            self.fail("invalid_email")
+            raise serializers.ValidationError(
+                {"email": self.error_messages["invalid_email"]}, code="invalid_email"
+            )
 
         if user.is_verified:
-            self.fail("verified_email")
+            raise serializers.ValidationError(
+                {"email": self.error_messages["verified_email"]}, code="verified_email"
+            )
 
-        return email
+        attrs["user"] = user
+
+        return attrs
 
     def save(self):
-        email = self.validated_data["email"]
+        user = self.validated_data["user"]
         url = self.validated_data["url"]
 
-        user = get_user_model().objects.get(email=email)
         token, _ = _account_verification_token_generator.make_token(user)
 
         _account_verification_sender.send(user, url, token)
@@ -115,16 +228,20 @@ class SendRecoveryPasswordTokenSerializer(serializers.Serializer):
         "invalid_email": _("Email used to obtain password recovery token is not valid"),
     }
 
-    def validate_email(self, email):
-        if not get_user_model().objects.filter(email=email).exists():
-            self.fail("invalid_email")
-        return email
+    def validate(self, attrs):
+        try:
+            attrs["user"] = get_user_model().objects.get_by_email(attrs["email"])
+        except get_user_model().DoesNotExist:
+            raise serializers.ValidationError(
+                {"email": self.error_messages["invalid_email"]}, code="invalid_email"
+            )
+
+        return attrs
 
     def save(self):
-        email = self.validated_data["email"]
+        user = self.validated_data["user"]
         url = self.validated_data["url"]
 
-        user = get_user_model().objects.get(email=email)
         token, _ = _password_recovery_token_generator.make_token(user)
 
         _password_recovery_sender.send(user, url, token)
@@ -144,7 +261,9 @@ class VerifyActivationEmailTokenSerializer(serializers.Serializer):
         if not token:
             self.fail("missing_token")
 
-        valid, user = _account_verification_token_generator.check_token(token)
+        valid, user = _account_verification_token_generator.check_token(
+            token, consume=True
+        )
         if not valid:
             self.fail("invalid_token")
         if user.is_verified:
@@ -175,7 +294,9 @@ class VerifyPasswordRecoveryTokenSerializer(serializers.Serializer):
         if not token:
             self.fail("missing_token")
 
-        valid, user = _password_recovery_token_generator.check_token(token)
+        valid, user = _password_recovery_token_generator.check_token(
+            token, consume=True
+        )
         if not valid:
             self.fail("invalid_token")
 
@@ -199,3 +320,122 @@ class VerifyPasswordRecoveryTokenSerializer(serializers.Serializer):
 
         user.set_password(password)
         user.save()
+
+
+class ObtainTokenPairSerializer(TokenObtainPairSerializer):
+    # pylint: disable=abstract-method
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        email = attrs[self.username_field]
+        request = self.context.get("request")
+
+        login_lockout.check(email, request)
+        try:
+            data = super().validate(attrs)
+        except AuthenticationFailed:
+            login_lockout.register_failure(email, request)
+            raise
+
+        login_lockout.reset(email)
+        return data
+
+
+class RefreshTokenSerializer(TokenRefreshSerializer):
+    # pylint: disable=abstract-method
+    token_class = RefreshToken
+
+
+class VerifyTokenSerializer(TokenVerifySerializer):
+    # pylint: disable=abstract-method
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+
+        if token_blacklist.is_blacklisted(token.get(jwt_settings.JTI_CLAIM)):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+
+        if revoked_sessions.is_revoked(token):
+            raise serializers.ValidationError(_("Token has been revoked"))
+
+        return {}
+
+
+class VerifyTokenBatchSerializer(serializers.Serializer):
+    # pylint: disable=abstract-method
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=api_settings.TOKEN_VERIFY_BATCH_SIZE,
+        write_only=True,
+    )
+    results = serializers.ListField(child=serializers.DictField(), read_only=True)
+
+    def validate(self, attrs):
+        results = []
+        for raw_token in attrs["tokens"]:
+            try:
+                token = UntypedToken(raw_token)
+            except TokenError as exc:
+                results.append(
+                    {
+                        "valid": False,
+                        "blacklisted": False,
+                        "claims": None,
+                        "error": str(exc),
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "valid": True,
+                        "blacklisted": False,
+                        "claims": token.payload,
+                        "error": None,
+                    }
+                )
+
+        blacklisted = token_blacklist.filter_blacklisted(
+            [
+                result["claims"].get(jwt_settings.JTI_CLAIM)
+                for result in results
+                if result["valid"]
+            ]
+        )
+        for result in results:
+            if (
+                result["valid"]
+                and result["claims"].get(jwt_settings.JTI_CLAIM) in blacklisted
+            ):
+                result.update(
+                    valid=False, blacklisted=True, error=str(_("Token is blacklisted"))
+                )
+
+        claim = revoked_sessions.claim
+        revoked = revoked_sessions.filter_blacklisted(
+            [
+                result["claims"][claim]
+                for result in results
+                if result["valid"] and claim in result["claims"]
+            ]
+        )
+        for result in results:
+            if result["valid"] and result["claims"].get(claim) in revoked:
+                result.update(
+                    valid=False,
+                    blacklisted=True,
+                    error=str(_("Token has been revoked")),
+                )
+
+        return {"results": results}
+
+
+class BlacklistTokenSerializer(TokenBlacklistSerializer):
+    # pylint: disable=abstract-method
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        revoked_sessions.revoke(self.token_class(attrs["refresh"], verify=False))
+
+        return data
@@ -17,13 +17,62 @@ DEFAULTS = {
     "EMAIL_PASSWORD_RECOVERY_SUBJECT": "Recovery your password {{ username }}",
     "EMAIL_PASSWORD_RECOVERY_PLAIN": "password_recovery.txt",
     "EMAIL_PASSWORD_RECOVERY_HTML": "password_recovery.html",
+    "EMAIL_OUTBOX_WORKERS": 4,
+    "EMAIL_OUTBOX_BATCH_SIZE": 50,
+    "EMAIL_OUTBOX_MAX_ATTEMPTS": 5,
+    "EMAIL_OUTBOX_RETRY_BACKOFF": datetime.timedelta(seconds=30),
+    "EMAIL_OUTBOX_LEASE": datetime.timedelta(minutes=5),
+    "EMAIL_OUTBOX_POLL_INTERVAL": datetime.timedelta(seconds=5),
+    "ACCOUNT_VERIFICATION_URL": None,
+    "VERIFICATION_CAMPAIGN_URL": None,
+    "VERIFICATION_CAMPAIGN_BATCH_SIZE": 500,
+    "VERIFICATION_CAMPAIGN_RATE": None,
+    "USER_IMPORT_BATCH_SIZE": 1000,
+    "USER_IMPORT_MAX_ERRORS": 1000,
+    "USER_EXPORT_CHUNK_SIZE": 2000,
     "TOKEN_GENERATOR_ALGORITHM": "HS256",
     "TOKEN_GENERATOR_SECRET": settings.SECRET_KEY,
     "ACCOUNT_VERIFICATION_TOKEN_LIFETIME": datetime.timedelta(days=1),
     "PASSWORD_RECOVERY_TOKEN_LIFETIME": datetime.timedelta(minutes=15),
+    "TOKEN_GENERATOR_USE_SIGNING_KEYS": False,
+    "SIGNING_KEYS": [],
+    "JWKS_MAX_AGE": datetime.timedelta(hours=1),
+    "USER_ID_TIME_ORDERED": False,
+    "PASSWORD_HASHING_PROCESSES": 0,
+    "PASSWORD_HASHING_QUEUE_SIZE": 64,
+    "PASSWORD_HASHING_QUEUE_TIMEOUT": datetime.timedelta(seconds=5),
+    "API_KEY_CACHE_ALIAS": "default",
+    "API_KEY_CACHE_SIZE": 1024,
+    "API_KEY_CACHE_LOCAL_TTL": datetime.timedelta(seconds=10),
+    "API_KEY_CACHE_TTL": datetime.timedelta(minutes=5),
+    "RATE_LIMIT_CACHE_ALIAS": "default",
+    "LOGIN_LOCKOUT_CACHE_ALIAS": "default",
+    "LOGIN_LOCKOUT_EMAIL_THRESHOLD": 5,
+    "LOGIN_LOCKOUT_IP_THRESHOLD": 50,
+    "LOGIN_LOCKOUT_WINDOW": datetime.timedelta(hours=1),
+    "LOGIN_LOCKOUT_BASE_DELAY": datetime.timedelta(seconds=1),
+    "LOGIN_LOCKOUT_MAX_DELAY": datetime.timedelta(minutes=15),
+    "ACCESS_TOKEN_CACHE_SIZE": 8192,
+    "USER_SNAPSHOT_CACHE_ALIAS": "default",
+    "USER_SNAPSHOT_CACHE_SIZE": 4096,
+    "USER_SNAPSHOT_CACHE_LOCAL_TTL": datetime.timedelta(seconds=10),
+    "USER_SNAPSHOT_CACHE_TTL": datetime.timedelta(minutes=15),
+    "TOKEN_VERIFY_BATCH_SIZE": 1000,
+    "TOKEN_BLACKLIST_BACKEND": "authentication.blacklist.DatabaseTokenBlacklist",
+    "TOKEN_BLACKLIST_ALIAS": "default",
+    "TOKEN_BLACKLIST_BLOOM_CAPACITY": 1_000_000,
+    "TOKEN_BLACKLIST_BLOOM_ERROR_RATE": 0.001,
+    "TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL": datetime.timedelta(hours=1),
+    "CONSUMED_TOKEN_ALIAS": "default",
+    "SESSION_ID_CLAIM": "sid",
+    "REVOKED_SESSION_ALIAS": "default",
+    "IDEMPOTENCY_CACHE_ALIAS": "default",
+    "IDEMPOTENCY_KEY_TTL": datetime.timedelta(hours=24),
+    "IDEMPOTENCY_LOCK_TIMEOUT": datetime.timedelta(seconds=30),
+    "IDEMPOTENCY_WAIT_TIMEOUT": datetime.timedelta(seconds=10),
 }
 
-IMPORT_STRINGS = ()
+IMPORT_STRINGS = ("TOKEN_BLACKLIST_BACKEND",)
 
 REMOVED_SETTINGS = ()
 
@@ -48,5 +97,11 @@ def reload_api_settings(*args, **kwargs):
     if setting == "AUTHENTICATION_APP":
         api_settings = APISettings(value, DEFAULTS, IMPORT_STRINGS)
 
+    if setting in ("AUTHENTICATION_APP", "TEMPLATES"):
+        # pylint: disable=import-outside-toplevel
+        from .utils import EmailSender
+
+        EmailSender.clear_templates()
+
 
 setting_changed.connect(reload_api_settings)
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from authentication.cache import api_key_cache, user_snapshot_cache
+from authentication.models import Organization, OrganizationAPIKey, User
+
+
+@receiver(post_save, sender=OrganizationAPIKey)
+@receiver(post_delete, sender=OrganizationAPIKey)
+def invalidate_api_key(sender, instance, **kwargs):
+    # pylint: disable=unused-argument
+    api_key_cache.invalidate(instance.prefix)
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_organization_api_keys(sender, instance, created, **kwargs):
+    # pylint: disable=unused-argument
+    if not created:
+        api_key_cache.invalidate(*instance.api_keys.values_list("prefix", flat=True))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    # pylint: disable=unused-argument
+    user_snapshot_cache.invalidate(instance.pk)
@@ -2,9 +2,19 @@ from django.utils.translation import ugettext as _
 
 from rest_framework import status, serializers
 
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+    OpenApiResponse,
+)
 
-from authentication.serializers import UserSerializer
+from authentication.serializers import (
+    UserImportOptionsSerializer,
+    UserSerializer,
+    VerifyTokenBatchSerializer,
+)
 
 
 # =====================================================
@@ -23,6 +33,33 @@ class TokenRefreshResponseSerializer(serializers.Serializer):
     access = serializers.CharField()
 
 
+class UserImportErrorSerializer(serializers.Serializer):
+    # pylint: disable=abstract-method
+    line = serializers.IntegerField()
+    errors = serializers.DictField(child=serializers.ListField())
+
+
+class UserImportResponseSerializer(serializers.Serializer):
+    # pylint: disable=abstract-method
+    processed = serializers.IntegerField()
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    errors = UserImportErrorSerializer(many=True)
+
+
+# =====================================================
+#                   Swagger Parameters
+# =====================================================
+
+idempotency_key_parameter = OpenApiParameter(
+    name="Idempotency-Key",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description=_("Replays the stored response when a request is retried."),
+)
+
+
 # =====================================================
 #                   Swagger Decorators
 # =====================================================
@@ -48,6 +85,13 @@ extend_verify_token_schema = extend_schema_view(
     )
 )
 
+extend_verify_token_batch_schema = extend_schema_view(
+    post=extend_schema(
+        description=_("Verify Token Batch"),
+        responses={status.HTTP_200_OK: VerifyTokenBatchSerializer},
+    )
+)
+
 extend_blacklist_token_schema = extend_schema_view(
     post=extend_schema(
         description=_("Blacklist Token"),
@@ -57,7 +101,9 @@ extend_blacklist_token_schema = extend_schema_view(
 
 extend_signup_schema = extend_schema_view(
     post=extend_schema(
-        description=_("Signup"), responses={status.HTTP_201_CREATED: UserSerializer}
+        description=_("Signup"),
+        parameters=[idempotency_key_parameter],
+        responses={status.HTTP_201_CREATED: UserSerializer},
     )
 )
 
@@ -78,6 +124,7 @@ extend_verify_password_recovery_token_schema = extend_schema_view(
 extend_send_activation_email_token_schema = extend_schema_view(
     post=extend_schema(
         description=_("Send Activation Email Token"),
+        parameters=[idempotency_key_parameter],
         responses={status.HTTP_204_NO_CONTENT: OpenApiResponse()},
     )
 )
@@ -85,10 +132,40 @@ extend_send_activation_email_token_schema = extend_schema_view(
 extend_send_password_recovery_token_schema = extend_schema_view(
     post=extend_schema(
         description=_("Send Password Recovery Token"),
+        parameters=[idempotency_key_parameter],
         responses={status.HTTP_204_NO_CONTENT: OpenApiResponse()},
     )
 )
 
+extend_user_import_schema = extend_schema_view(
+    post=extend_schema(
+        description=_("Import Users"),
+        parameters=[UserImportOptionsSerializer],
+        request={
+            "text/csv": OpenApiTypes.STR,
+            "application/x-ndjson": OpenApiTypes.STR,
+        },
+        responses={status.HTTP_200_OK: UserImportResponseSerializer},
+    )
+)
+
+extend_user_export_schema = extend_schema_view(
+    get=extend_schema(
+        description=_("Export Users"),
+        responses={
+            (status.HTTP_200_OK, "application/x-ndjson"): OpenApiTypes.STR,
+            (status.HTTP_200_OK, "text/csv"): OpenApiTypes.STR,
+        },
+    )
+)
+
+extend_jwks_schema = extend_schema_view(
+    get=extend_schema(
+        description=_("JSON Web Key Set"),
+        responses={status.HTTP_200_OK: OpenApiResponse()},
+    )
+)
+
 extend_user_list_schema = extend_schema_view(
     get=extend_schema(
         description=_("Obtain Users"), responses={status.HTTP_200_OK: UserSerializer}
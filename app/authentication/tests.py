@@ -1,17 +1,117 @@
+import io
+import csv
+import json
+import os
+import tempfile
+import time
+import asyncio
 import uuid
+import datetime
+import unittest
 import functools
 
+import jwt
+from unittest import mock
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, is_password_usable
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import QuerySet
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 
-from base.tests import GenericTestCase, invoke_repeatedly_context
+from base.tests import (
+    GenericTestCase,
+    SMTPServerTestCaseMixin,
+    invoke_repeatedly_context,
+)
 
+from redis.exceptions import RedisError
 from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.versioning import URLPathVersioning
 from rest_framework.reverse import reverse
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.test import APIRequestFactory, APITransactionTestCase
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
 
+from base.cache import BloomFilter
+from base.http import ASGIHandler
+from base.db import (
+    PrimaryReplicaRouter,
+    ReplicaRoutingMiddleware,
+    bind_user,
+    release_connections,
+)
+from base.db.backends.postgresql.base import DatabaseWrapper, close_pools
+from base.models import uuid7
+from base.throttling import RedisRateLimiter
+
+from authentication.backends import CachedJWTAuthentication
+from authentication.blacklist import (
+    DatabaseTokenBlacklist,
+    RedisTokenBlacklist,
+    consumed_tokens,
+    revoked_sessions,
+    token_blacklist,
+)
+from authentication.campaigns import VerificationCampaign
+from authentication.cache import (
+    api_key_cache,
+    access_token_cache,
+    user_snapshot_cache,
+)
 from authentication.factories import UserFactory, OrganizationAPIKeyFactory
-from authentication.serializers import UserSerializer
+from authentication.models import OrganizationAPIKey, OutboxEmail, UserSnapshot
+from authentication.outbox import OutboxWorker
+from authentication.permissions import (
+    HasOrganizationAPIKey,
+    IsAuthenticatedAndVerified,
+)
+from authentication.policies import OrganizationAPIKeyAccessPolicy, UserAccessPolicy
+from authentication.keys import KeyRing, KeyRingTokenBackend, SigningKey
+from authentication.lockout import LoginLockedOut, LoginLockout, login_lockout
+from authentication.settings import api_settings
+from authentication.throttling import OrganizationRateThrottle
+from authentication.tokens import AccessToken, RefreshToken
+from authentication.utils import (
+    AccountVerificationSender,
+    AccountVerificationTokenGenerator,
+    EmailSender,
+    PasswordRecoverySender,
+    PasswordRecoveryTokenGenerator,
+)
+from authentication.verifier import TokenVerifier
+from authentication.exports import UserExporter
+from authentication.imports import RowError, UserImporter
+from authentication.views import (
+    ObtainTokenPairView,
+    SendPasswordRecoveryTokenView,
+    SignupView,
+    UserDetail,
+)
+from authentication.serializers import (
+    SendRecoveryPasswordTokenSerializer,
+    UserReadSerializer,
+    UserSerializer,
+)
 from authentication.filters import UserFilter
+from authentication.hashing import (
+    PasswordHasherPool,
+    PasswordHashingUnavailable,
+    password_hasher,
+)
 
 
 def attach_api_key_credentials(api_key_factory_params: dict[any] = None):
@@ -77,12 +177,34 @@ def attach_user_credentials(user_factory_params: dict[any] = None):
     return decorator
 
 
+def isolate_login_lockout(test_case, *emails):
+    ip_ident = f"ip:{uuid.uuid4()}"
+    patcher = mock.patch.object(login_lockout, "ip_ident", return_value=ip_ident)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    test_case.addCleanup(
+        login_lockout.lockout.reset,
+        ip_ident,
+        *(login_lockout.email_ident(email) for email in emails),
+    )
+    return ip_ident
+
+
+def synchronize_blacklist(blacklist):
+    for _ in range(50):
+        if blacklist.synchronize():
+            return
+        time.sleep(0.1)
+    raise AssertionError("The token blacklist did not become healthy")
+
+
 @attach_api_key_credentials()
 class LoginTestCase(GenericTestCase):
     def setUp(self):
         self.url = reverse("login", kwargs={"version": "v1"})
         self.password = "password123"
         self.user = UserFactory.create(password=self.password)
+        isolate_login_lockout(self, self.user.email)
 
     def test_login_success(self):
         data = {"email": f"{self.user.email}", "password": self.password}
@@ -92,6 +214,13 @@ class LoginTestCase(GenericTestCase):
         self.assertIn("access", response.data)
         self.assertIn("refresh", response.data)
 
+    def test_login_mixed_case_email(self):
+        data = {"email": f"  {self.user.email.upper()}", "password": self.password}
+
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+
     def test_login_invalid_credentials(self):
         data = {"email": f"{self.user.email}", "password": f"wrong_{self.password}"}
 
@@ -111,7 +240,7 @@ class SignupTestCase(GenericTestCase):
         data = {
             "email": "new_user@example.com",
             "username": "new_user",
-            "password": "password123",
+            "password": "c0rrect-h0rse-battery",
         }
 
         response = self.client.post(self.url, data)
@@ -127,6 +256,36 @@ class SignupTestCase(GenericTestCase):
         self.assertEqual(response.data["email"], data["email"])
         self.assertEqual(response.data["username"], data["username"])
 
+    def test_signup_single_insert_and_hash(self):
+        data = {
+            "email": "new_user@example.com",
+            "username": "new_user",
+            "password": "c0rrect-h0rse-battery",
+            "verification_url": "https://example.com/verify/",
+        }
+
+        with mock.patch.object(
+            password_hasher, "make_password", wraps=password_hasher.make_password
+        ) as make_password, CaptureQueriesContext(connections["default"]) as queries:
+            response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        make_password.assert_called_once_with(data["password"])
+        user_writes = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(("INSERT", "UPDATE"))
+            and '"authentication_user"' in query["sql"]
+        ]
+        self.assertEqual(len(user_writes), 1)
+        self.assertTrue(user_writes[0].startswith("INSERT"))
+
+        user = get_user_model().objects.get_by_email(data["email"])
+        self.assertTrue(user.check_password(data["password"]))
+        self.assertEqual(
+            OutboxEmail.objects.filter(recipients=[data["email"]]).count(), 1
+        )
+
     def test_signup_invalid_password(self):
         data = {
             "email": "new_user@example.com",
@@ -148,6 +307,17 @@ class SignupTestCase(GenericTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("email", response.data)
 
+    def test_signup_email_already_exists_in_other_case(self):
+        data = {
+            "email": self.user.email.upper(),
+            "username": "new_user",
+            "password": "password123",
+        }
+
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data)
+
     def test_signup_username_already_exists(self):
         data = {
             "email": "new_user@example.com",
@@ -183,6 +353,9 @@ class UserListTestCase(GenericTestCase):
             {"filters": {"username__contains": "admin"}},
             {"filters": {"email__contains": "user"}},
             {"filters": {"username__contains": "user", "email__contains": "test"}},
+            {"filters": {"username__icontains": "ADMIN"}},
+            {"filters": {"email__icontains": "TEST.COM"}},
+            {"filters": {"search": "admin"}},
         ]
     )
     def test_filtered_get_users_success(self, filters):
@@ -205,6 +378,79 @@ class UserListTestCase(GenericTestCase):
         self.assertEqual(response.data["count"], len(_serializer.data))
         self.assertEqual(response.data["results"], _serializer.data)
 
+    @invoke_repeatedly_context(
+        steps=[
+            {"ordering": None},
+            {"ordering": "username"},
+            {"ordering": "-username"},
+            {"ordering": "email"},
+            {"ordering": "-email"},
+        ]
+    )
+    def test_cursor_pagination_walks_all_pages(self, ordering):
+        url = reverse("user-list", kwargs={"version": "v1"})
+        params = {"pagination": "cursor", "limit": 3}
+        if ordering:
+            params["ordering"] = ordering
+
+        users = get_user_model().objects.order_by(
+            *([ordering] if ordering else []), "created_at", "id"
+        )
+        expected = [user.username for user in users]
+
+        pages, response = [], self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            pages.append([user["username"] for user in response.data["results"]])
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(sum(pages, []), expected)
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [user["username"] for user in response.data["results"]], pages[-2]
+        )
+
+    @invoke_repeatedly_context(
+        steps=[
+            {"pagination": "cursor", "count": "exact"},
+            {"pagination": "cursor", "count": "estimate"},
+            {"pagination": "offset", "count": "estimate"},
+        ]
+    )
+    def test_pagination_count_modes(self, pagination, count):
+        url = reverse("user-list", kwargs={"version": "v1"})
+        response = self.client.get(url, {"pagination": pagination, "count": count})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data["count"], int)
+        if count == "exact":
+            self.assertEqual(response.data["count"], get_user_model().objects.count())
+
+    def test_search_ranks_by_similarity(self):
+        url = reverse("user-list", kwargs={"version": "v1"})
+        response = self.client.get(url, {"search": "admin_4"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["username"], "admin_4")
+
+        response = self.client.get(url, {"search": "ADMIN", "pagination": "cursor"})
+        usernames = [user["username"] for user in response.data["results"]]
+        self.assertCountEqual(usernames, ["admin_1", "admin_2", "admin_3", "admin_4"])
+
+    def test_cursor_pagination_invalid_cursor(self):
+        url = reverse("user-list", kwargs={"version": "v1"})
+
+        response = self.client.get(url, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(url, {"pagination": "unknown"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 @attach_api_key_credentials()
 @attach_user_credentials()
@@ -228,3 +474,1653 @@ class UserDetailTestCase(GenericTestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class OrganizationAPIKeyCacheTestCase(GenericTestCase):
+    def setUp(self):
+        self.api_key, self.key = OrganizationAPIKeyFactory.create()
+        api_key_cache.stats.reset()
+
+    def test_verified_key_is_cached(self):
+        self.assertTrue(OrganizationAPIKey.objects.is_valid(self.key))
+        with self.assertNumQueries(0):
+            self.assertTrue(OrganizationAPIKey.objects.is_valid(self.key))
+
+        self.assertEqual(api_key_cache.stats.hits, 1)
+        self.assertEqual(api_key_cache.stats.misses, 1)
+
+    def test_invalid_secret_is_not_accepted_from_cache(self):
+        self.assertTrue(OrganizationAPIKey.objects.is_valid(self.key))
+        self.assertFalse(
+            OrganizationAPIKey.objects.is_valid(f"{self.api_key.prefix}.invalid")
+        )
+
+    def test_revoked_key_is_invalidated(self):
+        self.assertTrue(OrganizationAPIKey.objects.is_valid(self.key))
+
+        self.api_key.revoked = True
+        self.api_key.save()
+
+        self.assertFalse(OrganizationAPIKey.objects.is_valid(self.key))
+
+    def test_deleted_key_is_invalidated(self):
+        self.assertTrue(OrganizationAPIKey.objects.is_valid(self.key))
+
+        self.api_key.delete()
+
+        self.assertFalse(OrganizationAPIKey.objects.is_valid(self.key))
+
+    def test_inactive_organization_key_is_invalidated(self):
+        self.assertTrue(OrganizationAPIKey.objects.is_valid(self.key))
+
+        self.api_key.organization.active = False
+        self.api_key.organization.save()
+
+        self.assertFalse(OrganizationAPIKey.objects.is_valid(self.key))
+
+
+class GenericAccessPolicyTestCase(GenericTestCase):
+    def setUp(self):
+        _, key = OrganizationAPIKeyFactory.create()
+        self.request = Request(APIRequestFactory(HTTP_API_KEY=key).get("/"))
+        self.request.user = UserFactory.create()
+        self.view = UserDetail()
+
+    def test_permission_chain_is_compiled_per_class(self):
+        # pylint: disable=protected-access
+        self.assertEqual(
+            [type(permission) for permission in UserAccessPolicy._permission_chain],
+            [IsAuthenticatedAndVerified, HasOrganizationAPIKey],
+        )
+        self.assertIs(
+            UserAccessPolicy._permission_chain, UserAccessPolicy._permission_chain
+        )
+
+    def test_permission_is_memoized_per_request(self):
+        with mock.patch.object(
+            HasOrganizationAPIKey, "has_permission", return_value=True
+        ) as has_permission:
+            self.assertTrue(UserAccessPolicy().has_permission(self.request, self.view))
+            self.assertTrue(
+                OrganizationAPIKeyAccessPolicy().has_permission(self.request, self.view)
+            )
+
+        has_permission.assert_called_once()
+
+    def test_object_permission_does_not_verify_key_per_object(self):
+        objects = UserFactory.create_batch(3)
+        with mock.patch.object(
+            HasOrganizationAPIKey, "has_permission", return_value=True
+        ) as has_permission:
+            policy = UserAccessPolicy()
+            self.assertTrue(policy.has_permission(self.request, self.view))
+            for obj in objects:
+                self.assertTrue(
+                    policy.has_object_permission(self.request, self.view, obj)
+                )
+
+        has_permission.assert_called_once()
+
+    def test_denied_permission(self):
+        self.request.user.is_verified = False
+        self.assertFalse(UserAccessPolicy().has_permission(self.request, self.view))
+
+
+@attach_api_key_credentials()
+@attach_user_credentials()
+class CachedJWTAuthenticationTestCase(GenericTestCase):
+    def setUp(self):
+        self.token = AccessToken.for_user(self.credentials_user)
+        self.authentication = CachedJWTAuthentication()
+
+    def test_user_snapshot_is_cached(self):
+        self.authentication.get_user(self.token)
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(self.token)
+
+        self.assertIsInstance(user, UserSnapshot)
+        self.assertEqual(user, self.credentials_user)
+        self.assertEqual(user.email, self.credentials_user.email)
+        self.assertTrue(user.is_verified)
+
+    def test_user_snapshot_is_invalidated_on_save(self):
+        self.authentication.get_user(self.token)
+
+        self.credentials_user.is_verified = False
+        self.credentials_user.save()
+
+        self.assertIsNone(user_snapshot_cache.get(self.credentials_user.id))
+        self.assertFalse(self.authentication.get_user(self.token).is_verified)
+
+    def test_hot_user_detail_needs_no_auth_queries(self):
+        url = reverse(
+            "user-detail", kwargs={"version": "v1", "id": self.credentials_user.id}
+        )
+        self.client.get(url)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@attach_api_key_credentials()
+@attach_user_credentials()
+class AccessTokenCacheTestCase(GenericTestCase):
+    def setUp(self):
+        self.token = AccessToken.for_user(self.credentials_user)
+        self.raw_token = str(self.token).encode()
+        self.authentication = CachedJWTAuthentication()
+
+    def test_validated_token_is_cached(self):
+        validated_token = self.authentication.get_validated_token(self.raw_token)
+
+        with mock.patch.object(AccessToken, "verify") as verify:
+            self.assertIs(
+                self.authentication.get_validated_token(self.raw_token),
+                validated_token,
+            )
+        verify.assert_not_called()
+
+    def test_expired_token_is_not_cached(self):
+        self.token.set_exp(lifetime=-datetime.timedelta(seconds=1))
+        access_token_cache.add(self.raw_token, self.token)
+
+        self.assertIsNone(access_token_cache.get(self.raw_token))
+
+    def test_blacklistable_token_is_not_cached(self):
+        token = RefreshToken.for_user(self.credentials_user)
+        access_token_cache.add(str(token).encode(), token)
+
+        self.assertIsNone(access_token_cache.get(str(token).encode()))
+
+    def test_revoked_session_is_rejected(self):
+        session = RefreshToken.for_user(self.credentials_user)
+        raw_token = str(session.access_token).encode()
+        self.authentication.get_validated_token(raw_token)
+
+        revoked_sessions.revoke(session)
+
+        with self.assertRaises(InvalidToken):
+            self.authentication.get_validated_token(raw_token)
+
+    def test_cache_hit_skips_redis(self):
+        raw_token = str(RefreshToken.for_user(self.credentials_user).access_token)
+        self.authentication.get_validated_token(raw_token.encode())
+        synchronize_blacklist(revoked_sessions)
+
+        with mock.patch.object(RedisTokenBlacklist, "connection") as connection:
+            self.authentication.get_validated_token(raw_token.encode())
+        connection.exists.assert_not_called()
+
+    def test_blacklist_revokes_only_its_session(self):
+        session, other_session = (
+            RefreshToken.for_user(self.credentials_user) for _ in range(2)
+        )
+        raw_token = str(session.access_token).encode()
+        other_raw_token = str(other_session.access_token).encode()
+        for token in (raw_token, other_raw_token):
+            self.authentication.get_validated_token(token)
+
+        response = self.client.post(
+            reverse("login-blacklist", kwargs={"version": "v1"}),
+            {"refresh": str(session)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertRaises(InvalidToken):
+            self.authentication.get_validated_token(raw_token)
+        self.authentication.get_validated_token(other_raw_token)
+
+        response = self.client.post(
+            reverse("login-refresh", kwargs={"version": "v1"}),
+            {"refresh": str(other_session)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.authentication.get_validated_token(response.data["access"].encode())
+
+        new_session = RefreshToken.for_user(self.credentials_user)
+        self.authentication.get_validated_token(str(new_session.access_token).encode())
+
+
+class BloomFilterTestCase(GenericTestCase):
+    def test_added_items_are_contained(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        bloom.update(str(uuid.uuid4()) for _ in range(1000))
+        items = [str(uuid.uuid4()) for _ in range(100)]
+        bloom.update(items)
+
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        bloom.update(str(uuid.uuid4()) for _ in range(1000))
+
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+@attach_api_key_credentials()
+@attach_user_credentials()
+class RedisTokenBlacklistTestCase(GenericTestCase):
+    def setUp(self):
+        self.token = RefreshToken.for_user(self.credentials_user)
+
+    def test_token_is_not_stored_in_database(self):
+        self.assertFalse(OutstandingToken.objects.exists())
+
+    def test_unknown_token_skips_redis(self):
+        synchronize_blacklist(token_blacklist)
+        with mock.patch.object(RedisTokenBlacklist, "connection") as connection:
+            self.assertFalse(token_blacklist.is_blacklisted(self.token["jti"]))
+        connection.exists.assert_not_called()
+
+    def test_blacklisted_token_cannot_be_refreshed(self):
+        response = self.client.post(
+            reverse("login-blacklist", kwargs={"version": "v1"}),
+            {"refresh": str(self.token)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(token_blacklist.is_blacklisted(self.token["jti"]))
+
+        response = self.client.post(
+            reverse("login-refresh", kwargs={"version": "v1"}),
+            {"refresh": str(self.token)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_blacklist_is_propagated_to_other_processes(self):
+        other = RedisTokenBlacklist()
+        synchronize_blacklist(other)
+
+        self.token.blacklist()
+
+        for _ in range(50):
+            if self.token["jti"] in other.filter:
+                break
+            time.sleep(0.1)
+        self.assertTrue(other.is_blacklisted(self.token["jti"]))
+
+    def test_lookup_does_not_wait_for_rebuild(self):
+        other = RedisTokenBlacklist()
+        self.token.blacklist()
+
+        with mock.patch.object(RedisTokenBlacklist, "rebuild") as rebuild:
+            self.assertTrue(other.is_blacklisted(self.token["jti"]))
+        rebuild.assert_called_once_with()
+
+    def test_unhealthy_subscriber_falls_back_to_redis(self):
+        other = RedisTokenBlacklist()
+        synchronize_blacklist(other)
+        other._listener.stop()  # pylint: disable=protected-access
+        other._listener.join()  # pylint: disable=protected-access
+
+        self.token.blacklist()
+
+        self.assertFalse(other.healthy)
+        self.assertTrue(other.is_blacklisted(self.token["jti"]))
+        synchronize_blacklist(other)
+        self.assertIn(self.token["jti"], other.filter)
+
+    def test_migrate_database_blacklist(self):
+        jti = uuid.uuid4().hex
+        expires_at = timezone.now() + datetime.timedelta(hours=1)
+        outstanding_token = OutstandingToken.objects.create(
+            jti=jti, token="token", expires_at=expires_at
+        )
+        BlacklistedToken.objects.create(token=outstanding_token)
+        active_token = OutstandingToken.objects.create(
+            jti=uuid.uuid4().hex, token="token", expires_at=expires_at
+        )
+
+        call_command("migrate_token_blacklist", "--delete", stdout=io.StringIO())
+
+        self.assertTrue(token_blacklist.is_blacklisted(jti))
+        self.assertEqual(list(OutstandingToken.objects.all()), [active_token])
+
+
+def generate_private_key(algorithm):
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+@attach_user_credentials()
+class SigningKeysTestCase(GenericTestCase):
+    def setUp(self):
+        self.key_ring = KeyRing(
+            [
+                SigningKey("EdDSA", private_key=generate_private_key("EdDSA")),
+                SigningKey("RS256", private_key=generate_private_key("RS256")),
+            ]
+        )
+        self.token_backend = KeyRingTokenBackend(self.key_ring)
+
+        patcher = mock.patch.multiple(
+            "authentication.keys",
+            key_ring=self.key_ring,
+            token_backend=self.token_backend,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_is_signed_with_active_key(self):
+        token = AccessToken.for_user(self.credentials_user)
+        header = jwt.get_unverified_header(str(token))
+
+        self.assertEqual(header["alg"], "EdDSA")
+        self.assertEqual(header["kid"], self.key_ring.active.kid)
+        self.assertEqual(
+            AccessToken(str(token))["user_id"], str(self.credentials_user.id)
+        )
+
+    def test_token_signed_with_rotated_key_is_valid(self):
+        rotated_key = list(self.key_ring.keys.values())[1]
+        token = jwt.encode(
+            {**AccessToken.for_user(self.credentials_user).payload},
+            rotated_key.private_key,
+            algorithm=rotated_key.algorithm,
+            headers={"kid": rotated_key.kid},
+        )
+
+        self.assertEqual(AccessToken(token)["user_id"], str(self.credentials_user.id))
+
+    def test_token_signed_with_unknown_key_is_invalid(self):
+        token = KeyRing([SigningKey("EdDSA", generate_private_key("EdDSA"))]).encode(
+            {**AccessToken.for_user(self.credentials_user).payload}
+        )
+
+        with self.assertRaises(TokenError):
+            AccessToken(token)
+
+    def test_jwks(self):
+        response = self.client.get(reverse("jwks"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("max-age", response["Cache-Control"])
+        self.assertEqual(
+            [key["kid"] for key in response.json()["keys"]],
+            list(self.key_ring.keys),
+        )
+
+    def test_verifier(self):
+        verifier = TokenVerifier(jwks=self.client.get(reverse("jwks")).json())
+        token = AccessToken.for_user(self.credentials_user)
+
+        claims = verifier.verify(str(token))
+        self.assertEqual(claims["user_id"], str(self.credentials_user.id))
+
+        with self.assertRaises(jwt.InvalidTokenError):
+            verifier.verify(str(RefreshToken.for_user(self.credentials_user)))
+
+    def test_token_generator(self):
+        generator = AccountVerificationTokenGenerator()
+        generator.use_signing_keys = True
+
+        token, _ = generator.make_token(self.credentials_user)
+
+        self.assertEqual(
+            jwt.get_unverified_header(token)["kid"], self.key_ring.active.kid
+        )
+        self.assertEqual(generator.check_token(token), (True, self.credentials_user))
+
+    def test_token_generator_without_signing_keys(self):
+        generator = AccountVerificationTokenGenerator()
+        generator.use_signing_keys = True
+
+        with mock.patch("authentication.keys.key_ring", KeyRing([])):
+            with self.assertRaises(ImproperlyConfigured):
+                generator.make_token(self.credentials_user)
+
+
+@attach_api_key_credentials()
+@attach_user_credentials()
+class VerifyTokenBatchTestCase(GenericTestCase):
+    def setUp(self):
+        self.url = reverse("login-verify-batch", kwargs={"version": "v1"})
+
+    def test_verify_token_batch(self):
+        access_token = AccessToken.for_user(self.credentials_user)
+        refresh_token = RefreshToken.for_user(self.credentials_user)
+        blacklisted_token = RefreshToken.for_user(self.credentials_user)
+        blacklisted_token.blacklist()
+
+        response = self.client.post(
+            self.url,
+            {
+                "tokens": [
+                    str(access_token),
+                    str(refresh_token),
+                    str(blacklisted_token),
+                    "invalid",
+                ]
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.data["results"]
+        self.assertEqual(
+            [(result["valid"], result["blacklisted"]) for result in results],
+            [(True, False), (True, False), (False, True), (False, False)],
+        )
+        self.assertEqual(results[0]["claims"]["jti"], access_token["jti"])
+        self.assertEqual(results[1]["claims"]["token_type"], "refresh")
+        self.assertIsNone(results[3]["claims"])
+
+    def test_verify_token_batch_rejects_revoked_session(self):
+        session = RefreshToken.for_user(self.credentials_user)
+        revoked_sessions.revoke(session)
+        other_session = RefreshToken.for_user(self.credentials_user)
+
+        response = self.client.post(
+            self.url,
+            {
+                "tokens": [
+                    str(session.access_token),
+                    str(other_session.access_token),
+                ]
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["valid"] for result in response.data["results"]], [False, True]
+        )
+
+    def test_verify_token_batch_too_large(self):
+        tokens = [str(AccessToken.for_user(self.credentials_user))] * (
+            api_settings.TOKEN_VERIFY_BATCH_SIZE + 1
+        )
+
+        response = self.client.post(self.url, {"tokens": tokens})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_database_blacklist_uses_single_query(self):
+        tokens = [RefreshToken.for_user(self.credentials_user) for _ in range(5)]
+        blacklist = DatabaseTokenBlacklist()
+        blacklist.blacklist(tokens[0])
+
+        with self.assertNumQueries(1):
+            blacklisted = blacklist.filter_blacklisted(
+                [token["jti"] for token in tokens]
+            )
+        self.assertEqual(blacklisted, {tokens[0]["jti"]})
+
+
+@attach_api_key_credentials()
+class EmailOutboxTestCase(SMTPServerTestCaseMixin, GenericTestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = UserFactory.create_batch(3)
+        self.sender = PasswordRecoverySender()
+
+    def test_send_password_recovery_token_is_queued(self):
+        response = self.client.post(
+            reverse("auth-send_recovery", kwargs={"version": "v1"}),
+            {"email": self.users[0].email, "url": "https://example.com/recovery/"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+        self.assertEqual(email.recipients, [self.users[0].email])
+        self.assertIn("https://example.com/recovery/", email.html)
+        self.assertEqual(self.smtp_handler.messages, [])
+
+    def test_worker_sends_batch_over_one_connection(self):
+        for user in self.users:
+            self.sender.send(user, "https://example.com/recovery/", "token")
+
+        sent, failed = OutboxWorker(batch_size=10).drain()
+
+        self.assertEqual((sent, failed), (3, 0))
+        self.assertEqual(len(self.smtp_handler.messages), 3)
+        self.assertEqual(len(self.smtp_handler.sessions), 1)
+        self.assertFalse(
+            OutboxEmail.objects.exclude(status=OutboxEmail.Status.SENT).exists()
+        )
+
+    def test_worker_retries_with_backoff(self):
+        self.sender.send(self.users[0], "https://example.com/recovery/", "token")
+        self.stop_smtp_server()
+
+        worker = OutboxWorker(max_attempts=2)
+        self.assertEqual(worker.drain(), (0, 1))
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(worker.drain(), (0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmail.Status.FAILED)
+        self.assertEqual(email.attempts, 2)
+
+
+class EmailSenderTemplatesTestCase(GenericTestCase):
+    def setUp(self):
+        self.users = UserFactory.create_batch(3)
+        self.sender = AccountVerificationSender()
+
+    def test_templates_are_compiled_once_per_sender_class(self):
+        templates = AccountVerificationSender.get_templates()
+
+        self.assertIs(AccountVerificationSender.get_templates(), templates)
+        self.assertIsNot(PasswordRecoverySender.get_templates(), templates)
+        self.assertIsNone(EmailSender.__dict__.get("_templates"))
+
+    def test_setting_changed_clears_templates(self):
+        templates = AccountVerificationSender.get_templates()
+
+        with self.settings(AUTHENTICATION_APP={}):
+            self.assertIsNot(AccountVerificationSender.get_templates(), templates)
+
+    def test_setting_changed_renders_new_templates(self):
+        url, token = "https://example.com/verify/", "token"
+        message = self.sender.create_message(self.users[0], url, token)
+
+        with self.settings(
+            AUTHENTICATION_APP={
+                "EMAIL_SENDER": "accounts@example.com",
+                "EMAIL_ACCOUNT_VERIFICATION_SUBJECT": "Welcome {{ username }}",
+                "EMAIL_ACCOUNT_VERIFICATION_HTML": "password_recovery.html",
+            }
+        ):
+            changed = self.sender.create_message(self.users[0], url, token)
+            recovery = PasswordRecoverySender().create_message(
+                self.users[0], url, token
+            )
+
+        self.assertEqual(changed.subject, f"Welcome {self.users[0].username}")
+        self.assertEqual(changed.from_email, "accounts@example.com")
+        self.assertNotEqual(changed.alternatives, message.alternatives)
+        self.assertEqual(changed.alternatives, recovery.alternatives)
+
+    def test_send_many_renders_each_context(self):
+        recipients = [
+            (user, "https://example.com/verify/", f"token-{index}")
+            for index, user in enumerate(self.users)
+        ]
+
+        messages = self.sender.create_messages(recipients)
+        emails = self.sender.send_many(recipients)
+
+        self.assertEqual(OutboxEmail.objects.count(), len(self.users))
+        for (user, url, token), message, email in zip(recipients, messages, emails):
+            expected = self.sender.create_message(user, url, token)
+            self.assertEqual(message.subject, expected.subject)
+            self.assertEqual(message.alternatives, expected.alternatives)
+            self.assertEqual(email.recipients, [user.email])
+            self.assertIn(user.username, email.subject)
+            self.assertIn(f"https://example.com/verify/{token}", email.html)
+
+
+class VerificationCampaignTestCase(SMTPServerTestCaseMixin, GenericTestCase):
+    def setUp(self):
+        super().setUp()
+        self.unverified = UserFactory.create_batch(5, is_verified=False)
+        self.verified = UserFactory.create_batch(2, is_verified=True)
+        self.generator = AccountVerificationTokenGenerator()
+
+    def test_run_sends_to_unverified_users_over_one_connection(self):
+        campaign = VerificationCampaign(url="https://example.com/verify/", batch_size=2)
+
+        progress = list(campaign.run())
+
+        self.assertEqual(len(progress), 3)
+        self.assertEqual((progress[-1].total, progress[-1].sent), (5, 5))
+        self.assertEqual(len(self.smtp_handler.sessions), 1)
+        self.assertCountEqual(
+            [envelope.rcpt_tos[0] for envelope in self.smtp_handler.messages],
+            [user.email for user in self.unverified],
+        )
+
+    def test_run_respects_rate(self):
+        campaign = VerificationCampaign(url="https://example.com/verify/", rate=50)
+
+        start = time.monotonic()
+        list(campaign.run())
+
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 50)
+
+    def test_enqueue_generates_valid_tokens(self):
+        campaign = VerificationCampaign(url="https://example.com/verify/")
+
+        self.assertEqual(campaign.enqueue(), 5)
+        self.assertEqual(self.smtp_handler.messages, [])
+
+        for email in OutboxEmail.objects.all():
+            token = email.html.split("https://example.com/verify/")[1].split('"')[0]
+            valid, user = self.generator.check_token(token)
+            self.assertTrue(valid)
+            self.assertEqual([user.email], email.recipients)
+
+    def test_command_reports_progress(self):
+        stdout = io.StringIO()
+
+        call_command(
+            "send_verification_campaign",
+            url="https://example.com/verify/",
+            batch_size=5,
+            stdout=stdout,
+        )
+
+        self.assertIn("5/5 processed, 5 sent, 0 failed", stdout.getvalue())
+
+    def test_campaign_requires_url(self):
+        with self.assertRaises(ValueError):
+            VerificationCampaign()
+
+
+@attach_api_key_credentials()
+class EmailLookupTestCase(GenericTestCase):
+    def setUp(self):
+        self.user = UserFactory.create(email="Mixed.Case@Example.COM")
+
+    def test_email_is_normalized_on_write(self):
+        self.assertEqual(self.user.email, "Mixed.Case@example.com")
+
+        self.user.email = " Mixed.Case@EXAMPLE.com "
+        self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, "Mixed.Case@example.com")
+
+    def test_get_by_email_ignores_case(self):
+        manager = get_user_model().objects
+
+        self.assertEqual(manager.get_by_email("mixed.case@example.com"), self.user)
+        self.assertEqual(manager.get_by_email(" MIXED.CASE@EXAMPLE.COM"), self.user)
+        with self.assertRaises(get_user_model().DoesNotExist):
+            manager.get_by_email("other@example.com")
+
+    def test_email_is_unique_ignoring_case(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            UserFactory.create(email="mixed.case@example.com")
+
+    def test_send_recovery_token_single_lookup(self):
+        serializer = SendRecoveryPasswordTokenSerializer(
+            data={"email": "MIXED.CASE@example.com", "url": "https://example.com/"}
+        )
+
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data["user"], self.user)
+
+    def test_send_activation_token_mixed_case(self):
+        self.user.is_verified = False
+        self.user.save()
+
+        response = self.client.post(
+            reverse("auth-send-activation", kwargs={"version": "v1"}),
+            {"email": "MIXED.CASE@EXAMPLE.COM", "url": "https://example.com/"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            OutboxEmail.objects.get().recipients, ["Mixed.Case@example.com"]
+        )
+
+
+@attach_api_key_credentials()
+class SingleUseEmailTokenTestCase(GenericTestCase):
+    def setUp(self):
+        self.user = UserFactory.create(is_verified=False)
+        self.generator = PasswordRecoveryTokenGenerator()
+
+    def test_tokens_have_unique_jti(self):
+        token, _ = self.generator.make_token(self.user)
+        (other, _), (batch, _) = self.generator.make_tokens([self.user, self.user])
+
+        jtis = {self.generator.decode(value)["jti"] for value in (token, other, batch)}
+        self.assertEqual(len(jtis), 3)
+
+    def test_password_recovery_token_is_single_use(self):
+        token, _ = self.generator.make_token(self.user)
+        url = reverse("auth-recovery", kwargs={"version": "v1", "token": token})
+
+        response = self.client.post(url, {"password": "c0rrect-h0rse-battery"})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(url, {"password": "an0ther-h0rse-battery"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("c0rrect-h0rse-battery"))
+
+    def test_activation_token_is_single_use(self):
+        token, _ = AccountVerificationTokenGenerator().make_token(self.user)
+        url = reverse("auth-activation", kwargs={"version": "v1", "token": token})
+
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_consumed_token_rejected_without_queries(self):
+        token, _ = self.generator.make_token(self.user)
+        self.assertEqual(
+            self.generator.check_token(token, consume=True), (True, self.user)
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.generator.check_token(token), (False, None))
+            self.assertEqual(
+                self.generator.check_token(token, consume=True), (False, None)
+            )
+
+    def test_consumed_key_expires_with_token(self):
+        token, _ = self.generator.make_token(self.user)
+        self.generator.check_token(token, consume=True)
+
+        jti = self.generator.decode(token)["jti"]
+        ttl = consumed_tokens.connection.ttl(consumed_tokens.make_key(jti))
+        lifetime = self.generator.token_lifetime.total_seconds()
+        self.assertTrue(lifetime - 5 <= ttl <= lifetime)
+
+    def test_token_without_jti_is_single_use(self):
+        exp = (timezone.now() + self.generator.token_lifetime).timestamp()
+        token = self.generator.encode({"email": self.user.email, "exp": exp})
+
+        self.assertEqual(
+            self.generator.check_token(token, consume=True), (True, self.user)
+        )
+        self.assertEqual(self.generator.check_token(token, consume=True), (False, None))
+
+    def test_redis_failure_rejects_token(self):
+        token, _ = self.generator.make_token(self.user)
+
+        with mock.patch.object(
+            consumed_tokens, "consume", side_effect=RedisError("down")
+        ):
+            self.assertEqual(
+                self.generator.check_token(token, consume=True), (False, None)
+            )
+
+
+@attach_api_key_credentials()
+class IdempotencyKeyTestCase(GenericTestCase):
+    def setUp(self):
+        self.user = UserFactory.create()
+        self.key = str(uuid.uuid4())
+        self.recovery_url = reverse("auth-send_recovery", kwargs={"version": "v1"})
+        self.recovery_data = {
+            "email": self.user.email,
+            "url": "https://example.com/recovery/",
+        }
+
+    def post(self, url, data, key=None):
+        return self.client.post(url, data, HTTP_IDEMPOTENCY_KEY=key or self.key)
+
+    def test_signup_retry_replays_response(self):
+        url = reverse("signup", kwargs={"version": "v1"})
+        data = {
+            "email": "new_user@example.com",
+            "username": "new_user",
+            "password": "c0rrect-h0rse-battery",
+        }
+
+        first = self.post(url, data)
+        with mock.patch.object(password_hasher, "make_password") as make_password:
+            retry = self.post(url, data)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+        make_password.assert_not_called()
+        self.assertEqual(
+            get_user_model().objects.filter(email="new_user@example.com").count(), 1
+        )
+
+    def test_retry_sends_one_email(self):
+        for _ in range(3):
+            response = self.post(self.recovery_url, self.recovery_data)
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_requests_without_key_are_not_replayed(self):
+        for _ in range(2):
+            self.client.post(self.recovery_url, self.recovery_data)
+
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_key_reused_for_other_request(self):
+        self.post(self.recovery_url, self.recovery_data)
+
+        response = self.post(
+            self.recovery_url, {**self.recovery_data, "url": "https://example.com/"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_failed_request_is_not_stored(self):
+        response = self.post(self.recovery_url, {"email": self.user.email})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post(self.recovery_url, self.recovery_data)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_keys_are_scoped_to_api_key(self):
+        self.post(self.recovery_url, self.recovery_data)
+
+        _, other_key = OrganizationAPIKeyFactory.create()
+        self.client.credentials(HTTP_API_KEY=other_key)
+        response = self.post(self.recovery_url, self.recovery_data)
+
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_concurrent_duplicate_waits_for_first_request(self):
+        store = SendPasswordRecoveryTokenView.idempotency_store
+        patchers = (
+            mock.patch.object(
+                SendPasswordRecoveryTokenView,
+                "get_idempotency_cache_key",
+                return_value=self.key,
+            ),
+            mock.patch.object(
+                SendPasswordRecoveryTokenView,
+                "get_request_fingerprint",
+                return_value="fingerprint",
+            ),
+            mock.patch.object(
+                SendPasswordRecoveryTokenView,
+                "idempotency_wait_timeout",
+                datetime.timedelta(milliseconds=100),
+            ),
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(store.delete, self.key)
+
+        lock, _ = store.begin(self.key, "fingerprint", datetime.timedelta(seconds=30))
+
+        response = self.post(self.recovery_url, self.recovery_data)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        store.complete(
+            self.key,
+            lock,
+            {"fingerprint": "fingerprint", "status": 204, "data": None, "headers": {}},
+            datetime.timedelta(minutes=1),
+        )
+
+        response = self.post(self.recovery_url, self.recovery_data)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response["Idempotent-Replayed"], "true")
+        self.assertEqual(OutboxEmail.objects.count(), 0)
+
+    def test_redis_failure_processes_request(self):
+        with mock.patch.object(
+            SendPasswordRecoveryTokenView.idempotency_store,
+            "begin",
+            side_effect=RedisError("down"),
+        ):
+            response = self.post(self.recovery_url, self.recovery_data)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_invalid_key(self):
+        response = self.post(self.recovery_url, self.recovery_data, key="x" * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@attach_api_key_credentials()
+@attach_user_credentials({"is_staff": True})
+class UserImportTestCase(GenericTestCase):
+    def setUp(self):
+        self.url = reverse("user-import", kwargs={"version": "v1"})
+        self.existing = UserFactory.create(email="Existing@example.com")
+
+    def test_import_csv(self):
+        body = "\n".join(
+            [
+                "username,email,password",
+                "alice,Alice@EXAMPLE.com,c0rrect-h0rse-battery",
+                "bob,bob@example.com,",
+                "carol,not-an-email,",
+                "dave,existing@example.com,",
+                "bob,bob.other@example.com,",
+                "erin,erin@example.com,password",
+            ]
+        )
+
+        response = self.client.post(
+            f"{self.url}?verification_url=https://example.com/verify/",
+            body,
+            content_type="text/csv",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["processed"], response.data["created"]), (6, 2))
+        self.assertEqual(response.data["failed"], 4)
+        self.assertEqual(
+            [
+                (error["line"], list(error["errors"]))
+                for error in response.data["errors"]
+            ],
+            [(4, ["email"]), (5, ["email"]), (6, ["username"]), (7, ["password"])],
+        )
+
+        alice = get_user_model().objects.get(username="alice")
+        self.assertEqual(alice.email, "Alice@example.com")
+        self.assertTrue(alice.check_password("c0rrect-h0rse-battery"))
+        self.assertFalse(
+            get_user_model().objects.get(username="bob").has_usable_password()
+        )
+        self.assertEqual(
+            sorted(email.recipients[0] for email in OutboxEmail.objects.all()),
+            ["Alice@example.com", "bob@example.com"],
+        )
+
+    def test_import_ndjson(self):
+        body = "\n".join(
+            [
+                json.dumps({"username": "alice", "email": "alice@example.com"}),
+                "{not json",
+                "",
+                json.dumps(["bob", "bob@example.com"]),
+            ]
+        )
+
+        response = self.client.post(self.url, body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [2, 4])
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_unsupported_media_type(self):
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_requires_staff(self):
+        self.credentials_user.is_staff = False
+        self.credentials_user.save()
+
+        response = self.client.post(self.url, "", content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_queries_per_batch_do_not_grow_with_rows(self):
+        def import_rows(prefix, count):
+            lines = [json.dumps({"username": "x", "email": "x@example.com"})] + [
+                json.dumps(
+                    {"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com"}
+                )
+                for i in range(count)
+            ]
+            importer = UserImporter(url="https://example.com/verify/")
+            with CaptureQueriesContext(connections["default"]) as queries:
+                (progress,) = importer.run(lines, "ndjson")
+            self.assertEqual(progress.created, count + (prefix == "a"))
+            return len(queries)
+
+        self.assertEqual(import_rows("a", 5), import_rows("b", 50))
+
+    def test_conflicting_insert_is_reported(self):
+        created, errors = UserImporter(url=None).create(
+            [
+                (2, {"username": "alice", "email": "alice@example.com"}),
+                (3, {"username": "dave", "email": "existing@example.com"}),
+            ]
+        )
+
+        self.assertEqual([user.username for user in created], ["alice"])
+        self.assertEqual([error.line for error in errors], [3])
+        self.assertIsInstance(errors[0], RowError)
+
+    def test_import_users_command(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        path = os.path.join(directory, "users.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("username,email\nalice,alice@example.com\nbob,bob\n")
+        self.addCleanup(os.remove, path)
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("import_users", path, processes=0, stdout=stdout, stderr=stderr)
+
+        self.assertIn("2 processed, 1 created, 1 failed", stdout.getvalue())
+        self.assertIn("Line 3:", stderr.getvalue())
+        self.assertTrue(get_user_model().objects.filter(username="alice").exists())
+
+
+@attach_api_key_credentials()
+@attach_user_credentials({"is_staff": True})
+class UserExportTestCase(GenericTestCase):
+    def setUp(self):
+        self.url = reverse("user-export", kwargs={"version": "v1"})
+        self.users = UserFactory.create_batch(5)
+
+    def test_export_ndjson(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(
+            {row["email"] for row in rows},
+            {user.email for user in [self.credentials_user, *self.users]},
+        )
+        self.assertEqual(
+            list(rows[0]),
+            [
+                "id",
+                "username",
+                "email",
+                "verified",
+                "activated",
+                "staff",
+                "created",
+                "updated",
+            ],
+        )
+        detail = self.client.get(
+            reverse("user-detail", kwargs={"version": "v1", "id": rows[0]["id"]})
+        )
+        self.assertEqual(rows[0]["created"], detail.data["created"])
+
+    def test_export_csv(self):
+        response = self.client.get(self.url, {"format": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('filename="users.csv"', response["Content-Disposition"])
+        rows = list(
+            csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode()))
+        )
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["verified"], "True")
+
+    def test_export_is_filtered(self):
+        response = self.client.get(
+            self.url, {"username": self.users[0].username}, HTTP_ACCEPT="text/csv"
+        )
+
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 2)
+        self.assertIn(self.users[0].email, content)
+
+    def test_requires_staff(self):
+        self.credentials_user.is_staff = False
+        self.credentials_user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn(b"detail", response.content)
+
+    def test_exporter_reads_in_chunks(self):
+        exporter = UserExporter(chunk_size=2)
+
+        with mock.patch.object(
+            QuerySet, "iterator", autospec=True, side_effect=QuerySet.iterator
+        ) as iterator:
+            rows = list(exporter.rows())
+
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(iterator.call_args.kwargs, {"chunk_size": 2})
+        self.assertEqual(
+            [row["created"] for row in rows], sorted(row["created"] for row in rows)
+        )
+
+    def test_export_users_command(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("export_users", format="csv", stdout=stdout, stderr=stderr)
+
+        self.assertEqual(len(stdout.getvalue().splitlines()), 7)
+        self.assertIn("Exported 6 users", stderr.getvalue())
+
+
+@attach_api_key_credentials()
+@attach_user_credentials()
+class UserReadSerializerTestCase(GenericTestCase):
+    def setUp(self):
+        UserFactory.create_batch(3)
+        self.users = get_user_model().objects.order_by("created_at", "id")
+        self.request = Request(APIRequestFactory().get("/"))
+        self.request.version = "v1"
+        self.request.versioning_scheme = URLPathVersioning()
+
+    def test_matches_user_serializer(self):
+        context = {"request": self.request}
+
+        self.assertEqual(
+            json.dumps(UserReadSerializer(self.users, many=True, context=context).data),
+            json.dumps(UserSerializer(self.users, many=True, context=context).data),
+        )
+
+    def test_list_and_detail_responses_are_unchanged(self):
+        list_response = self.client.get(reverse("user-list", kwargs={"version": "v1"}))
+        detail_response = self.client.get(list_response.data["results"][0]["url"])
+
+        user = get_user_model().objects.get(
+            pk=detail_response.data["url"].split("/")[-2]
+        )
+        serializer = UserSerializer(user, context={"request": self.request})
+        self.assertEqual(
+            detail_response.json(), json.loads(json.dumps(serializer.data))
+        )
+        self.assertEqual(
+            list_response.json()["results"],
+            json.loads(
+                json.dumps(
+                    UserSerializer(
+                        self.users, many=True, context={"request": self.request}
+                    ).data
+                )
+            ),
+        )
+
+    def test_reverses_url_once(self):
+        serializer = UserReadSerializer(
+            self.users, many=True, context={"request": self.request}
+        )
+
+        with mock.patch(
+            "authentication.serializers.reverse", wraps=reverse
+        ) as reverse_mock:
+            self.assertEqual(len(serializer.data), 4)
+        self.assertEqual(reverse_mock.call_count, 1)
+
+    def test_list_loads_only_serialized_columns(self):
+        with CaptureQueriesContext(connections["default"]) as queries:
+            response = self.client.get(reverse("user-list", kwargs={"version": "v1"}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The remaining user query is the authenticated user lookup.
+        selects = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith("SELECT")
+            and '"authentication_user"."username"' in query["sql"]
+            and '"authentication_user"."id" =' not in query["sql"]
+        ]
+        self.assertTrue(selects)
+        for select in selects:
+            self.assertNotIn('"authentication_user"."password"', select)
+
+
+@attach_api_key_credentials()
+@attach_user_credentials()
+class TimeOrderedUserIdTestCase(GenericTestCase):
+    def test_uuid7_is_time_ordered(self):
+        ids = [uuid7() for _ in range(5000)]
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(value.version == 7 for value in ids))
+        self.assertTrue(all(value.variant == uuid.RFC_4122 for value in ids))
+        self.assertAlmostEqual(
+            ids[0].int >> 80, time.time_ns() // 1_000_000, delta=1000
+        )
+
+    def test_user_id_default_is_opt_in(self):
+        self.assertEqual(UserFactory.create().id.version, 4)
+
+        with mock.patch.object(api_settings, "USER_ID_TIME_ORDERED", True):
+            user = UserFactory.create()
+
+        self.assertEqual(user.id.version, 7)
+        response = self.client.get(
+            reverse("user-detail", kwargs={"version": "v1", "id": user.id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], user.username)
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"], DATABASE_REPLICA_PIN_WINDOW=60)
+class PrimaryReplicaRouterTestCase(GenericTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.model = get_user_model()
+        patcher = mock.patch.object(connections["default"], "in_atomic_block", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def route(self, view):
+        decisions = []
+
+        def get_response(request):
+            view(decisions)
+            return None
+
+        ReplicaRoutingMiddleware(get_response)(RequestFactory().get("/"))
+        return decisions
+
+    def read(self, decisions):
+        decisions.append(self.router.db_for_read(self.model))
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(self.router.db_for_read(self.model), "default")
+
+    def test_reads_use_replica_until_first_write(self):
+        def view(decisions):
+            self.read(decisions)
+            decisions.append(self.router.db_for_write(self.model))
+            self.read(decisions)
+
+        self.assertEqual(self.route(view), ["replica_0", "default", "default"])
+
+    def test_user_is_pinned_to_primary_after_write(self):
+        user_id = str(uuid.uuid4())
+
+        def write(decisions):
+            bind_user(user_id)
+            decisions.append(self.router.db_for_write(self.model))
+
+        def read(decisions):
+            bind_user(user_id)
+            self.read(decisions)
+
+        def read_other(decisions):
+            bind_user(str(uuid.uuid4()))
+            self.read(decisions)
+
+        self.assertEqual(self.route(read), ["replica_0"])
+        self.route(write)
+        self.assertEqual(self.route(read), ["default"])
+        self.assertEqual(self.route(read_other), ["replica_0"])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_pinning_is_skipped_without_replicas(self):
+        def write(decisions):
+            bind_user(str(uuid.uuid4()))
+            decisions.append(self.router.db_for_write(self.model))
+
+        with mock.patch("base.db.routers.caches") as caches_:
+            self.assertEqual(self.route(write), ["default"])
+        caches_.__getitem__.assert_not_called()
+
+
+@unittest.skipUnless(
+    "replica_0" in settings.DATABASES, "DATABASE_REPLICA_HOSTS is not configured"
+)
+@attach_api_key_credentials()
+class ReplicaRoutingTestCase(APITransactionTestCase):
+    databases = "__all__"
+
+    def test_user_detail_reads_from_replica(self):
+        user = UserFactory.create()
+        token = AccessToken.for_user(user)
+
+        with CaptureQueriesContext(connections["replica_0"]) as replica_queries:
+            response = self.client.get(
+                reverse("user-detail", kwargs={"version": "v1", "id": user.id}),
+                HTTP_AUTHORIZATION=f"Bearer {token}",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            any("authentication_user" in query["sql"] for query in replica_queries)
+        )
+
+
+class DatabaseConnectionTestCase(GenericTestCase):
+    def make_wrapper(self, **overrides):
+        wrapper = DatabaseWrapper(
+            {**connections["default"].settings_dict, "POOL": None, **overrides},
+            alias="connection_test",
+        )
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    @staticmethod
+    def backend_pid(wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    def test_health_check_replaces_dead_persistent_connection(self):
+        wrapper = self.make_wrapper(CONN_MAX_AGE=60, CONN_HEALTH_CHECKS=True)
+        pid = self.backend_pid(wrapper)
+
+        with connections["default"].cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+        wrapper.close_if_unusable_or_obsolete()
+
+        self.assertNotEqual(self.backend_pid(wrapper), pid)
+
+    def test_pooled_connections_are_reused(self):
+        self.addCleanup(close_pools, "connection_test")
+        wrapper = self.make_wrapper(
+            CONN_MAX_AGE=0, POOL={"min_size": 0, "max_size": 1, "timeout": 1}
+        )
+
+        pid = self.backend_pid(wrapper)
+        wrapper.close()
+
+        self.assertEqual(self.backend_pid(wrapper), pid)
+
+    def test_release_connections_closes_leaked_transactions(self):
+        wrapper = self.make_wrapper(CONN_MAX_AGE=60)
+        wrapper.set_autocommit(False)
+        self.backend_pid(wrapper)
+
+        with mock.patch("base.db.sync.connections") as mocked:
+            mocked.all.return_value = [wrapper]
+            release_connections()
+
+        self.assertIsNone(wrapper.connection)
+
+
+class AsyncViewTestCase(APITransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        self.api_key = OrganizationAPIKeyFactory.create()[1]
+        self.password = "password123"
+        self.user = UserFactory.create(password=self.password)
+        isolate_login_lockout(self, self.user.email)
+
+    def test_auth_views_are_coroutines(self):
+        for view in (ObtainTokenPairView, SignupView):
+            self.assertTrue(asyncio.iscoroutinefunction(view.as_view()))
+        self.assertFalse(asyncio.iscoroutinefunction(UserDetail.as_view()))
+
+    async def test_login_under_asgi(self):
+        response = await self.async_client.post(
+            reverse("login", kwargs={"version": "v1"}),
+            {"email": self.user.email, "password": self.password},
+            content_type="application/json",
+            **{"api-key": self.api_key},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+
+    async def test_request_opens_one_connection_per_database(self):
+        wrapper = connections["default"].__class__
+        aliases = []
+        get_new_connection = wrapper.get_new_connection
+
+        def record(connection, conn_params):
+            aliases.append(connection.alias)
+            return get_new_connection(connection, conn_params)
+
+        with mock.patch.object(wrapper, "get_new_connection", record):
+            response = await self.async_client.post(
+                reverse("login", kwargs={"version": "v1"}),
+                {"email": self.user.email, "password": self.password},
+                content_type="application/json",
+                **{"api-key": self.api_key},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(aliases), len(set(aliases)))
+
+    async def test_invalid_credentials_under_asgi(self):
+        response = await self.async_client.post(
+            reverse("login", kwargs={"version": "v1"}),
+            {"email": self.user.email, "password": "wrong"},
+            content_type="application/json",
+            **{"api-key": self.api_key},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def get_export_headers(self):
+        staff = UserFactory.create(is_staff=True)
+        return {
+            "api-key": self.api_key,
+            "authorization": f"Bearer {AccessToken.for_user(staff)}",
+        }
+
+    async def test_export_under_asgi(self):
+        headers = await sync_to_async(self.get_export_headers)()
+        response = await self.async_client.get(
+            reverse("user-export", kwargs={"version": "v1"}), **headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b"".join([part async for part in response]).decode()
+        self.assertEqual(len(content.splitlines()), 2)
+        self.assertIn(self.user.email, content)
+
+    async def test_export_streams_through_asgi_handler(self):
+        headers = await sync_to_async(self.get_export_headers)()
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await ASGIHandler()(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": reverse("user-export", kwargs={"version": "v1"}),
+                "query_string": b"format=csv",
+                "headers": [
+                    (b"host", b"testserver"),
+                    *(
+                        (name.encode(), value.encode())
+                        for name, value in headers.items()
+                    ),
+                ],
+            },
+            receive,
+            send,
+        )
+
+        self.assertEqual(messages[0]["status"], status.HTTP_200_OK)
+        content = b"".join(message.get("body", b"") for message in messages[1:])
+        self.assertEqual(len(content.decode().splitlines()), 3)
+        self.assertNotIn("more_body", messages[-1])
+
+
+class PasswordHasherPoolTestCase(GenericTestCase):
+    def test_hashes_in_worker_processes(self):
+        pool = PasswordHasherPool(processes=1)
+        self.addCleanup(pool.shutdown)
+
+        encoded = pool.make_password("c0rrect-h0rse-battery")
+
+        self.assertTrue(pool.check_password("c0rrect-h0rse-battery", encoded))
+        self.assertFalse(pool.check_password("wrong", encoded))
+        self.assertIsNotNone(pool.executor)
+
+    def test_hashes_batch_across_worker_processes(self):
+        pool = PasswordHasherPool(processes=1)
+        self.addCleanup(pool.shutdown)
+
+        encoded = pool.make_passwords(["c0rrect-h0rse-battery", None])
+
+        self.assertTrue(pool.check_password("c0rrect-h0rse-battery", encoded[0]))
+        self.assertFalse(is_password_usable(encoded[1]))
+
+    def test_rejects_when_queue_is_full(self):
+        pool = PasswordHasherPool(
+            processes=1, queue_size=0, queue_timeout=datetime.timedelta(0)
+        )
+        pool.slots.acquire()
+        self.addCleanup(pool.slots.release)
+
+        with self.assertRaises(PasswordHashingUnavailable):
+            pool.make_password("c0rrect-h0rse-battery")
+        self.assertIsNone(pool.executor)
+
+    def test_upgrades_outdated_hash_on_login(self):
+        user = UserFactory.create()
+        hasher = PBKDF2PasswordHasher()
+        user.password = hasher.encode(
+            "c0rrect-h0rse-battery", hasher.salt(), iterations=1000
+        )
+        user.save(update_fields=["password"])
+
+        self.assertTrue(user.check_password("c0rrect-h0rse-battery"))
+        user.refresh_from_db()
+        self.assertEqual(hasher.decode(user.password)["iterations"], hasher.iterations)
+
+
+class RedisRateLimiterTestCase(GenericTestCase):
+    def setUp(self):
+        self.limiter = RedisRateLimiter(namespace=f"rate_limit_test:{uuid.uuid4()}")
+
+    def test_allows_burst_then_rejects(self):
+        results = [self.limiter.hit("key", 3, 60) for _ in range(4)]
+
+        self.assertEqual([result.allowed for result in results], [True] * 3 + [False])
+        self.assertEqual([result.remaining for result in results], [2, 1, 0, 0])
+        self.assertGreater(results[-1].retry_after, 0)
+        self.assertLessEqual(results[-1].retry_after, 20)
+
+    def test_keys_are_independent(self):
+        self.assertTrue(self.limiter.hit("first", 1, 60).allowed)
+        self.assertFalse(self.limiter.hit("first", 1, 60).allowed)
+        self.assertTrue(self.limiter.hit("second", 1, 60).allowed)
+
+
+class OrganizationRateThrottleTestCase(GenericTestCase):
+    def setUp(self):
+        self.url = reverse("login", kwargs={"version": "v1"})
+        self.api_key, self.key = OrganizationAPIKeyFactory.create()
+        self.organization = self.api_key.organization
+        self.organization.throttle_rate = "2/minute"
+        self.organization.save()
+        self.addCleanup(
+            OrganizationRateThrottle.limiter.reset,
+            f"organization:{self.organization.pk}",
+        )
+        self.email = f"{uuid.uuid4()}@example.com"
+        isolate_login_lockout(self, self.email)
+
+    def login(self, key):
+        return self.client.post(
+            self.url, {"email": self.email, "password": "x"}, HTTP_API_KEY=key
+        )
+
+    def test_throttles_per_organization_with_headers(self):
+        responses = [self.login(self.key) for _ in range(3)]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+        self.assertEqual(responses[0]["RateLimit-Limit"], "2")
+        self.assertEqual(responses[0]["RateLimit-Remaining"], "1")
+        self.assertEqual(responses[0]["RateLimit-Policy"], "2;w=60")
+        self.assertEqual(responses[2]["RateLimit-Remaining"], "0")
+        self.assertIn("Retry-After", responses[2])
+
+    def test_keys_of_one_organization_share_the_limit(self):
+        other_key = OrganizationAPIKeyFactory.create(organization=self.organization)[1]
+
+        self.login(self.key)
+        self.login(other_key)
+
+        response = self.login(self.key)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_other_organizations_are_not_affected(self):
+        for _ in range(3):
+            self.login(self.key)
+
+        other_api_key, other_key = OrganizationAPIKeyFactory.create()
+        self.addCleanup(
+            OrganizationRateThrottle.limiter.reset,
+            f"organization:{other_api_key.organization_id}",
+        )
+
+        response = self.login(other_key)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            response["RateLimit-Limit"], str(OrganizationRateThrottle().num_requests)
+        )
+
+
+@attach_api_key_credentials()
+class LoginLockoutTestCase(GenericTestCase):
+    def setUp(self):
+        self.url = reverse("login", kwargs={"version": "v1"})
+        self.password = "c0rrect-h0rse-battery"
+        self.user = UserFactory.create(password=self.password)
+        isolate_login_lockout(
+            self, self.user.email, "first@example.com", "second@example.com"
+        )
+
+    def login(self, password, email=None):
+        return self.client.post(
+            self.url, {"email": email or self.user.email, "password": password}
+        )
+
+    def test_locks_email_after_threshold_without_hashing(self):
+        for _ in range(login_lockout.email_threshold):
+            response = self.login("wrong")
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with mock.patch.object(password_hasher, "check_password") as check_password:
+            response = self.login(self.password, email=self.user.email.upper())
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.data["detail"].code, LoginLockedOut.default_code)
+        self.assertIn("Retry-After", response)
+        check_password.assert_not_called()
+
+    def test_ip_ident_ignores_spoofed_forwarded_for(self):
+        idents = {
+            LoginLockout.ip_ident(
+                RequestFactory().post(
+                    self.url, REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=address
+                )
+            )
+            for address in ("203.0.113.1", "203.0.113.2")
+        }
+
+        self.assertEqual(idents, {"ip:10.0.0.1"})
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1})
+    def test_ip_ident_uses_trusted_proxy_hop(self):
+        request = RequestFactory().post(
+            self.url,
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR="198.51.100.7, 203.0.113.1",
+        )
+
+        self.assertEqual(LoginLockout.ip_ident(request), "ip:203.0.113.1")
+
+    def test_delay_doubles_with_each_failure(self):
+        thresholds = {"email:delay": 2}
+        self.addCleanup(login_lockout.lockout.reset, "email:delay")
+
+        waits = [
+            login_lockout.lockout.register_failure(thresholds, 60, 1, 3)
+            for _ in range(4)
+        ]
+
+        self.assertEqual(waits, [0, 1, 2, 3])
+
+    def test_successful_login_resets_failures(self):
+        for _ in range(login_lockout.email_threshold - 1):
+            self.login("wrong")
+
+        self.assertEqual(self.login(self.password).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.login("wrong").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login(self.password).status_code, status.HTTP_200_OK)
+
+    def test_locks_ip_across_emails(self):
+        with mock.patch.object(login_lockout, "ip_threshold", 2):
+            self.login("wrong", email="first@example.com")
+            self.login("wrong", email="second@example.com")
+
+            response = self.login(self.password)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,58 @@
+from rest_framework_api_key.permissions import KeyParser
+
+from base.throttling import RedisRateLimiter, RedisRateThrottle
+
+from authentication.cache import api_key_cache
+from authentication.models import OrganizationAPIKey
+from authentication.settings import api_settings
+
+
+class OrganizationRateThrottle(RedisRateThrottle):
+    scope = "organization"
+    limiter = RedisRateLimiter(alias=api_settings.RATE_LIMIT_CACHE_ALIAS)
+    key_parser = KeyParser()
+
+    def __init__(self):
+        super().__init__()
+        self.api_key = None
+        self.api_key_entry = None
+
+    def get_api_key_entry(self, request):
+        key = self.key_parser.get(request)
+        if not key:
+            return None
+
+        if key != self.api_key:
+            entry = api_key_cache.get(key)
+            # Permissions are checked first and normally fill the cache.
+            if entry is None and OrganizationAPIKey.objects.is_valid(key):
+                entry = api_key_cache.get(key)
+            self.api_key, self.api_key_entry = key, entry
+        return self.api_key_entry
+
+    def get_ident(self, request):
+        entry = self.get_api_key_entry(request)
+        if entry is None:
+            return None
+        return entry["organization"]
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident(request)
+        if ident is None:
+            return None
+        return f"{self.scope}:{ident}"
+
+    def get_request_rate(self, request, view):
+        return self.get_api_key_entry(request)["throttle_rate"] or self.rate
+
+
+class OrganizationAPIKeyRateThrottle(OrganizationRateThrottle):
+    scope = "organization_api_key"
+
+    def get_ident(self, request):
+        if self.get_api_key_entry(request) is None:
+            return None
+        return api_key_cache.prefix(self.api_key)
+
+    def get_request_rate(self, request, view):
+        return self.rate
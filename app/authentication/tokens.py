@@ -0,0 +1,45 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin
+from rest_framework_simplejwt.tokens import AccessToken as _AccessToken
+from rest_framework_simplejwt.tokens import RefreshToken as _RefreshToken
+from rest_framework_simplejwt.tokens import UntypedToken as _UntypedToken
+
+from authentication import keys
+from authentication.blacklist import token_blacklist
+from authentication.settings import api_settings
+
+
+class KeyRingTokenMixin:
+    @property
+    def token_backend(self):
+        return keys.token_backend
+
+
+class AccessToken(KeyRingTokenMixin, _AccessToken):
+    pass
+
+
+class UntypedToken(KeyRingTokenMixin, _UntypedToken):
+    pass
+
+
+class RefreshToken(KeyRingTokenMixin, _RefreshToken):
+    access_token_class = AccessToken
+
+    def check_blacklist(self):
+        if token_blacklist.is_blacklisted(self.payload[jwt_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        return token_blacklist.blacklist(self)
+
+    @classmethod
+    def for_user(cls, user):
+        token = super(BlacklistMixin, cls).for_user(user)
+        # Copied into every access token minted from it, also after rotation.
+        token[api_settings.SESSION_ID_CLAIM] = token[jwt_settings.JTI_CLAIM]
+        token_blacklist.outstand(token, user)
+        return token
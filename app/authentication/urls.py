@@ -4,6 +4,7 @@ from authentication.views import (
     ObtainTokenPairView,
     RefreshTokenView,
     VerifyTokenView,
+    VerifyTokenBatchView,
     BlacklistTokenView,
     SignupView,
     VerifyActivationEmailTokenView,
@@ -12,12 +13,19 @@ from authentication.views import (
     SendPasswordRecoveryTokenView,
     UserList,
     UserDetail,
+    UserImportView,
+    UserExportView,
 )
 
 urlpatterns = [
     path("auth/login/", ObtainTokenPairView.as_view(), name="login"),
     path("auth/refresh/", RefreshTokenView.as_view(), name="login-refresh"),
     path("auth/verify/", VerifyTokenView.as_view(), name="login-verify"),
+    path(
+        "auth/verify/batch/",
+        VerifyTokenBatchView.as_view(),
+        name="login-verify-batch",
+    ),
     path("auth/blacklist/", BlacklistTokenView.as_view(), name="login-blacklist"),
     path("auth/signup/", SignupView.as_view(), name="signup"),
     path(
@@ -41,5 +49,7 @@ urlpatterns = [
         name="auth-send-activation",
     ),
     path("user/", UserList.as_view(), name="user-list"),
+    path("user/import/", UserImportView.as_view(), name="user-import"),
+    path("user/export/", UserExportView.as_view(), name="user-export"),
     path("user/<uuid:id>/", UserDetail.as_view(), name="user-detail"),
 ]
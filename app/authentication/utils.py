@@ -1,41 +1,91 @@
-import threading
+import uuid
+import hashlib
+import logging
 import datetime
 import jwt
 
+from redis.exceptions import RedisError
+
+from django.core.exceptions import ImproperlyConfigured
 from django.core.mail import EmailMultiAlternatives
 from django.template import Template, Context
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 from django.contrib.auth import get_user_model
 from urllib.parse import urljoin
 
+from . import keys
+from . import settings as auth_settings
+from .blacklist import consumed_tokens
+from .models import OutboxEmail
 from .settings import api_settings
 
-
-class AccountVerificationSender:
-    sender = api_settings.EMAIL_SENDER
-    logo = api_settings.EMAIL_LOGO
-    signature = api_settings.EMAIL_SIGNATURE
-    subject = api_settings.EMAIL_ACCOUNT_VERIFICATION_SUBJECT
-    plain = api_settings.EMAIL_ACCOUNT_VERIFICATION_PLAIN
-    html = api_settings.EMAIL_ACCOUNT_VERIFICATION_HTML
-
-    def send(self, user, url, token, thread=True):
-        if thread:
-            thr = threading.Thread(target=self._send, args=(user, url, token))
-            thr.start()
-        else:
-            self._send(user, url, token)
-
-    def _send(self, user, url, token):
-        context = self.create_context(user, url, token)
-
-        subject = Template(self.subject).render(Context(context))
-        text = render_to_string(self.plain, context)
-        html = render_to_string(self.html, context)
-
-        msg = EmailMultiAlternatives(subject, text, self.sender, [user.email])
-        msg.attach_alternative(html, "text/html")
-        msg.send()
+logger = logging.getLogger(__name__)
+
+
+class EmailSender:
+    templates_setting = None
+
+    _templates = None
+
+    @property
+    def sender(self):
+        return auth_settings.api_settings.EMAIL_SENDER
+
+    @property
+    def logo(self):
+        return auth_settings.api_settings.EMAIL_LOGO
+
+    @property
+    def signature(self):
+        return auth_settings.api_settings.EMAIL_SIGNATURE
+
+    @classmethod
+    def get_templates(cls):
+        templates = cls.__dict__.get("_templates")
+        if templates is None:
+            # Read through the module, reload_api_settings replaces api_settings.
+            settings = auth_settings.api_settings
+            templates = (
+                Template(getattr(settings, f"{cls.templates_setting}_SUBJECT")),
+                get_template(getattr(settings, f"{cls.templates_setting}_PLAIN")),
+                get_template(getattr(settings, f"{cls.templates_setting}_HTML")),
+            )
+            cls._templates = templates
+        return templates
+
+    @classmethod
+    def clear_templates(cls):
+        cls._templates = None
+        for subclass in cls.__subclasses__():
+            subclass.clear_templates()
+
+    def send(self, user, url, token):
+        return OutboxEmail.objects.enqueue(self.create_message(user, url, token))
+
+    def send_many(self, recipients):
+        return OutboxEmail.objects.enqueue_many(self.create_messages(recipients))
+
+    def create_message(self, user, url, token):
+        return self.render(self.get_templates(), self.create_context(user, url, token))
+
+    def create_messages(self, recipients):
+        templates = self.get_templates()
+        return [
+            self.render(templates, self.create_context(user, url, token))
+            for user, url, token in recipients
+        ]
+
+    def render(self, templates, context):
+        subject, plain, html = templates
+
+        msg = EmailMultiAlternatives(
+            subject.render(Context(context)),
+            plain.render(context),
+            self.sender,
+            [context["email"]],
+        )
+        msg.attach_alternative(html.render(context), "text/html")
+        return msg
 
     def create_context(self, user, url, token):
         return {
@@ -43,65 +93,85 @@ class AccountVerificationSender:
             "signature": f"{self.signature}",
             "url": urljoin(url, token),
             "username": f"{user.username}",
+            "email": user.email,
         }
 
 
-class PasswordRecoverySender:
-    sender = api_settings.EMAIL_SENDER
-    logo = api_settings.EMAIL_LOGO
-    signature = api_settings.EMAIL_SIGNATURE
-    subject = api_settings.EMAIL_PASSWORD_RECOVERY_SUBJECT
-    plain = api_settings.EMAIL_PASSWORD_RECOVERY_PLAIN
-    html = api_settings.EMAIL_PASSWORD_RECOVERY_HTML
-
-    def send(self, user, url, token, thread=True):
-        if thread:
-            thr = threading.Thread(target=self._send, args=(user, url, token))
-            thr.start()
-        else:
-            self._send(user, url, token)
+class AccountVerificationSender(EmailSender):
+    templates_setting = "EMAIL_ACCOUNT_VERIFICATION"
 
-    def _send(self, user, url, token):
-        context = self.create_context(user, url, token)
 
-        subject = Template(self.subject).render(Context(context))
-        text = render_to_string(self.plain, context)
-        html = render_to_string(self.html, context)
-
-        msg = EmailMultiAlternatives(subject, text, self.sender, [user.email])
-        msg.attach_alternative(html, "text/html")
-        msg.send()
-
-    def create_context(self, user, url, token):
-        return {
-            "logo": f"{self.logo}",
-            "signature": f"{self.signature}",
-            "url": urljoin(url, token),
-            "username": f"{user.username}",
-        }
+class PasswordRecoverySender(EmailSender):
+    templates_setting = "EMAIL_PASSWORD_RECOVERY"
 
 
 class TokenGenerator:
     algorithm = api_settings.TOKEN_GENERATOR_ALGORITHM
     secret = api_settings.TOKEN_GENERATOR_SECRET
+    use_signing_keys = api_settings.TOKEN_GENERATOR_USE_SIGNING_KEYS
+
+    @property
+    def key_ring(self):
+        if not keys.key_ring:
+            raise ImproperlyConfigured(
+                "TOKEN_GENERATOR_USE_SIGNING_KEYS requires at least one of the "
+                "SIGNING_KEYS, set JWT_SIGNING_KEY_FILES."
+            )
+        return keys.key_ring
+
+    def encode(self, payload):
+        if self.use_signing_keys:
+            return self.key_ring.encode(payload)
+        return jwt.encode(payload, self.secret, algorithm=self.algorithm)
+
+    def decode(self, token):
+        if self.use_signing_keys:
+            return self.key_ring.decode(token)
+        return jwt.decode(token, self.secret, algorithms=[self.algorithm])
+
+    def get_expiry(self):
+        return (datetime.datetime.today() + self.token_lifetime).timestamp()
+
+    @staticmethod
+    def make_payload(user, exp, **kwargs):
+        return {"email": user.email, "exp": exp, "jti": uuid.uuid4().hex, **kwargs}
 
     def make_token(self, user, **kwargs):
-        exp = (datetime.datetime.today() + self.token_lifetime).timestamp()
-        payload = {"email": user.email, "exp": exp}
-        payload.update(**kwargs)
-        return jwt.encode(
-            payload, self.secret, algorithm=self.algorithm
-        ), datetime.datetime.fromtimestamp(exp)
-
-    def check_token(self, token, **kwargs):
+        exp = self.get_expiry()
+        return (
+            self.encode(self.make_payload(user, exp, **kwargs)),
+            datetime.datetime.fromtimestamp(exp),
+        )
+
+    def make_tokens(self, users, **kwargs):
+        exp = self.get_expiry()
+        expires_at = datetime.datetime.fromtimestamp(exp)
+        return [
+            (self.encode(self.make_payload(user, exp, **kwargs)), expires_at)
+            for user in users
+        ]
+
+    @staticmethod
+    def get_jti(token, payload):
+        # Tokens issued before the jti claim existed are tracked by digest.
+        return payload.get("jti") or hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def check_token(self, token, consume=False, **kwargs):
         try:
-            payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
-            email, _ = payload["email"], payload["exp"]
+            payload = self.decode(token)
+            email, exp = payload["email"], payload["exp"]
             for key, value in kwargs.items():
                 if payload[key] != value:
                     return False, None
 
-            users = [get_user_model().objects.get(email=email)]
+            jti = self.get_jti(token, payload)
+            if consume:
+                if not consumed_tokens.consume(jti, exp):
+                    return False, None
+            elif consumed_tokens.is_consumed(jti):
+                return False, None
+
+            users = [get_user_model().objects.get_by_email(email)]
 
         except (
             ValueError,
@@ -110,6 +180,9 @@ class TokenGenerator:
             jwt.ExpiredSignatureError,
         ):
             return False, None
+        except RedisError as exc:
+            logger.warning("Checking consumed email tokens failed: %s", exc)
+            return False, None
 
         if len(users) == 0 or users[0] is None:
             return False, None
@@ -0,0 +1,53 @@
+import jwt
+
+
+class TokenVerifier:
+    algorithms = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "EdDSA")
+
+    def __init__(
+        self,
+        jwks_url=None,
+        jwks=None,
+        audience=None,
+        issuer=None,
+        leeway=0,
+        lifespan=300,
+    ):
+        if (jwks_url is None) == (jwks is None):
+            raise ValueError("Exactly one of jwks_url and jwks must be given")
+
+        self.audience = audience
+        self.issuer = issuer
+        self.leeway = leeway
+        self.client = (
+            jwt.PyJWKClient(jwks_url, cache_keys=True, lifespan=lifespan)
+            if jwks_url
+            else None
+        )
+        self.jwk_set = jwt.PyJWKSet.from_dict(jwks) if jwks else None
+
+    def get_signing_key(self, token):
+        if self.client is not None:
+            return self.client.get_signing_key_from_jwt(token).key
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        try:
+            return self.jwk_set[kid].key
+        except KeyError as exc:
+            raise jwt.InvalidSignatureError("Unknown signing key") from exc
+
+    def verify(self, token, token_type="access"):
+        claims = jwt.decode(
+            token,
+            self.get_signing_key(token),
+            algorithms=list(self.algorithms),
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={"verify_aud": self.audience is not None},
+        )
+
+        if token_type is not None and claims.get("token_type") != token_type:
+            raise jwt.InvalidTokenError("Token has wrong type")
+
+        return claims
@@ -1,9 +1,16 @@
+import csv
+import codecs
+
 from django.contrib.auth import get_user_model
+from django.utils.cache import patch_cache_control
 
 from rest_framework import status, generics, views
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from rest_framework_api_key.permissions import KeyParser
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import (
     TokenBlacklistView,
     TokenObtainPairView,
@@ -11,14 +18,41 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
-from base.views import AccessPolicyViewSetMixin
+from base.cache import RedisIdempotencyStore
+from base.http import ThreadedStreamingHttpResponse
+from base.renderers import CSVRenderer, NDJSONRenderer
+from base.views import (
+    AccessPolicyViewSetMixin,
+    AsyncAPIViewMixin,
+    IdempotentAPIViewMixin,
+)
+
+from authentication import keys
 
+from authentication.cache import api_key_cache
+
+from authentication.exports import UserExporter
 from authentication.filters import UserFilter
-from authentication.policies import OrganizationAPIKeyAccessPolicy, UserAccessPolicy
+from authentication.imports import UserImporter
+from authentication.pagination import UserPagination
+from authentication.settings import api_settings
+from authentication.policies import (
+    OrganizationAPIKeyAccessPolicy,
+    StaffAccessPolicy,
+    UserAccessPolicy,
+)
 from authentication.serializers import (
     UserSerializer,
+    ObtainTokenPairSerializer,
+    RefreshTokenSerializer,
+    VerifyTokenSerializer,
+    VerifyTokenBatchSerializer,
+    BlacklistTokenSerializer,
     SendActivationEmailTokenSerializer,
     SendRecoveryPasswordTokenSerializer,
+    UserImportSerializer,
+    UserImportOptionsSerializer,
+    UserReadSerializer,
     VerifyActivationEmailTokenSerializer,
     VerifyPasswordRecoveryTokenSerializer,
 )
@@ -26,107 +60,263 @@ from authentication.swagger import (
     extend_obtain_token_pair_schema,
     extend_refresh_token_schema,
     extend_verify_token_schema,
+    extend_verify_token_batch_schema,
     extend_blacklist_token_schema,
     extend_signup_schema,
     extend_verify_activation_email_token_schema,
     extend_verify_password_recovery_token_schema,
     extend_send_activation_email_token_schema,
     extend_send_password_recovery_token_schema,
+    extend_jwks_schema,
     extend_user_list_schema,
     extend_user_detail_schema,
+    extend_user_import_schema,
+    extend_user_export_schema,
 )
 
 
+def validate_and_save(serializer):
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+class APIKeyIdempotencyMixin(IdempotentAPIViewMixin):
+    idempotency_store = RedisIdempotencyStore(
+        alias=api_settings.IDEMPOTENCY_CACHE_ALIAS
+    )
+    idempotency_ttl = api_settings.IDEMPOTENCY_KEY_TTL
+    idempotency_lock_timeout = api_settings.IDEMPOTENCY_LOCK_TIMEOUT
+    idempotency_wait_timeout = api_settings.IDEMPOTENCY_WAIT_TIMEOUT
+    key_parser = KeyParser()
+
+    def get_idempotency_scope(self, request):
+        key = self.key_parser.get(request)
+        if not key:
+            return super().get_idempotency_scope(request)
+        return f"api_key:{api_key_cache.prefix(key)}"
+
+
+class AsyncTokenViewMixin(AsyncAPIViewMixin):
+    async def post(self, request: Request, *_args, **_kwargs):
+        serializer = self.get_serializer(data=request.data)
+
+        try:
+            await self.run_sync(serializer.is_valid)(raise_exception=True)
+        except TokenError as exc:
+            raise InvalidToken(exc.args[0]) from exc
+
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
 @extend_obtain_token_pair_schema
-class ObtainTokenPairView(AccessPolicyViewSetMixin, TokenObtainPairView):
+class ObtainTokenPairView(
+    AccessPolicyViewSetMixin, AsyncTokenViewMixin, TokenObtainPairView
+):
+    serializer_class = ObtainTokenPairSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
 
 @extend_refresh_token_schema
-class RefreshTokenView(AccessPolicyViewSetMixin, TokenRefreshView):
+class RefreshTokenView(AccessPolicyViewSetMixin, AsyncTokenViewMixin, TokenRefreshView):
+    serializer_class = RefreshTokenSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
 
 @extend_verify_token_schema
-class VerifyTokenView(AccessPolicyViewSetMixin, TokenVerifyView):
+class VerifyTokenView(AccessPolicyViewSetMixin, AsyncTokenViewMixin, TokenVerifyView):
+    serializer_class = VerifyTokenSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
 
+@extend_verify_token_batch_schema
+class VerifyTokenBatchView(AccessPolicyViewSetMixin, generics.GenericAPIView):
+    authentication_classes = ()
+    serializer_class = VerifyTokenBatchSerializer
+    access_policy = OrganizationAPIKeyAccessPolicy
+
+    def post(self, request: Request, *_args, **_kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
 @extend_blacklist_token_schema
 class BlacklistTokenView(AccessPolicyViewSetMixin, TokenBlacklistView):
+    serializer_class = BlacklistTokenSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
 
 @extend_signup_schema
-class SignupView(AccessPolicyViewSetMixin, generics.CreateAPIView):
+class SignupView(
+    AccessPolicyViewSetMixin, APIKeyIdempotencyMixin, generics.CreateAPIView
+):
     serializer_class = UserSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
+    async def post(self, request: Request, *_args, **_kwargs):
+        serializer = self.get_serializer(data=request.data)
+        await self.run_sync(serializer.is_valid)(raise_exception=True)
+        await self.run_sync(self.perform_create)(serializer)
+
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
+
 
 @extend_verify_activation_email_token_schema
-class VerifyActivationEmailTokenView(AccessPolicyViewSetMixin, views.APIView):
+class VerifyActivationEmailTokenView(
+    AccessPolicyViewSetMixin, AsyncAPIViewMixin, views.APIView
+):
     serializer_class = None
     access_policy = OrganizationAPIKeyAccessPolicy
 
-    def post(self, request: Request, token, *_args, **_kwargs):
-        serializer = VerifyActivationEmailTokenSerializer(context={"token": token})
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+    async def post(self, request: Request, token, *_args, **_kwargs):
+        serializer = VerifyActivationEmailTokenSerializer(
+            data=request.data, context={"token": token}
+        )
+        await self.run_sync(validate_and_save)(serializer)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @extend_verify_password_recovery_token_schema
-class VerifyPasswordRecoveryTokenView(AccessPolicyViewSetMixin, views.APIView):
+class VerifyPasswordRecoveryTokenView(
+    AccessPolicyViewSetMixin, AsyncAPIViewMixin, views.APIView
+):
     serializer_class = VerifyPasswordRecoveryTokenSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
-    def post(self, request: Request, token, *_args, **_kwargs):
+    async def post(self, request: Request, token, *_args, **_kwargs):
         serializer = self.serializer_class(data=request.data, context={"token": token})
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        await self.run_sync(validate_and_save)(serializer)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @extend_send_activation_email_token_schema
-class SendActivationEmailTokenView(AccessPolicyViewSetMixin, generics.GenericAPIView):
+class SendActivationEmailTokenView(
+    AccessPolicyViewSetMixin, APIKeyIdempotencyMixin, generics.GenericAPIView
+):
     serializer_class = SendActivationEmailTokenSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
-    def post(self, request: Request, *_args, **_kwargs):
+    async def post(self, request: Request, *_args, **_kwargs):
         serializer = self.serializer_class(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        await self.run_sync(validate_and_save)(serializer)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @extend_send_password_recovery_token_schema
-class SendPasswordRecoveryTokenView(AccessPolicyViewSetMixin, generics.GenericAPIView):
+class SendPasswordRecoveryTokenView(
+    AccessPolicyViewSetMixin, APIKeyIdempotencyMixin, generics.GenericAPIView
+):
     serializer_class = SendRecoveryPasswordTokenSerializer
     access_policy = OrganizationAPIKeyAccessPolicy
 
-    def post(self, request: Request, *_args, **_kwargs):
+    async def post(self, request: Request, *_args, **_kwargs):
         serializer = self.serializer_class(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        await self.run_sync(validate_and_save)(serializer)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@extend_jwks_schema
+class JWKSView(views.APIView):
+    authentication_classes = ()
+    permission_classes = ()
+    throttle_classes = ()
+
+    def get(self, request: Request, *_args, **_kwargs):
+        response = Response(keys.key_ring.jwks())
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=int(api_settings.JWKS_MAX_AGE.total_seconds()),
+        )
+        return response
+
+
 @extend_user_list_schema
 class UserList(AccessPolicyViewSetMixin, generics.ListAPIView):
-    queryset = get_user_model().objects.all()
-    serializer_class = UserSerializer
+    queryset = get_user_model().objects.only(*UserReadSerializer.columns)
+    serializer_class = UserReadSerializer
     access_policy = UserAccessPolicy
     filterset_class = UserFilter
+    pagination_class = UserPagination
     lookup_field = "id"
 
 
 @extend_user_detail_schema
 class UserDetail(AccessPolicyViewSetMixin, generics.RetrieveAPIView):
-    queryset = get_user_model().objects.all()
-    serializer_class = UserSerializer
+    queryset = get_user_model().objects.only(*UserReadSerializer.columns)
+    serializer_class = UserReadSerializer
     access_policy = UserAccessPolicy
     lookup_field = "id"
+
+
+@extend_user_import_schema
+class UserImportView(AccessPolicyViewSetMixin, generics.GenericAPIView):
+    serializer_class = UserImportSerializer
+    access_policy = StaffAccessPolicy
+    import_formats = {"text/csv": "csv", "application/x-ndjson": "ndjson"}
+    max_errors = api_settings.USER_IMPORT_MAX_ERRORS
+
+    def get_import_format(self, request):
+        media_type = request.content_type.split(";")[0].strip().lower()
+        if media_type not in self.import_formats:
+            raise UnsupportedMediaType(media_type)
+        return self.import_formats[media_type]
+
+    def post(self, request: Request, *_args, **_kwargs):
+        import_format = self.get_import_format(request)
+        options = UserImportOptionsSerializer(data=request.query_params)
+        options.is_valid(raise_exception=True)
+
+        importer = UserImporter(url=options.validated_data.get("verification_url"))
+        # The body is read line by line, never loaded into memory at once.
+        lines = codecs.iterdecode(request.stream or (), "utf-8-sig")
+
+        result = {"processed": 0, "created": 0, "failed": 0, "errors": []}
+        try:
+            for progress in importer.run(lines, import_format):
+                result.update(
+                    processed=progress.processed,
+                    created=progress.created,
+                    failed=progress.failed,
+                )
+                result["errors"].extend(
+                    {"line": error.line, "errors": error.errors}
+                    for error in progress.errors[
+                        : self.max_errors - len(result["errors"])
+                    ]
+                )
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise ParseError(str(exc)) from exc
+
+        return Response(result)
+
+
+@extend_user_export_schema
+class UserExportView(AccessPolicyViewSetMixin, generics.GenericAPIView):
+    queryset = get_user_model().objects.all()
+    access_policy = StaffAccessPolicy
+    filterset_class = UserFilter
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    pagination_class = None
+
+    def get(self, request: Request, *_args, **_kwargs):
+        exporter = UserExporter()
+        renderer = request.accepted_renderer
+        rows = exporter.rows(self.filter_queryset(self.get_queryset()))
+
+        response = ThreadedStreamingHttpResponse(
+            renderer.stream(rows, list(exporter.fields)),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="users.{renderer.format}"'
+        return response
@@ -0,0 +1,9 @@
+from base.benchmark.commands import BenchmarkCommand
+from base.benchmark.timer import BenchmarkResult, benchmark
+
+
+__all__ = [
+    "BenchmarkCommand",
+    "BenchmarkResult",
+    "benchmark",
+]
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class BenchmarkCommand(BaseCommand):
+    iterations = 1000
+    repeat = 5
+    atomic = True
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=self.iterations)
+        parser.add_argument("--repeat", type=int, default=self.repeat)
+
+    def handle(self, *args, **options):
+        if self.atomic:
+            with transaction.atomic():
+                self.setup(**options)
+                results = list(self.run(**options))
+                transaction.set_rollback(True)
+        else:
+            self.setup(**options)
+            try:
+                results = list(self.run(**options))
+            finally:
+                self.teardown(**options)
+
+        for result in results:
+            self.stdout.write(str(result))
+
+        if len(results) > 1:
+            baseline, *others = results
+            for result in others:
+                self.stdout.write(
+                    f"{result.name}: "
+                    f"{baseline.per_operation / result.per_operation:.2f}x "
+                    f"vs {baseline.name}"
+                )
+
+    def setup(self, **options):
+        pass
+
+    def teardown(self, **options):
+        pass
+
+    def run(self, **options):
+        raise NotImplementedError
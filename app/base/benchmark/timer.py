@@ -0,0 +1,45 @@
+import time
+import statistics
+
+
+class BenchmarkResult:
+    def __init__(self, name, iterations, timings):
+        self.name = name
+        self.iterations = iterations
+        self.timings = timings
+
+    @property
+    def best(self):
+        return min(self.timings)
+
+    @property
+    def median(self):
+        return statistics.median(self.timings)
+
+    @property
+    def per_operation(self):
+        return self.median / self.iterations
+
+    @property
+    def operations_per_second(self):
+        return self.iterations / self.median if self.median else float("inf")
+
+    def __str__(self):
+        return (
+            f"{self.name:<40} {self.per_operation * 1e6:>12.2f} us/op "
+            f"{self.operations_per_second:>14.0f} op/s"
+        )
+
+
+def benchmark(name, func, iterations=1000, repeat=5, warmup=10):
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append(time.perf_counter() - start)
+
+    return BenchmarkResult(name, iterations, timings)
@@ -0,0 +1,13 @@
+from base.cache.bloom import BloomFilter
+from base.cache.idempotency import RedisIdempotencyStore
+from base.cache.lru import CacheStats, LRUCache
+from base.cache.tiered import TieredCache
+
+
+__all__ = [
+    "BloomFilter",
+    "CacheStats",
+    "LRUCache",
+    "RedisIdempotencyStore",
+    "TieredCache",
+]
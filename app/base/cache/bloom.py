@@ -0,0 +1,47 @@
+import math
+import hashlib
+import threading
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._lock = threading.Lock()
+        self._bits = bytearray(math.ceil(self.size / 8))
+        self._count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(str(item).encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(
+            digest[8:], "big"
+        )
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        positions = self._positions(item)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self._count += 1
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def clear(self):
+        with self._lock:
+            self._bits = bytearray(len(self._bits))
+            self._count = 0
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self):
+        return self._count
@@ -0,0 +1,98 @@
+import json
+import uuid
+
+from django.core.cache import caches
+from django_redis import get_redis_connection
+
+from rest_framework.utils.encoders import JSONEncoder
+
+# Returns the record stored for a key, or claims the key with a pending
+# record and returns nil, so only the first request for a key runs.
+BEGIN_SCRIPT = """
+local current = redis.call("GET", KEYS[1])
+if current then
+    return current
+end
+redis.call("SET", KEYS[1], ARGV[1], "PX", ARGV[2])
+return false
+"""
+
+# Only the request holding the pending record may store its result or
+# release the key, a request outliving its lock leaves the key alone.
+FINISH_SCRIPT = """
+local current = redis.call("GET", KEYS[1])
+if not current or cjson.decode(current)["lock"] ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] == "" then
+    redis.call("DEL", KEYS[1])
+else
+    redis.call("SET", KEYS[1], ARGV[2], "PX", ARGV[3])
+end
+return 1
+"""
+
+
+class RedisIdempotencyStore:
+    encoder = JSONEncoder
+
+    def __init__(self, namespace="idempotency", alias="default"):
+        self.namespace = namespace
+        self.alias = alias
+        self._scripts = None
+
+    @property
+    def connection(self):
+        return get_redis_connection(self.alias)
+
+    @property
+    def scripts(self):
+        if self._scripts is None:
+            self._scripts = (
+                self.connection.register_script(BEGIN_SCRIPT),
+                self.connection.register_script(FINISH_SCRIPT),
+            )
+        return self._scripts
+
+    def make_key(self, key):
+        return caches[self.alias].make_key(f"{self.namespace}:{key}")
+
+    def begin(self, key, fingerprint, lock_timeout):
+        begin, _ = self.scripts
+        lock = uuid.uuid4().hex
+        current = begin(
+            keys=[self.make_key(key)],
+            args=[
+                json.dumps({"fingerprint": fingerprint, "lock": lock}),
+                int(lock_timeout.total_seconds() * 1000),
+            ],
+            client=self.connection,
+        )
+        if current is None:
+            return lock, None
+        return None, json.loads(current)
+
+    def complete(self, key, lock, record, ttl):
+        _, finish = self.scripts
+        return bool(
+            finish(
+                keys=[self.make_key(key)],
+                args=[
+                    lock,
+                    json.dumps(record, cls=self.encoder),
+                    int(ttl.total_seconds() * 1000),
+                ],
+                client=self.connection,
+            )
+        )
+
+    def release(self, key, lock):
+        _, finish = self.scripts
+        return bool(
+            finish(
+                keys=[self.make_key(key)], args=[lock, "", 0], client=self.connection
+            )
+        )
+
+    def delete(self, key):
+        self.connection.delete(self.make_key(key))
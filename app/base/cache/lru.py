@@ -0,0 +1,84 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class CacheStats:
+    def __init__(self, *counters):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(("hits", "misses", *counters), 0)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["_counters"][name]
+        except KeyError as exc:
+            raise AttributeError(name) from exc
+
+    def incr(self, counter, value=1):
+        with self._lock:
+            self._counters[counter] += value
+
+    def reset(self):
+        with self._lock:
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self):
+        with self._lock:
+            counters = dict(self._counters)
+        return {**counters, "hit_ratio": self.hit_ratio}
+
+
+class LRUCache:
+    _missing = object()
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats("evictions")
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, self._missing)
+            if entry is not self._missing:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.stats.incr("hits")
+                    return value
+                del self._data[key]
+
+        self.stats.incr("misses")
+        return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, self._missing) is not self._missing
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,66 @@
+from django.core.cache import caches
+
+from base.cache.lru import CacheStats, LRUCache
+
+
+class TieredCache:
+    _missing = object()
+
+    def __init__(
+        self, namespace, maxsize=1024, local_ttl=None, remote_ttl=None, alias=None
+    ):
+        self.namespace = namespace
+        self.remote_ttl = remote_ttl
+        self.alias = alias
+        self.local = LRUCache(maxsize=maxsize, ttl=local_ttl)
+        self.stats = CacheStats("local_hits", "remote_hits")
+
+    @property
+    def remote(self):
+        return caches[self.alias] if self.alias else None
+
+    def make_key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def get(self, key, default=None):
+        value = self.local.get(key, self._missing)
+        if value is not self._missing:
+            self.stats.incr("hits")
+            self.stats.incr("local_hits")
+            return value
+
+        if self.remote is not None:
+            value = self.remote.get(self.make_key(key), self._missing)
+            if value is not self._missing:
+                self.local.set(key, value)
+                self.stats.incr("hits")
+                self.stats.incr("remote_hits")
+                return value
+
+        self.stats.incr("misses")
+        return default
+
+    def set(self, key, value, ttl=None):
+        remote_ttl = (
+            self.remote_ttl if ttl is None else min(ttl, self.remote_ttl or ttl)
+        )
+        local_ttl = self.local.ttl if ttl is None else min(ttl, self.local.ttl or ttl)
+
+        self.local.set(key, value, ttl=local_ttl)
+        if self.remote is not None:
+            self.remote.set(self.make_key(key), value, timeout=remote_ttl)
+
+    def delete(self, key):
+        self.local.delete(key)
+        if self.remote is not None:
+            self.remote.delete(self.make_key(key))
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        for key in keys:
+            self.local.delete(key)
+        if self.remote is not None and keys:
+            self.remote.delete_many([self.make_key(key) for key in keys])
+
+    def clear(self):
+        self.local.clear()
@@ -0,0 +1,23 @@
+from base.db.middleware import ReplicaRoutingMiddleware
+from base.db.sync import (
+    RequestThread,
+    database_sync_to_async,
+    release_connections,
+)
+from base.db.routers import (
+    PrimaryReplicaRouter,
+    bind_user,
+    get_routing_state,
+    pin_user,
+)
+
+__all__ = [
+    "PrimaryReplicaRouter",
+    "ReplicaRoutingMiddleware",
+    "RequestThread",
+    "bind_user",
+    "database_sync_to_async",
+    "get_routing_state",
+    "pin_user",
+    "release_connections",
+]
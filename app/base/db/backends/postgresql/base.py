@@ -0,0 +1,132 @@
+import time
+import threading
+
+import psycopg2
+import psycopg2.extras
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool(ThreadedConnectionPool):
+    def __init__(self, min_size, max_size, **conn_params):
+        super().__init__(min_size, max_size, **conn_params)
+        # psycopg2 closes returned connections once minconn are idle, keep up
+        # to max_size open after opening min_size eagerly.
+        self.minconn = max_size
+
+
+def get_pool(alias, conn_params, options):
+    key = (alias, repr(sorted(conn_params.items())))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                options.get("min_size", 0), options["max_size"], **conn_params
+            )
+        return _pools[key]
+
+
+def close_pools(alias=None):
+    with _pools_lock:
+        for key in list(_pools):
+            if alias is None or key[0] == alias:
+                _pools.pop(key).closeall()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+        self.pool = None
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get("CONN_HEALTH_CHECKS", False)
+
+    @property
+    def pool_options(self):
+        return self.settings_dict.get("POOL") or None
+
+    def check_settings(self):
+        super().check_settings()
+        if self.pool_options and self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured(
+                "Pooled database connections require CONN_MAX_AGE = 0, connections "
+                "are returned to the pool at the end of every request."
+            )
+
+    def connect(self):
+        self.health_check_done = True
+        super().connect()
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and self.health_check_enabled
+            and not self.health_check_done
+        ):
+            if not self.in_atomic_block and not self.is_usable():
+                self.close()
+            self.health_check_done = True
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def get_new_connection(self, conn_params):
+        options = self.pool_options
+        if options is None:
+            return super().get_new_connection(conn_params)
+
+        self.pool = get_pool(self.alias, conn_params, options)
+        connection = self.borrow(self.pool, options.get("timeout", 30))
+
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def borrow(self, pool, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                connection = pool.getconn()
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.01)
+                continue
+
+            if not self.health_check_enabled or self.ping(connection):
+                return connection
+            pool.putconn(connection, close=True)
+
+    @staticmethod
+    def ping(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def _close(self):
+        if self.pool is None or self.pool.closed or self.connection is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            return self.pool.putconn(self.connection)
@@ -0,0 +1,62 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+
+from base.db.routers import (
+    PrimaryReplicaRouter,
+    get_routing_state,
+    pin_user,
+    start_routing,
+    stop_routing,
+)
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            # pylint: disable=protected-access
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        # Without replicas every read goes to the primary, skip the pinning.
+        if not PrimaryReplicaRouter.get_replicas():
+            return self.get_response(request)
+
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        token = start_routing()
+        try:
+            response = self.get_response(request)
+
+            user_key = self.get_pin_user_key()
+            if user_key is not None:
+                pin_user(user_key)
+        finally:
+            stop_routing(token)
+
+        return response
+
+    async def __acall__(self, request):
+        token = start_routing()
+        try:
+            response = await self.get_response(request)
+
+            user_key = self.get_pin_user_key()
+            if user_key is not None:
+                await sync_to_async(pin_user, thread_sensitive=False)(user_key)
+        finally:
+            stop_routing(token)
+
+        return response
+
+    @staticmethod
+    def get_pin_user_key():
+        state = get_routing_state()
+        if state.wrote:
+            return state.user_key
+        return None
@@ -0,0 +1,94 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_routing_state = ContextVar("replica_routing_state", default=None)
+
+
+class RoutingState:
+    def __init__(self):
+        self.pinned = False
+        self.wrote = False
+        self.user_key = None
+
+
+def get_routing_state():
+    return _routing_state.get()
+
+
+def start_routing():
+    return _routing_state.set(RoutingState())
+
+
+def stop_routing(token):
+    _routing_state.reset(token)
+
+
+def make_pin_key(user_key):
+    return f"replica_pin:{user_key}"
+
+
+def bind_user(user_key):
+    if not PrimaryReplicaRouter.get_replicas():
+        return
+
+    state = get_routing_state()
+    if state is None or state.user_key == user_key:
+        return
+
+    state.user_key = user_key
+    if not state.pinned:
+        cache = caches[PrimaryReplicaRouter.get_pin_cache_alias()]
+        state.pinned = cache.get(make_pin_key(user_key)) is not None
+
+
+def pin_user(user_key):
+    window = PrimaryReplicaRouter.get_pin_window()
+    if window and PrimaryReplicaRouter.get_replicas():
+        cache = caches[PrimaryReplicaRouter.get_pin_cache_alias()]
+        cache.set(make_pin_key(user_key), True, timeout=window)
+
+
+class PrimaryReplicaRouter:
+    primary = DEFAULT_DB_ALIAS
+
+    @staticmethod
+    def get_replicas():
+        return getattr(settings, "DATABASE_REPLICAS", [])
+
+    @staticmethod
+    def get_pin_window():
+        return getattr(settings, "DATABASE_REPLICA_PIN_WINDOW", 5)
+
+    @staticmethod
+    def get_pin_cache_alias():
+        return getattr(settings, "DATABASE_REPLICA_PIN_CACHE", "default")
+
+    def db_for_read(self, model, **hints):
+        # pylint: disable=unused-argument
+        replicas = self.get_replicas()
+        state = get_routing_state()
+        if not replicas or state is None or state.pinned:
+            return self.primary
+
+        if connections[self.primary].in_atomic_block:
+            return self.primary
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # pylint: disable=unused-argument
+        state = get_routing_state()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # pylint: disable=unused-argument
+        databases = {self.primary, *self.get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,49 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from channels.db import DatabaseSyncToAsync as BaseDatabaseSyncToAsync
+from django.db import connections
+
+
+def release_connections(close_persistent=False):
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+
+        leaked_transaction = connection.in_atomic_block or (
+            connection.get_autocommit() != connection.settings_dict["AUTOCOMMIT"]
+        )
+        pooled = getattr(connection, "pool", None) is not None
+        if leaked_transaction or pooled or close_persistent:
+            connection.close()
+
+
+class DatabaseSyncToAsync(BaseDatabaseSyncToAsync):
+    def thread_handler(self, loop, *args, **kwargs):
+        try:
+            return super().thread_handler(loop, *args, **kwargs)
+        finally:
+            # Executor threads are shared and never torn down, so the
+            # connections they open must not outlive the call.
+            release_connections(close_persistent=not self._thread_sensitive)
+
+
+database_sync_to_async = DatabaseSyncToAsync
+
+
+class RequestThread:
+    # Runs all blocking work of one request in the same thread, so it shares
+    # one database connection that is released when the request finishes.
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def sync_to_async(self, func):
+        return sync_to_async(func, thread_sensitive=False, executor=self.executor)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self.executor, release_connections, True)
+        finally:
+            self.executor.shutdown(wait=False)
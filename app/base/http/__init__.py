@@ -0,0 +1,9 @@
+from base.http.asgi import ASGIHandler, get_asgi_application
+from base.http.response import ThreadedStreamingHttpResponse
+
+
+__all__ = [
+    "ASGIHandler",
+    "ThreadedStreamingHttpResponse",
+    "get_asgi_application",
+]
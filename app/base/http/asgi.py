@@ -0,0 +1,49 @@
+import django
+from asgiref.sync import sync_to_async
+from django.core.handlers import asgi
+
+from base.http.response import ThreadedStreamingHttpResponse
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    async def send_response(self, response, send):
+        # Django 3.2 iterates streaming content on the event loop.
+        if not isinstance(response, ThreadedStreamingHttpResponse):
+            return await super().send_response(response, send)
+
+        headers = [
+            (
+                header.encode("ascii") if isinstance(header, str) else header,
+                value.encode("latin1") if isinstance(value, str) else value,
+            )
+            for header, value in response.items()
+        ]
+        headers.extend(
+            (b"Set-Cookie", cookie.output(header="").encode("ascii").strip())
+            for cookie in response.cookies.values()
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": headers,
+            }
+        )
+
+        parts = response.__aiter__()
+        try:
+            async for part in parts:
+                for chunk, _ in self.chunk_bytes(part):
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+        finally:
+            await parts.aclose()
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
+        return None
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    return ASGIHandler()
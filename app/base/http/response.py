@@ -0,0 +1,31 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.http import StreamingHttpResponse
+
+
+class ThreadedStreamingHttpResponse(StreamingHttpResponse):
+    # Under ASGI the content is produced in one dedicated thread, so it may
+    # use the database, e.g. a server-side cursor bound to one connection.
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=1)
+        iterator = iter(self)
+        try:
+            while True:
+                part = await loop.run_in_executor(executor, next, iterator, None)
+                if part is None:
+                    break
+                yield part
+        finally:
+            await loop.run_in_executor(executor, self.close_iterator)
+            executor.shutdown(wait=False)
+
+    def close_iterator(self):
+        close = getattr(self._iterator, "close", None)
+        try:
+            if close is not None:
+                close()
+        finally:
+            connections.close_all()
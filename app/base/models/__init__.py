@@ -1,3 +1,4 @@
-from base.models.fields import VersionField, LookupFieldDefault
+from base.models.fields import VersionField, LookupFieldDefault, UUID7Field, uuid7
+from base.models.lookups import ILikeContains
 
-__all__ = ["VersionField", "LookupFieldDefault"]
+__all__ = ["VersionField", "LookupFieldDefault", "UUID7Field", "ILikeContains", "uuid7"]
@@ -1,6 +1,54 @@
+import time
+import uuid
+import secrets
+import threading
+
 from django.db import models
 from django.core.exceptions import ValidationError
 
+_uuid7_lock = threading.Lock()
+_uuid7_state = {"timestamp": 0, "counter": 0}
+
+
+def uuid7():
+    with _uuid7_lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp <= _uuid7_state["timestamp"]:
+            timestamp = _uuid7_state["timestamp"]
+            counter = _uuid7_state["counter"] + 1
+            if counter > 0xFFF:
+                timestamp, counter = timestamp + 1, 0
+        else:
+            counter = secrets.randbits(11)
+        _uuid7_state.update(timestamp=timestamp, counter=counter)
+
+    return uuid.UUID(
+        int=(timestamp & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
+
+
+class UUID7Field(models.UUIDField):
+    description = "Time-ordered UUID (version 7)"
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("default", uuid7)
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get("default") is uuid7:
+            del kwargs["default"]
+        if kwargs.get("editable") is False:
+            del kwargs["editable"]
+        else:
+            kwargs["editable"] = True
+        return name, path, args, kwargs
+
 
 class VersionField(models.CharField):
     description = "Version number in X.Y.Z format"
@@ -0,0 +1,16 @@
+from django.db import models
+from django.db.models.lookups import IContains
+
+
+@models.CharField.register_lookup
+@models.TextField.register_lookup
+class ILikeContains(IContains):
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        if connection.vendor != "postgresql":
+            return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+        return super().as_sql(compiler, connection)
+
+    def get_rhs_op(self, connection, rhs):
+        return f"ILIKE {rhs}"
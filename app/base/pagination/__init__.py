@@ -0,0 +1,13 @@
+from base.pagination.count import estimate_count
+from base.pagination.pagination import (
+    EstimatedCountLimitOffsetPagination,
+    KeysetPagination,
+    SelectablePagination,
+)
+
+__all__ = [
+    "EstimatedCountLimitOffsetPagination",
+    "KeysetPagination",
+    "SelectablePagination",
+    "estimate_count",
+]
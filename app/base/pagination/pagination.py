@@ -0,0 +1,288 @@
+import json
+import base64
+import datetime
+import binascii
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from base.pagination.count import estimate_count
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class CountModeMixin:
+    count_query_param = "count"
+    count_modes = ("exact", "estimate")
+    default_count_mode = "exact"
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param, self.default_count_mode)
+        if mode not in self.count_modes:
+            raise ValidationError(
+                {
+                    self.count_query_param: _("Must be one of {choices}.").format(
+                        choices=", ".join(self.count_modes)
+                    )
+                }
+            )
+        return mode
+
+    def get_count(self, queryset):
+        # pylint: disable=no-member
+        if self.count_mode == "estimate":
+            return estimate_count(queryset)
+        if self.count_mode == "exact":
+            return queryset.count()
+        return None
+
+    def get_count_schema_parameter(self):
+        return {
+            "name": self.count_query_param,
+            "required": False,
+            "in": "query",
+            "description": "How to compute the total number of results.",
+            "schema": {"type": "string", "enum": list(self.count_modes)},
+        }
+
+
+class EstimatedCountLimitOffsetPagination(CountModeMixin, LimitOffsetPagination):
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = self.get_count_mode(request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            self.get_count_schema_parameter(),
+        ]
+
+
+class KeysetPagination(CountModeMixin, BasePagination):
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    tiebreaker = ("pk",)
+
+    count_modes = ("none", "exact", "estimate")
+    default_count_mode = "none"
+
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_mode = self.get_count_mode(request)
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        values, reverse = self.decode_cursor(request)
+
+        self.count = self.get_count(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+        if reverse:
+            queryset = queryset.reverse()
+        if values is not None:
+            try:
+                queryset = queryset.filter(self.get_keyset_filter(values, reverse))
+            except (DjangoValidationError, TypeError, ValueError) as exc:
+                raise NotFound(self.invalid_cursor_message) from exc
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = []
+        for field in (*queryset.query.order_by, *self.tiebreaker):
+            if not isinstance(field, str):
+                raise TypeError("Keyset pagination requires field name orderings")
+            name = field.lstrip("-")
+            if name not in (existing.lstrip("-") for existing in ordering):
+                ordering.append(field)
+        return ordering
+
+    def get_keyset_filter(self, values, reverse):
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        keyset_filter = Q()
+        for index, field in enumerate(self.ordering):
+            descending = field.startswith("-") != reverse
+            condition = Q(
+                **{
+                    f"{field.lstrip('-')}__{'lt' if descending else 'gt'}": values[
+                        index
+                    ]
+                }
+            )
+            for previous, value in zip(self.ordering[:index], values[:index]):
+                condition &= Q(**{previous.lstrip("-"): value})
+            keyset_filter |= condition
+        return keyset_filter
+
+    def get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            position.append(getattr(instance, "pk" if name == "pk" else name))
+        return position
+
+    def encode_cursor(self, values, reverse):
+        data = json.dumps({"v": values, "r": reverse}, cls=CursorJSONEncoder)
+        cursor = base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return list(data["v"]), bool(data["r"])
+        except (TypeError, ValueError, KeyError, binascii.Error) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_paginated_response(self, data):
+        response = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            response["count"] = self.count
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            self.get_count_schema_parameter(),
+        ]
+
+
+class SelectablePagination(BasePagination):
+    pagination_query_param = "pagination"
+    pagination_classes = {
+        "offset": EstimatedCountLimitOffsetPagination,
+        "cursor": KeysetPagination,
+    }
+    default_pagination = "offset"
+
+    def __init__(self):
+        self.paginator = None
+
+    def get_pagination(self, request):
+        if KeysetPagination.cursor_query_param in request.query_params:
+            return "cursor"
+
+        pagination = request.query_params.get(
+            self.pagination_query_param, self.default_pagination
+        )
+        if pagination not in self.pagination_classes:
+            raise ValidationError(
+                {
+                    self.pagination_query_param: _("Must be one of {choices}.").format(
+                        choices=", ".join(self.pagination_classes)
+                    )
+                }
+            )
+        return pagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.pagination_classes[self.get_pagination(request)]()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.pagination_classes[
+            self.default_pagination
+        ]().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = {}
+        for pagination_class in self.pagination_classes.values():
+            for parameter in pagination_class().get_schema_operation_parameters(view):
+                parameters.setdefault(parameter["name"], parameter)
+
+        return [
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination mode.",
+                "schema": {"type": "string", "enum": list(self.pagination_classes)},
+            },
+            *parameters.values(),
+        ]
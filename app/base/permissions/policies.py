@@ -1,5 +1,8 @@
+import copy
+
 from rest_framework.permissions import BasePermission
 from rest_access_policy import AccessPolicy
+from rest_access_policy.access_policy import AccessEnforcement
 
 
 class GenericAccessPolicy(AccessPolicy):
@@ -12,23 +15,94 @@ class GenericAccessPolicy(AccessPolicy):
         },
     ]
 
-    def __get_permissions(self):
-        permissions = []
-        for cls in self.__class__.mro():
-            if hasattr(cls, "permissions"):
-                permissions.extend(
-                    permission_type() for permission_type in getattr(cls, "permissions")
-                )
-        return permissions
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compile()
+
+    @classmethod
+    def compile(cls):
+        permission_types = []
+        for klass in cls.mro():
+            for permission_type in klass.__dict__.get("permissions", []):
+                if permission_type not in permission_types:
+                    permission_types.append(permission_type)
+
+        cls._permission_chain = tuple(
+            permission_type() for permission_type in permission_types
+        )
+        cls._object_permission_chain = tuple(
+            permission
+            for permission in cls._permission_chain
+            if type(permission).has_object_permission
+            is not BasePermission.has_object_permission
+        )
+        cls._compiled_statements = cls._normalize_statements(
+            cls, copy.deepcopy(cls.statements)
+        )
+        cls._allow_all = (
+            cls.get_policy_statements is GenericAccessPolicy.get_policy_statements
+            and any(
+                cls.__is_unconditional(statement, "allow")
+                for statement in cls._compiled_statements
+            )
+            and all(
+                statement["effect"] == "allow" for statement in cls._compiled_statements
+            )
+        )
+
+    @staticmethod
+    def __is_unconditional(statement, effect):
+        return (
+            statement["effect"] == effect
+            and "*" in statement["principal"]
+            and "*" in statement["action"]
+            and not statement["condition"]
+            and not statement["condition_expression"]
+        )
+
+    @staticmethod
+    def __memoize(request, key, check):
+        decisions = getattr(request, "_access_policy_decisions", None)
+        if decisions is None:
+            decisions = {}
+            request._access_policy_decisions = decisions
+
+        if key not in decisions:
+            decisions[key] = check()
+        return decisions[key]
+
+    def get_policy_statements(self, request, view):
+        return self._compiled_statements
 
     def has_permission(self, request, view):
-        return all(
-            permission.has_permission(request, view)
-            for permission in self.__get_permissions()
-        ) and AccessPolicy.has_permission(self, request, view)
+        return self.__memoize(
+            request,
+            (self.__class__, "permission"),
+            lambda: self.__has_permission(request, view),
+        )
 
     def has_object_permission(self, request, view, obj):
         return all(
             permission.has_object_permission(request, view, obj)
-            for permission in self.__get_permissions()
+            for permission in self._object_permission_chain
         ) and AccessPolicy.has_object_permission(self, request, view, obj)
+
+    def __has_permission(self, request, view):
+        for permission in self._permission_chain:
+            allowed = self.__memoize(
+                request,
+                (permission.__class__, "permission"),
+                lambda permission=permission: permission.has_permission(request, view),
+            )
+            if not allowed:
+                return False
+
+        if self._allow_all:
+            action = self._get_invoked_action(view)
+            request.access_enforcement = AccessEnforcement(action=action, allowed=True)
+            return True
+
+        return AccessPolicy.has_permission(self, request, view)
+
+
+GenericAccessPolicy.compile()
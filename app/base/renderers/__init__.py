@@ -0,0 +1,8 @@
+from base.renderers.streaming import CSVRenderer, NDJSONRenderer, StreamingRenderer
+
+
+__all__ = [
+    "CSVRenderer",
+    "NDJSONRenderer",
+    "StreamingRenderer",
+]
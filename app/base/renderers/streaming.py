@@ -0,0 +1,59 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from rest_framework.renderers import BaseRenderer
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class StreamingRenderer(BaseRenderer):
+    charset = "utf-8"
+    buffer_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows and isinstance(rows[0], dict) else []
+        return "".join(self.stream(rows, fields)).encode(self.charset)
+
+    def stream(self, rows, fields):
+        # Rows are joined into chunks so the server does not write per row.
+        buffer, size = [], 0
+        for line in self.render_rows(rows, fields):
+            buffer.append(line)
+            size += len(line)
+            if size >= self.buffer_size:
+                yield "".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer)
+
+    def render_rows(self, rows, fields):
+        raise NotImplementedError
+
+
+class NDJSONRenderer(StreamingRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    encoder_class = DjangoJSONEncoder
+
+    def render_rows(self, rows, fields):
+        encoder = self.encoder_class()
+        for row in rows:
+            yield f"{encoder.encode(row)}\n"
+
+
+class CSVRenderer(StreamingRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+    def render_rows(self, rows, fields):
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([row.get(field) for field in fields])
@@ -1,10 +1,11 @@
 from base.tests.cases import GenericTestCase
-from base.tests.mixins import TearDownModelsTestCaseMixin
+from base.tests.mixins import SMTPServerTestCaseMixin, TearDownModelsTestCaseMixin
 from base.tests.decorators import invoke_repeatedly_context
 
 
 __all__ = [
     "GenericTestCase",
+    "SMTPServerTestCaseMixin",
     "TearDownModelsTestCaseMixin",
     "invoke_repeatedly_context",
 ]
@@ -1,4 +1,8 @@
+import socket
+
+from aiosmtpd.controller import Controller
 from django.apps import apps
+from django.test import override_settings
 
 
 class TearDownModelsTestCaseMixin:
@@ -7,3 +11,47 @@ class TearDownModelsTestCaseMixin:
         for model in apps.get_models():
             model.objects.all().delete()
         super().tearDown()
+
+
+class SMTPServerHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        # pylint: disable=invalid-name,unused-argument
+        self.sessions.add(id(session))
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+class SMTPServerTestCaseMixin:
+    # pylint: disable=invalid-name
+    def setUp(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        self.smtp_handler = SMTPServerHandler()
+        self.smtp_server = Controller(
+            self.smtp_handler, hostname="127.0.0.1", port=port
+        )
+        self.smtp_server.start()
+        self.addCleanup(self.stop_smtp_server)
+
+        settings = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=port,
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        super().setUp()
+
+    def stop_smtp_server(self):
+        if self.smtp_server.loop.is_running():
+            self.smtp_server.stop()
@@ -0,0 +1,12 @@
+from base.throttling.limiter import RateLimit, RedisRateLimiter
+from base.throttling.lockout import RedisLockout
+from base.throttling.throttles import RedisRateThrottle, validate_rate
+
+
+__all__ = [
+    "RateLimit",
+    "RedisLockout",
+    "RedisRateLimiter",
+    "RedisRateThrottle",
+    "validate_rate",
+]
@@ -0,0 +1,72 @@
+import collections
+
+from django.core.cache import caches
+from django_redis import get_redis_connection
+
+# Generic cell rate algorithm, a token bucket stored as the single
+# theoretical arrival time of the next request. Time comes from Redis so
+# every worker shares one clock, and the script runs atomically.
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local interval = period / limit
+
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if tat == nil or tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval * cost
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, 0, tostring(tat - now), tostring(allow_at - now)}
+end
+
+redis.call("SET", KEYS[1], tostring(new_tat), "PX", math.ceil((new_tat - now) * 1000))
+local remaining = math.floor((now - allow_at) / interval + 1e-9)
+return {1, remaining, tostring(new_tat - now), "0"}
+"""
+
+RateLimit = collections.namedtuple(
+    "RateLimit", ["allowed", "limit", "remaining", "reset", "retry_after"]
+)
+
+
+class RedisRateLimiter:
+    def __init__(self, namespace="rate_limit", alias="default"):
+        self.namespace = namespace
+        self.alias = alias
+        self._script = None
+
+    @property
+    def connection(self):
+        return get_redis_connection(self.alias)
+
+    @property
+    def script(self):
+        if self._script is None:
+            self._script = self.connection.register_script(GCRA_SCRIPT)
+        return self._script
+
+    def make_key(self, key):
+        return caches[self.alias].make_key(f"{self.namespace}:{key}")
+
+    def hit(self, key, limit, period, cost=1):
+        allowed, remaining, reset, retry_after = self.script(
+            keys=[self.make_key(key)],
+            args=[limit, period, cost],
+            client=self.connection,
+        )
+        return RateLimit(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=int(remaining),
+            reset=float(reset),
+            retry_after=float(retry_after),
+        )
+
+    def reset(self, key):
+        self.connection.delete(self.make_key(key))
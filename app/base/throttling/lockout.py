@@ -0,0 +1,91 @@
+from django.core.cache import caches
+from django_redis import get_redis_connection
+
+LOCKED_FOR_SCRIPT = """
+local wait = 0
+for _, key in ipairs(KEYS) do
+    wait = math.max(wait, redis.call("PTTL", key))
+end
+return wait
+"""
+
+# KEYS holds a failure counter and a lock key per identifier, ARGV the
+# counter window followed by each identifier's threshold. Every failure
+# at or past the threshold doubles the lock, up to the maximum delay.
+REGISTER_FAILURE_SCRIPT = """
+local window = tonumber(ARGV[1])
+local base_delay = tonumber(ARGV[2])
+local max_delay = tonumber(ARGV[3])
+local wait = 0
+for index = 1, #KEYS, 2 do
+    local threshold = tonumber(ARGV[3 + (index + 1) / 2])
+    local failures = redis.call("INCR", KEYS[index])
+    redis.call("PEXPIRE", KEYS[index], window)
+    if failures >= threshold then
+        local delay = math.floor(
+            math.min(base_delay * 2 ^ (failures - threshold), max_delay)
+        )
+        redis.call("SET", KEYS[index + 1], failures, "PX", delay)
+        wait = math.max(wait, delay)
+    end
+end
+return wait
+"""
+
+
+class RedisLockout:
+    def __init__(self, namespace="lockout", alias="default"):
+        self.namespace = namespace
+        self.alias = alias
+        self._scripts = None
+
+    @property
+    def connection(self):
+        return get_redis_connection(self.alias)
+
+    @property
+    def scripts(self):
+        if self._scripts is None:
+            self._scripts = (
+                self.connection.register_script(LOCKED_FOR_SCRIPT),
+                self.connection.register_script(REGISTER_FAILURE_SCRIPT),
+            )
+        return self._scripts
+
+    def make_key(self, kind, ident):
+        return caches[self.alias].make_key(f"{self.namespace}:{kind}:{ident}")
+
+    def locked_for(self, idents):
+        locked_for, _ = self.scripts
+        wait = locked_for(
+            keys=[self.make_key("lock", ident) for ident in idents],
+            client=self.connection,
+        )
+        return max(wait, 0) / 1000
+
+    def register_failure(self, thresholds, window, base_delay, max_delay):
+        _, register_failure = self.scripts
+        keys = []
+        for ident in thresholds:
+            keys += [self.make_key("failures", ident), self.make_key("lock", ident)]
+
+        wait = register_failure(
+            keys=keys,
+            args=[
+                int(window * 1000),
+                int(base_delay * 1000),
+                int(max_delay * 1000),
+                *thresholds.values(),
+            ],
+            client=self.connection,
+        )
+        return wait / 1000
+
+    def reset(self, *idents):
+        self.connection.delete(
+            *(
+                self.make_key(kind, ident)
+                for ident in idents
+                for kind in ("failures", "lock")
+            )
+        )
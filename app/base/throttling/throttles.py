@@ -0,0 +1,68 @@
+import math
+import logging
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from redis.exceptions import RedisError
+from rest_framework.throttling import SimpleRateThrottle
+
+from base.throttling.limiter import RedisRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def validate_rate(value):
+    try:
+        num_requests, _duration = SimpleRateThrottle.parse_rate(None, value)
+    except (IndexError, KeyError, ValueError) as exc:
+        raise ValidationError(
+            _("Enter a rate like 100/minute."), code="invalid_rate"
+        ) from exc
+
+    if num_requests <= 0:
+        raise ValidationError(_("Enter a rate like 100/minute."), code="invalid_rate")
+
+
+class RedisRateThrottle(SimpleRateThrottle):
+    limiter = RedisRateLimiter()
+
+    def __init__(self):
+        super().__init__()
+        self.rate_limit = None
+
+    def get_request_rate(self, request, view):
+        # pylint: disable=unused-argument
+        return self.rate
+
+    def allow_request(self, request, view):
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        rate = self.get_request_rate(request, view)
+        if rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(rate)
+
+        try:
+            self.rate_limit = self.limiter.hit(key, self.num_requests, self.duration)
+        except RedisError:
+            logger.warning("Rate limiting skipped for %s", key, exc_info=True)
+            return True
+
+        view.headers.update(self.get_headers(self.rate_limit))
+        return self.rate_limit.allowed
+
+    def get_headers(self, rate_limit):
+        return {
+            "RateLimit-Limit": str(rate_limit.limit),
+            "RateLimit-Remaining": str(rate_limit.remaining),
+            "RateLimit-Reset": str(math.ceil(rate_limit.reset)),
+            "RateLimit-Policy": f"{rate_limit.limit};w={self.duration}",
+        }
+
+    def wait(self):
+        if self.rate_limit is None:
+            return None
+        return math.ceil(self.rate_limit.retry_after)
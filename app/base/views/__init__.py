@@ -1,5 +1,15 @@
+from base.views.asynchronous import AsyncAPIViewMixin
+from base.views.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotentAPIViewMixin,
+)
 from base.views.mixins import AccessPolicyViewSetMixin
 
 __all__ = [
     "AccessPolicyViewSetMixin",
+    "AsyncAPIViewMixin",
+    "IdempotencyKeyInProgress",
+    "IdempotencyKeyMismatch",
+    "IdempotentAPIViewMixin",
 ]
@@ -0,0 +1,71 @@
+import asyncio
+import inspect
+import functools
+
+from asgiref.sync import sync_to_async
+
+from django.core.handlers.asgi import ASGIRequest
+
+from base.db import RequestThread
+
+
+class AsyncAPIViewMixin:
+    request_thread = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        return functools.update_wrapper(async_view, view)
+
+    def run_sync(self, func):
+        if self.request_thread is not None:
+            return self.request_thread.sync_to_async(func)
+        # Outside ASGI the coroutine runs inside async_to_sync, blocking work
+        # stays on the request thread to share its connection and transaction.
+        return sync_to_async(func, thread_sensitive=True)
+
+    async def call_handler(self, handler, request, *args, **kwargs):
+        # Schema decorators wrap inherited handlers in plain functions.
+        if asyncio.iscoroutinefunction(inspect.unwrap(handler)):
+            return await handler(request, *args, **kwargs)
+        return await self.run_sync(handler)(request, *args, **kwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        # pylint: disable=attribute-defined-outside-init
+        self.args = args
+        self.kwargs = kwargs
+        if isinstance(request, ASGIRequest):
+            self.request_thread = RequestThread()
+        try:
+            return await self.handle_request(request, *args, **kwargs)
+        finally:
+            if self.request_thread is not None:
+                await self.request_thread.close()
+
+    async def handle_request(self, request, *args, **kwargs):
+        # pylint: disable=attribute-defined-outside-init
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.run_sync(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = await self.call_handler(handler, request, *args, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        await self.run_sync(self.response.render)()
+        return self.response
@@ -0,0 +1,146 @@
+import time
+import asyncio
+import hashlib
+import logging
+import datetime
+
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext_lazy as _
+
+from redis.exceptions import RedisError
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from base.views.asynchronous import AsyncAPIViewMixin
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _("A request with this idempotency key is still in progress.")
+    default_code = "idempotency_key_in_progress"
+
+
+class IdempotencyKeyMismatch(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _("This idempotency key was used for a different request.")
+    default_code = "idempotency_key_mismatch"
+
+
+class IdempotentAPIViewMixin(AsyncAPIViewMixin):
+    idempotency_header = "Idempotency-Key"
+    idempotency_methods = ("POST",)
+    idempotency_key_max_length = 255
+    idempotency_store = None
+    idempotency_ttl = datetime.timedelta(hours=24)
+    idempotency_lock_timeout = datetime.timedelta(seconds=30)
+    idempotency_wait_timeout = datetime.timedelta(seconds=10)
+    idempotency_poll_interval = 0.05
+    idempotency_replay_headers = ("Location",)
+
+    def get_idempotency_key(self, request):
+        if request.method not in self.idempotency_methods:
+            return None
+
+        key = request.headers.get(self.idempotency_header)
+        if key is None:
+            return None
+        if not 0 < len(key) <= self.idempotency_key_max_length:
+            raise ValidationError(
+                {
+                    self.idempotency_header: _(
+                        "Must be between 1 and {max_length} characters."
+                    ).format(max_length=self.idempotency_key_max_length)
+                }
+            )
+        return key
+
+    def get_idempotency_scope(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return None
+
+    def get_idempotency_cache_key(self, request, scope, key):
+        return hashlib.sha256(
+            f"{scope}:{request.method}:{request.path}:{key}".encode("utf-8")
+        ).hexdigest()
+
+    def get_request_fingerprint(self, request):
+        # Bodies may carry passwords, only a keyed digest leaves the process.
+        return salted_hmac("idempotency", request.body, algorithm="sha256").hexdigest()
+
+    def get_idempotency_record(self, response, fingerprint):
+        return {
+            "fingerprint": fingerprint,
+            "status": response.status_code,
+            "data": response.data,
+            "headers": {
+                name: response[name]
+                for name in self.idempotency_replay_headers
+                if response.has_header(name)
+            },
+        }
+
+    def replay_response(self, record):
+        return Response(
+            record["data"],
+            status=record["status"],
+            headers={**record["headers"], "Idempotent-Replayed": "true"},
+        )
+
+    async def acquire_idempotency_key(self, key, fingerprint):
+        deadline = time.monotonic() + self.idempotency_wait_timeout.total_seconds()
+        while True:
+            lock, record = await self.run_sync(self.idempotency_store.begin)(
+                key, fingerprint, self.idempotency_lock_timeout
+            )
+            if record is None:
+                return lock, None
+            if record["fingerprint"] != fingerprint:
+                raise IdempotencyKeyMismatch()
+            if "status" in record:
+                return None, record
+            # Concurrent duplicates wait for the first request to finish.
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgress()
+            await asyncio.sleep(self.idempotency_poll_interval)
+
+    async def finish_idempotency_key(self, key, lock, response=None, fingerprint=None):
+        try:
+            if response is not None and status.is_success(response.status_code):
+                record = self.get_idempotency_record(response, fingerprint)
+                await self.run_sync(self.idempotency_store.complete)(
+                    key, lock, record, self.idempotency_ttl
+                )
+            else:
+                await self.run_sync(self.idempotency_store.release)(key, lock)
+        except RedisError:
+            logger.warning("Storing idempotent response %s failed", key, exc_info=True)
+
+    async def call_handler(self, handler, request, *args, **kwargs):
+        key = self.get_idempotency_key(request)
+        scope = self.get_idempotency_scope(request) if key is not None else None
+        if scope is None:
+            return await super().call_handler(handler, request, *args, **kwargs)
+
+        key = self.get_idempotency_cache_key(request, scope, key)
+        fingerprint = self.get_request_fingerprint(request)
+        try:
+            lock, record = await self.acquire_idempotency_key(key, fingerprint)
+        except RedisError:
+            logger.warning("Idempotency skipped for %s", key, exc_info=True)
+            return await super().call_handler(handler, request, *args, **kwargs)
+
+        if record is not None:
+            return self.replay_response(record)
+
+        try:
+            response = await super().call_handler(handler, request, *args, **kwargs)
+        except Exception:
+            await self.finish_idempotency_key(key, lock)
+            raise
+
+        await self.finish_idempotency_key(key, lock, response, fingerprint)
+        return response